@@ -0,0 +1,5 @@
+"""
+Offline benchmarks of the MCP tools against a local mock of the TickTick API.
+
+See benchmarks/run.py (`python -m benchmarks.run --help`).
+"""
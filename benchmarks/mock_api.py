@@ -0,0 +1,339 @@
+"""
+Local stand-in for the TickTick Open API, used by the benchmarks.
+
+MockTickTickAPI serves a synthetic account (N projects x M tasks) over HTTP
+on localhost, with the endpoints used by the server (projects, project data,
+tasks, writes and the OAuth token endpoint). Point a client at it with
+TICKTICK_BASE_URL=<api.base_url> and TICKTICK_TOKEN_URL=<api.token_url>.
+
+Faults can be injected to reproduce a production API: a fixed latency with
+random jitter on every request, and a share of requests answered with HTTP
+429 (with Retry-After) or 5xx. Every request is counted per endpoint.
+
+The benchmarks run it in a subprocess, so its work does not show up in the
+latency and memory measured for the tools; it can also be started on its
+own to point a real server at:
+
+    python -m benchmarks.mock_api --projects 20 --tasks 100 --latency 0.05
+
+Besides the API, it serves two control endpoints: GET /_mock/requests
+returns the request counts, and POST /_mock/reset restores the generated
+account and zeroes the counts.
+"""
+
+import argparse
+import copy
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+DUE_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.000+0000"
+WORDS = ("review", "plan", "write", "call", "email", "fix", "design", "report", "budget", "meeting",
+         "release", "invoice", "draft", "update", "backup", "deploy", "research", "notes", "ship", "clean")
+
+
+@dataclass
+class Faults:
+    """Faults injected into the responses of the mock API."""
+
+    latency: float = 0.0       # seconds added to every request
+    jitter: float = 0.0        # random extra seconds in [0, jitter]
+    rate_limited: float = 0.0  # share of requests answered with HTTP 429
+    server_errors: float = 0.0  # share of requests answered with HTTP 503
+    retry_after: float = 0.05  # Retry-After of the 429 responses (seconds)
+
+
+def project_id(p: int) -> str:
+    """ID of the p-th generated project."""
+    return f"{p:08x}{'0' * 16}"
+
+
+def task_id(p: int, t: int) -> str:
+    """ID of the t-th generated task of the p-th project."""
+    return f"{p:08x}{t:016x}"
+
+
+def generate_account(projects: int, tasks_per_project: int, seed: int = 0) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
+    """
+    Synthesize an account.
+
+    Tasks get a mix of priorities, due dates from two weeks ago to a month
+    ahead (a third have none), descriptions and subtasks, so every filter tool
+    has matches.
+
+    Returns:
+        (projects, tasks by project ID)
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    project_list = []
+    tasks: Dict[str, List[Dict]] = {}
+    for p in range(projects):
+        pid = project_id(p)
+        project_list.append({"id": pid, "name": f"Project {p}", "color": "#F18181",
+                             "sortOrder": p, "closed": False, "viewMode": "list", "kind": "TASK"})
+        project_tasks = []
+        for t in range(tasks_per_project):
+            title = " ".join(rng.choice(WORDS) for _ in range(3)).capitalize()
+            task = {
+                "id": task_id(p, t),
+                "projectId": pid,
+                "title": f"{title} {t}",
+                "content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 40))),
+                "priority": rng.choice((0, 0, 1, 3, 5)),
+                "status": 0,
+                "sortOrder": t,
+                "timeZone": "UTC",
+                "isAllDay": False,
+                "tags": [],
+                "etag": uuid.UUID(int=rng.getrandbits(128)).hex[:8],
+                "kind": "TEXT",
+            }
+            if rng.random() < 2 / 3:
+                task["dueDate"] = (now + timedelta(hours=rng.randint(-14 * 24, 30 * 24))).strftime(DUE_DATE_FORMAT)
+            if rng.random() < 0.2:
+                task["items"] = [{"id": f"{task['id']}{i}", "title": rng.choice(WORDS), "status": rng.choice((0, 1))}
+                                 for i in range(rng.randint(1, 4))]
+            project_tasks.append(task)
+        tasks[pid] = project_tasks
+    return project_list, tasks
+
+
+class MockTickTickAPI:
+    """A threaded HTTP server impersonating the TickTick Open API."""
+
+    def __init__(self, projects: int = 10, tasks_per_project: int = 50, faults: Optional[Faults] = None,
+                 seed: int = 0):
+        self.faults = faults or Faults()
+        self._account = generate_account(projects, tasks_per_project, seed)
+        self.projects, self.tasks = copy.deepcopy(self._account)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # "METHOD /path/template" -> number of requests
+        self.requests: Dict[str, int] = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/open/v1"
+
+    @property
+    def token_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/oauth/token"
+
+    def start(self) -> "MockTickTickAPI":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MockTickTickAPI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def request_count(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.requests.clear()
+
+    def reset(self) -> None:
+        """Restore the generated account and zero the request counts."""
+        with self._lock:
+            self.projects, self.tasks = copy.deepcopy(self._account)
+            self.requests.clear()
+
+    def _count(self, method: str, path: str) -> None:
+        parts = path.strip("/").split("/")
+        for i in range(1, len(parts)):
+            if parts[i - 1] in ("project", "task"):
+                parts[i] = "{id}"
+        key = f"{method} /{'/'.join(parts)}"
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def _fault(self) -> Optional[int]:
+        """Sleep for the injected latency and pick an injected error status, if any."""
+        faults = self.faults
+        with self._lock:
+            delay = faults.latency + (self._rng.uniform(0, faults.jitter) if faults.jitter else 0.0)
+            roll = self._rng.random()
+        if delay:
+            time.sleep(delay)
+        if roll < faults.rate_limited:
+            return 429
+        if roll < faults.rate_limited + faults.server_errors:
+            return 503
+        return None
+
+    def control(self, method: str, path: str) -> Tuple[int, Any]:
+        """Answer a request to a /_mock/ control endpoint."""
+        if path == "/_mock/requests" and method == "GET":
+            with self._lock:
+                return 200, {"requests": dict(self.requests)}
+        if path == "/_mock/reset" and method == "POST":
+            self.reset()
+            return 200, {"reset": True}
+        return 404, {"errorMessage": "not found"}
+
+    def handle(self, method: str, path: str, body: Optional[Dict]) -> Tuple[int, Any]:
+        """Answer an API request with (status, JSON body)."""
+        if path == "/oauth/token":
+            return 200, {"access_token": uuid.uuid4().hex, "refresh_token": uuid.uuid4().hex, "expires_in": 3600}
+        if not path.startswith("/open/v1/"):
+            return 404, {"errorMessage": "not found"}
+        parts = path[len("/open/v1/"):].strip("/").split("/")
+
+        with self._lock:
+            if parts == ["project"]:
+                if method == "GET":
+                    return 200, self.projects
+                project = dict(body or {}, id=uuid.uuid4().hex[:24])
+                self.projects.append(project)
+                self.tasks[project["id"]] = []
+                return 200, project
+
+            if parts[0] == "project" and len(parts) >= 2:
+                pid = parts[1]
+                project = next((p for p in self.projects if p["id"] == pid), None)
+                if project is None:
+                    return 404, {"errorMessage": "project not found"}
+                if len(parts) == 2:
+                    if method == "DELETE":
+                        self.projects.remove(project)
+                        self.tasks.pop(pid, None)
+                        return 200, None
+                    if method == "POST":
+                        project.update(body or {})
+                    return 200, project
+                if parts[2] == "data":
+                    return 200, {"project": project, "tasks": self.tasks[pid], "columns": []}
+                if parts[2] == "task" and len(parts) >= 4:
+                    task = next((t for t in self.tasks[pid] if t["id"] == parts[3]), None)
+                    if task is None:
+                        return 404, {"errorMessage": "task not found"}
+                    if len(parts) == 5 and parts[4] == "complete":
+                        self.tasks[pid].remove(task)
+                        return 200, None
+                    if method == "DELETE":
+                        self.tasks[pid].remove(task)
+                        return 200, None
+                    return 200, task
+
+            if parts[0] == "task" and method == "POST":
+                body = body or {}
+                pid = body.get("projectId")
+                if pid not in self.tasks:
+                    return 400, {"errorMessage": "unknown project"}
+                if len(parts) == 1:
+                    task = dict(body, id=uuid.uuid4().hex[:24], status=0)
+                    self.tasks[pid].append(task)
+                    return 200, task
+                task = next((t for t in self.tasks[pid] if t["id"] == parts[1]), None)
+                if task is None:
+                    return 404, {"errorMessage": "task not found"}
+                task.update(body)
+                return 200, task
+
+        return 404, {"errorMessage": "not found"}
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send each response in one segment; headers and body written
+            # separately would stall on delayed ACKs
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def _serve(self, method: str) -> None:
+                path = self.path.split("?", 1)[0]
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                headers = {}
+                if path.startswith("/_mock/"):
+                    self._reply(*api.control(method, path), headers)
+                    return
+                api._count(method, path)
+
+                status = api._fault() if path != "/oauth/token" else None
+                if status == 429:
+                    headers["Retry-After"] = str(api.faults.retry_after)
+                    payload: Any = {"errorMessage": "rate limited"}
+                elif status is not None:
+                    payload = {"errorMessage": "service unavailable"}
+                else:
+                    try:
+                        body = json.loads(raw) if raw and "json" in (self.headers.get("Content-Type") or "") else None
+                    except ValueError:
+                        body = None
+                    status, payload = api.handle(method, path, body)
+                self._reply(status, payload, headers)
+
+            def _reply(self, status: int, payload: Any, headers: Dict[str, str]) -> None:
+                encoded = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def do_DELETE(self):
+                self._serve("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local mock of the TickTick Open API")
+    parser.add_argument("--projects", type=int, default=10, help="Number of projects")
+    parser.add_argument("--tasks", type=int, default=50, help="Tasks per project")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated account and faults")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra seconds per request")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    args = parser.parse_args()
+
+    faults = Faults(latency=args.latency, jitter=args.jitter,
+                    rate_limited=args.throttle_rate, server_errors=args.error_rate)
+    api = MockTickTickAPI(args.projects, args.tasks, faults, args.seed)
+    # The first line tells the parent process (see benchmarks.run) where to connect
+    print(json.dumps({"base_url": api.base_url, "token_url": api.token_url}), flush=True)
+    try:
+        api.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
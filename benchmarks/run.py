@@ -0,0 +1,349 @@
+"""
+Benchmark every MCP tool against a local mock of the TickTick API.
+
+The mock (see mock_api.py) runs in a subprocess with a synthetic account of
+N projects x M tasks and optional latency, jitter, 429s and 5xx. The tools
+are called in this process with a real AsyncTickTickClient pointed at it
+through TICKTICK_BASE_URL / TICKTICK_TOKEN_URL; HOME is a temporary
+directory, so ~/.ticktick is never read or written.
+
+For every tool the report holds:
+
+- cold_ms: latency with an empty response cache and task index;
+- warm_*_ms: latency of the `--repeat` following calls;
+- http_calls_cold / http_calls_warm: requests the mock received per call
+  (retries and background revalidations included);
+- peak_kib: peak memory allocated during a cold call (tracemalloc);
+- errors: calls that raised or returned an error.
+
+The mock account is restored before every call, so write tools always find
+their targets and every call sees the same data. The client-side rate
+limiter is disabled unless --rate-limit is given, so it does not dominate
+the timings.
+
+Usage:
+    python -m benchmarks.run --projects 20 --tasks 100 --output before.json
+    python -m benchmarks.run --projects 20 --tasks 100 --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from benchmarks.mock_api import project_id, task_id
+
+# Tools without a benchmark case, as they need a browser-based OAuth flow
+SKIPPED_TOOLS = ("ticktick_auth_start", "ticktick_auth_complete")
+# Tasks per call of the batch tools
+BATCH_SIZE = 10
+
+
+class MockServer:
+    """Handle of the mock API subprocess."""
+
+    def __init__(self, process: subprocess.Popen, base_url: str, token_url: str):
+        self.process = process
+        self.base_url = base_url
+        self.token_url = token_url
+        self.control_url = base_url.rsplit("/open/v1", 1)[0] + "/_mock"
+
+    def _call(self, method: str, endpoint: str) -> Dict[str, Any]:
+        data = b"" if method == "POST" else None
+        request = urllib.request.Request(self.control_url + endpoint, data=data, method=method)
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())
+
+    def reset(self) -> None:
+        """Restore the generated account and zero the request counts."""
+        self._call("POST", "/reset")
+
+    def request_count(self) -> int:
+        """Return the number of API requests received since the last reset."""
+        return sum(self._call("GET", "/requests")["requests"].values())
+
+
+@contextmanager
+def mock_server(projects: int, tasks: int, latency: float = 0.0, jitter: float = 0.0,
+                throttle_rate: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> Iterator[MockServer]:
+    """Run the mock API in a subprocess for the duration of the block."""
+    command = [
+        sys.executable, "-m", "benchmarks.mock_api",
+        "--projects", str(projects), "--tasks", str(tasks), "--seed", str(seed),
+        "--latency", str(latency), "--jitter", str(jitter),
+        "--throttle-rate", str(throttle_rate), "--error-rate", str(error_rate),
+    ]
+    root = Path(__file__).resolve().parent.parent
+    process = subprocess.Popen(command, cwd=root, stdout=subprocess.PIPE, text=True)
+    try:
+        urls = json.loads(process.stdout.readline())
+        yield MockServer(process, urls["base_url"], urls["token_url"])
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+class Case:
+    """A tool call: the tool name and a function returning its arguments."""
+
+    def __init__(self, tool: str, args: Callable[["Account"], Dict[str, Any]] = lambda account: {}):
+        self.tool = tool
+        self.args = args
+
+
+class Account:
+    """IDs of the generated account used as tool arguments."""
+
+    def __init__(self, projects: int, tasks: int):
+        self.projects = projects
+        self.tasks = tasks
+        # Read and updated by the tools; the last tasks of the projects are completed or deleted
+        self.project_id = project_id(0)
+        self.task_id = task_id(0, 0)
+
+    def last_task(self) -> Dict[str, str]:
+        return {"project_id": project_id(0), "task_id": task_id(0, self.tasks - 1)}
+
+    def batch(self) -> List[Dict[str, str]]:
+        """BATCH_SIZE tasks spread over the projects, taken from the end of each."""
+        keys = []
+        for t in range(self.tasks - 1, -1, -1):
+            for p in range(self.projects):
+                keys.append({"project_id": project_id(p), "task_id": task_id(p, t)})
+        return keys[:BATCH_SIZE]
+
+
+CASES = [
+    Case("get_projects"),
+    Case("get_project", lambda a: {"project_id": a.project_id}),
+    Case("get_project_tasks", lambda a: {"project_id": a.project_id}),
+    Case("get_task", lambda a: {"project_id": a.project_id, "task_id": a.task_id}),
+    Case("get_all_tasks"),
+    Case("get_tasks_by_priority", lambda a: {"priority_id": 5}),
+    Case("get_tasks_due_today"),
+    Case("get_overdue_tasks"),
+    Case("get_tasks_due_tomorrow"),
+    Case("get_tasks_due_in_days", lambda a: {"days": 7}),
+    Case("get_tasks_due_this_week"),
+    Case("search_tasks", lambda a: {"search_term": "report"}),
+    Case("get_engaged_tasks"),
+    Case("get_next_tasks"),
+    Case("create_task", lambda a: {"title": "Benchmark task", "project_id": a.project_id, "priority": 3}),
+    Case("update_task", lambda a: {"task_id": a.task_id, "project_id": a.project_id, "title": "Renamed"}),
+    Case("complete_task", lambda a: a.last_task()),
+    Case("delete_task", lambda a: a.last_task()),
+    Case("create_subtask", lambda a: {"subtask_title": "Benchmark subtask", "parent_task_id": a.task_id,
+                                      "project_id": a.project_id}),
+    Case("create_project", lambda a: {"name": "Benchmark project"}),
+    Case("delete_project", lambda a: {"project_id": project_id(a.projects - 1)}),
+    Case("batch_create_tasks", lambda a: {"tasks": [{"title": f"Batch task {i}", "project_id": a.project_id}
+                                                    for i in range(BATCH_SIZE)]}),
+    Case("batch_update_tasks", lambda a: {"tasks": [dict(key, priority=5) for key in a.batch()]}),
+    Case("batch_complete_tasks", lambda a: {"tasks": a.batch()}),
+    Case("batch_delete_tasks", lambda a: {"tasks": a.batch()}),
+    Case("get_server_stats"),
+]
+
+
+async def _call(server, mock: MockServer, case: Case, account: Account, cold: bool,
+                trace_memory: bool = False) -> Dict[str, Any]:
+    """Call a tool once and measure its latency, the requests it sent and, optionally, its peak memory."""
+    mock.reset()
+    client = server.ticktick
+    if cold:
+        client.cache.clear()
+        server.task_index = server.TaskIndex()
+    func = getattr(server, case.tool)
+    kwargs = case.args(account)
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = await func(**kwargs)
+        error = not isinstance(result, str) or result.startswith("Error")
+    except Exception:
+        error = True
+    finally:
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+    # Background revalidations started by the call are part of its cost
+    await asyncio.gather(*list(client._background_tasks), return_exceptions=True)
+    return {"seconds": seconds, "http_calls": mock.request_count(), "error": error, "peak": peak}
+
+
+async def run_benchmarks(mock: MockServer, projects: int, tasks: int, repeat: int = 5) -> Dict[str, Any]:
+    """
+    Benchmark every registered tool against a running mock.
+
+    TICKTICK_BASE_URL, TICKTICK_TOKEN_URL and TICKTICK_ACCESS_TOKEN must
+    point the client at the mock.
+
+    Returns:
+        {"tools": {name: measurements}, "skipped": [names]}
+    """
+    from ticktick_mcp.src import server
+
+    task_index = server.task_index
+    server.ticktick = server.AsyncTickTickClient()
+    account = Account(projects, tasks)
+    cases = {case.tool: case for case in CASES}
+    registered = [tool.name for tool in await server.mcp.list_tools()]
+
+    results: Dict[str, Any] = {}
+    skipped = []
+    try:
+        # Open the connection and load the lazily imported code before measuring
+        await server.get_projects()
+        for name in registered:
+            case = cases.get(name)
+            if case is None:
+                skipped.append(name)
+                continue
+            calls = [await _call(server, mock, case, account, cold=i == 0) for i in range(repeat + 1)]
+            cold, warm = calls[0], calls[1:] or calls[:1]
+            # Measured apart, as tracing allocations slows the calls down
+            memory = await _call(server, mock, case, account, cold=True, trace_memory=True)
+            warm_ms = [call["seconds"] * 1000 for call in warm]
+            results[name] = {
+                "cold_ms": round(cold["seconds"] * 1000, 2),
+                "warm_p50_ms": round(statistics.median(warm_ms), 2),
+                "warm_mean_ms": round(statistics.fmean(warm_ms), 2),
+                "warm_max_ms": round(max(warm_ms), 2),
+                "http_calls_cold": cold["http_calls"],
+                "http_calls_warm": round(statistics.fmean(call["http_calls"] for call in warm), 2),
+                "peak_kib": round(memory["peak"] / 1024, 1),
+                "errors": sum(call["error"] for call in calls),
+            }
+    finally:
+        await server.ticktick.aclose()
+        server.ticktick = None
+        server.task_index = task_index
+    return {"tools": results, "skipped": skipped}
+
+
+def _git_commit() -> Dict[str, Any]:
+    root = Path(__file__).resolve().parent.parent
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render the tool measurements of a report as a table."""
+    lines = [f"{'tool':<24} {'cold ms':>9} {'warm p50':>9} {'warm max':>9} {'http cold':>9} "
+             f"{'http warm':>9} {'peak KiB':>9} {'errors':>6}"]
+    for name, tool in sorted(report["tools"].items()):
+        lines.append(f"{name:<24} {tool['cold_ms']:>9.1f} {tool['warm_p50_ms']:>9.1f} {tool['warm_max_ms']:>9.1f} "
+                     f"{tool['http_calls_cold']:>9} {tool['http_calls_warm']:>9} {tool['peak_kib']:>9.1f} "
+                     f"{tool['errors']:>6}")
+    return "\n".join(lines)
+
+
+def _change(old: float, new: float) -> str:
+    if not old:
+        return f"{old:g} -> {new:g}"
+    return f"{old:g} -> {new:g} ({(new - old) / old * 100:+.0f}%)"
+
+
+def compare_reports(old: Dict[str, Any], new: Dict[str, Any]) -> str:
+    """Render the changes between two reports, tool by tool."""
+    lines = []
+    if old.get("config") != new.get("config"):
+        lines.append(f"Warning: the reports were run with different settings: {old.get('config')} vs {new.get('config')}")
+    lines.append(f"{(old.get('commit') or '?')[:10]} -> {(new.get('commit') or '?')[:10]}")
+    lines.append(f"{'tool':<24} {'cold ms':>24} {'warm p50 ms':>24} {'http cold':>14} {'peak KiB':>24}")
+    for name in sorted(set(old["tools"]) | set(new["tools"])):
+        before, after = old["tools"].get(name), new["tools"].get(name)
+        if before is None or after is None:
+            lines.append(f"{name:<24} {'only in the new report' if before is None else 'only in the old report'}")
+            continue
+        lines.append(f"{name:<24} {_change(before['cold_ms'], after['cold_ms']):>24} "
+                     f"{_change(before['warm_p50_ms'], after['warm_p50_ms']):>24} "
+                     f"{before['http_calls_cold']:>5} -> {after['http_calls_cold']:<5} "
+                     f"{_change(before['peak_kib'], after['peak_kib']):>24}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the MCP tools against a local mock TickTick API")
+    parser.add_argument("--projects", type=int, default=10, help="Number of projects (default: 10)")
+    parser.add_argument("--tasks", type=int, default=50, help="Tasks per project (default: 50)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra seconds per API request")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated account and faults")
+    parser.add_argument("--repeat", type=int, default=5, help="Warm calls per tool (default: 5)")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Client-side TICKTICK_RATE_LIMIT (default: 0, disabled)")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    parser.add_argument("--compare", help="Compare with a report written by an earlier run")
+    args = parser.parse_args()
+
+    if args.projects < 1 or args.tasks < 1:
+        parser.error("--projects and --tasks must be at least 1")
+    config = {key: getattr(args, key) for key in
+              ("projects", "tasks", "latency", "jitter", "throttle_rate", "error_rate", "seed", "repeat", "rate_limit")}
+
+    with tempfile.TemporaryDirectory(prefix="ticktick-bench-") as home, \
+         mock_server(args.projects, args.tasks, args.latency, args.jitter,
+                     args.throttle_rate, args.error_rate, args.seed) as mock:
+        os.environ.update({
+            "HOME": home,
+            "TICKTICK_BASE_URL": mock.base_url,
+            "TICKTICK_TOKEN_URL": mock.token_url,
+            "TICKTICK_ACCESS_TOKEN": "benchmark-token",
+            "TICKTICK_RATE_LIMIT": str(args.rate_limit),
+        })
+        for name in ("TICKTICK_SNAPSHOT", "TICKTICK_SYNC_INTERVAL", "TICKTICK_TRACE", "TICKTICK_METRICS_FILE"):
+            os.environ.pop(name, None)
+        # run_benchmarks() imports the server, so it sees the environment above;
+        # retries and requests are logged too often to read the report
+        for name in ("ticktick_mcp", "httpx"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+        results = asyncio.run(run_benchmarks(mock, args.projects, args.tasks, args.repeat))
+
+    report = dict(
+        _git_commit(),
+        created=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        python=platform.python_version(),
+        config=config,
+        **results,
+    )
+    print(format_report(report))
+    if report["skipped"]:
+        print(f"Skipped: {', '.join(report['skipped'])}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            print()
+            print(compare_reports(json.load(f), report))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,11 @@ setup(
     author="broven",
     author_email="",
     url="https://github.com/broven/mcp-server-ticktick",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=[
         "mcp[cli]>=1.2.0,<2.0.0",
         "requests>=2.30.0,<3.0.0",
+        "httpx>=0.27.0,<1.0.0",
     ],
     python_requires=">=3.10",
     entry_points={
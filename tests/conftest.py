@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from ticktick_mcp.src import ratelimit
+from ticktick_mcp.src.metrics import MetricsRegistry
+from ticktick_mcp.src.ticktick_client import AsyncTickTickClient
+
+
+BASE_URL = "https://api.test/open/v1"
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    """Give every test its own disabled process-wide rate limiter."""
+    monkeypatch.setenv("TICKTICK_RATE_LIMIT", "0")
+    monkeypatch.setattr(ratelimit, "_limiter", None)
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """
+    Build an AsyncTickTickClient whose HTTP traffic goes to `handler`.
+
+    Retries have no backoff delay and every client records its own metrics.
+    """
+    monkeypatch.setenv("TICKTICK_ACCESS_TOKEN", "old-token")
+    monkeypatch.setenv("TICKTICK_REFRESH_TOKEN", "refresh")
+    monkeypatch.setenv("TICKTICK_CLIENT_ID", "id")
+    monkeypatch.setenv("TICKTICK_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("TICKTICK_BASE_URL", BASE_URL)
+    monkeypatch.setenv("TICKTICK_TOKEN_URL", "https://auth.test/oauth/token")
+
+    def build(handler):
+        with patch('ticktick_mcp.src.ticktick_client.TickTickAuth.load_config', return_value={}):
+            client = AsyncTickTickClient()
+        client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._http_loop = asyncio.get_running_loop()
+        client.retry_policy.base_delay = 0
+        client.metrics = MetricsRegistry()
+        return client
+
+    return build
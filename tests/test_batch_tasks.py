@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from ticktick_mcp.src.server import batch_complete_tasks, batch_create_tasks, batch_delete_tasks, batch_update_tasks
+
+
+@pytest.mark.asyncio
+async def test_batch_create_runs_concurrently_and_keeps_input_order(monkeypatch):
+    """Tasks are created concurrently but reported in input order."""
+    monkeypatch.setenv("TICKTICK_BATCH_CONCURRENCY", "3")
+    in_flight = 0
+    peak = 0
+
+    async def create_task(title, project_id, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later tasks finish first
+        await asyncio.sleep(0.01 * (10 - int(title.split()[1])))
+        in_flight -= 1
+        if title == "Task 4":
+            return {"error": "400 Bad Request"}
+        return {"id": f"id{title.split()[1]}", "title": title, "projectId": project_id}
+
+    mock_client = AsyncMock()
+    mock_client.create_task.side_effect = create_task
+    tasks = [{"title": f"Task {i}", "project_id": "p1"} for i in range(1, 7)]
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result = await batch_create_tasks(tasks)
+
+    assert peak == 3
+    assert "Successfully created: 5 tasks" in result
+    assert "Failed: 1 tasks" in result
+    created = result.split("✅ Successfully Created Tasks:\n")[1].split("\n\n")[0].splitlines()
+    assert created == [f"{i}. Task {i} (ID: id{i})" for i in (1, 2, 3, 5, 6)]
+    assert "Task 4 ('Task 4'): 400 Bad Request" in result
+
+
+@pytest.mark.asyncio
+async def test_batch_does_not_resend_failed_tasks():
+    """Failures are reported once; retrying 429s is left to the client's retry policy."""
+    attempts = {}
+
+    async def complete_task(project_id, task_id):
+        attempts[task_id] = attempts.get(task_id, 0) + 1
+        if task_id == "t2":
+            # The URL of a 404 may well contain "429"
+            return {"error": f"Client error '404 Not Found' for url '/project/{project_id}/task/t2'", "status": 404}
+        if task_id == "t3":
+            return {"error": "Client error '429 Too Many Requests'", "status": 429}
+        return {}
+
+    mock_client = AsyncMock()
+    mock_client.complete_task.side_effect = complete_task
+    tasks = [{"task_id": f"t{i}", "project_id": "65a4291f"} for i in range(1, 4)]
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result = await batch_complete_tasks(tasks)
+
+    assert attempts == {"t1": 1, "t2": 1, "t3": 1}
+    assert "Successfully completed: 1 tasks" in result
+    assert "Failed: 2 tasks" in result
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_validates_references():
+    """Every task needs a task_id and a project_id before anything is deleted."""
+    mock_client = AsyncMock()
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result = await batch_delete_tasks([{"task_id": "t1"}, {"task_id": "t2", "project_id": "p1"}])
+
+    assert "Task 1: 'project_id' is required" in result
+    mock_client.delete_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_update_validates_dates():
+    """Malformed dates are reported before any task is updated."""
+    mock_client = AsyncMock()
+    tasks = [{"task_id": "t1", "project_id": "p1", "due_date": "2025-02-30T10:00:00"},
+             {"task_id": "t2", "project_id": "p1", "start_date": "next week"}]
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result = await batch_update_tasks(tasks)
+
+    assert "Task 1: Invalid due_date format" in result
+    assert "Task 2: Invalid start_date format" in result
+    mock_client.update_task.assert_not_called()
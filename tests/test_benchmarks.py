@@ -0,0 +1,73 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.mock_api import Faults, MockTickTickAPI, project_id, task_id
+from benchmarks.run import SKIPPED_TOOLS, compare_reports, mock_server, run_benchmarks
+
+
+def _request(url, method="GET"):
+    request = urllib.request.Request(url, data=b"" if method != "GET" else None, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_mock_api_serves_account_and_counts_requests():
+    """The mock serves the generated account, counts requests per endpoint and restores the account."""
+    with MockTickTickAPI(projects=2, tasks_per_project=3) as api:
+        status, _, body = _request(f"{api.base_url}/project/{project_id(1)}/data")
+        assert status == 200 and len(json.loads(body)["tasks"]) == 3
+
+        status, _, _ = _request(f"{api.base_url}/project/{project_id(1)}/task/{task_id(1, 0)}", "DELETE")
+        assert status == 200 and len(api.tasks[project_id(1)]) == 2
+        assert api.requests == {"GET /open/v1/project/{id}/data": 1, "DELETE /open/v1/project/{id}/task/{id}": 1}
+
+        status, _, _ = _request(api.base_url.replace("/open/v1", "/_mock/reset"), "POST")
+        assert status == 200 and len(api.tasks[project_id(1)]) == 3 and api.request_count() == 0
+
+
+def test_mock_api_injects_faults():
+    """Throttled requests get a 429 with Retry-After; failed ones a 503."""
+    with MockTickTickAPI(projects=1, tasks_per_project=1, faults=Faults(rate_limited=1.0)) as api:
+        status, headers, _ = _request(f"{api.base_url}/project")
+        assert status == 429 and float(headers["Retry-After"]) > 0
+        api.faults = Faults(server_errors=1.0)
+        assert _request(f"{api.base_url}/project")[0] == 503
+
+
+@pytest.mark.asyncio
+async def test_run_benchmarks_covers_every_tool(monkeypatch, tmp_path):
+    """Every tool but the OAuth ones is measured against the mock without errors."""
+    with mock_server(projects=2, tasks=3) as mock:
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setenv("TICKTICK_BASE_URL", mock.base_url)
+        monkeypatch.setenv("TICKTICK_TOKEN_URL", mock.token_url)
+        monkeypatch.setenv("TICKTICK_ACCESS_TOKEN", "token")
+        report = await run_benchmarks(mock, projects=2, tasks=3, repeat=1)
+
+    assert sorted(report["skipped"]) == sorted(SKIPPED_TOOLS)
+    assert all(tool["errors"] == 0 for tool in report["tools"].values())
+    # The project list and both projects when cold, nothing once cached
+    assert report["tools"]["get_all_tasks"]["http_calls_cold"] == 3
+    assert report["tools"]["get_all_tasks"]["http_calls_warm"] == 0
+    assert report["tools"]["batch_delete_tasks"]["http_calls_cold"] == 6
+    assert report["tools"]["get_all_tasks"]["peak_kib"] > 0
+
+
+def test_compare_reports():
+    """Comparisons show the change of every tool and warn about different settings."""
+    tool = {"cold_ms": 100.0, "warm_p50_ms": 10.0, "http_calls_cold": 4, "peak_kib": 50.0}
+    old = {"commit": "aaaa", "config": {"projects": 10}, "tools": {"get_all_tasks": tool}}
+    new = {"commit": "bbbb", "config": {"projects": 20},
+           "tools": {"get_all_tasks": dict(tool, cold_ms=50.0), "get_next_tasks": tool}}
+
+    text = compare_reports(old, new)
+
+    assert "different settings" in text
+    assert "100 -> 50 (-50%)" in text
+    assert "get_next_tasks" in text and "only in the new report" in text
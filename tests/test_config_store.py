@@ -0,0 +1,60 @@
+import json
+import os
+import threading
+
+from unittest.mock import patch
+
+from ticktick_mcp.src.auth import ConfigStore, TickTickAuth
+
+
+def test_config_is_read_once_until_the_file_changes(tmp_path):
+    """Loads are served from memory until the file is modified by someone else."""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"access_token": "a"}))
+    store = ConfigStore()
+
+    with patch('ticktick_mcp.src.auth.TickTickAuth.get_config_path', return_value=path):
+        assert store.load() == {"access_token": "a"}
+        store.load()["access_token"] = "mutated"
+        assert store.load() == {"access_token": "a"}
+        assert store.reads == 1
+
+        # External edit, e.g. by the auth CLI
+        tmp = tmp_path / "new.json"
+        tmp.write_text(json.dumps({"access_token": "b"}))
+        os.replace(tmp, path)
+        assert store.load() == {"access_token": "b"}
+        assert store.reads == 2
+
+
+def test_save_merges_and_replaces_the_file(tmp_path):
+    """Saves keep the existing keys and leave a private, complete file behind."""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"client_id": "id"}))
+    store = ConfigStore()
+
+    with patch('ticktick_mcp.src.auth.TickTickAuth.get_config_path', return_value=path):
+        store.save({"access_token": "token"})
+        assert store.load() == {"client_id": "id", "access_token": "token"}
+        assert store.reads == 1
+
+    assert json.loads(path.read_text()) == {"client_id": "id", "access_token": "token"}
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert not list(tmp_path.glob(".config-*"))
+
+
+def test_concurrent_saves_lose_no_keys(tmp_path):
+    """Concurrent token saves from several threads all end up in the file."""
+    path = tmp_path / "config.json"
+
+    def save(n):
+        TickTickAuth.save_config({f"key{n}": n})
+
+    with patch('ticktick_mcp.src.auth.TickTickAuth.get_config_path', return_value=path):
+        threads = [threading.Thread(target=save, args=(n,)) for n in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert json.loads(path.read_text()) == {f"key{n}": n for n in range(20)}
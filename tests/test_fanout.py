@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from ticktick_mcp.src.fanout import fan_out
+from ticktick_mcp.src.server import get_all_tasks
+
+
+@pytest.mark.asyncio
+async def test_fan_out_preserves_order_and_limits_concurrency():
+    """Results come back in input order and never exceed the in-flight limit."""
+    in_flight = 0
+    peak = 0
+
+    async def work(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later items finish first to make ordering non-trivial
+        await asyncio.sleep(0.01 * (10 - item))
+        in_flight -= 1
+        return item * 2
+
+    results = await fan_out(range(10), work, max_concurrency=3)
+
+    assert [r.value for r in results] == [i * 2 for i in range(10)]
+    assert all(r.ok for r in results)
+    assert peak <= 3
+
+
+@pytest.mark.asyncio
+async def test_fan_out_isolates_failures():
+    """A failing item is reported without aborting the others."""
+    async def work(item):
+        if item == 1:
+            raise RuntimeError("boom")
+        return item
+
+    results = await fan_out([0, 1, 2], work)
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[1].error == "boom"
+    assert results[2].value == 2
+
+
+@pytest.mark.asyncio
+async def test_filter_reports_failed_projects():
+    """Cross-project tools list projects that failed to load instead of dropping them silently."""
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [
+        {'id': 'p1', 'name': 'Good'},
+        {'id': 'p2', 'name': 'Broken'},
+        {'id': 'p3', 'name': 'Closed', 'closed': True},
+    ]
+
+    def project_data(project_id):
+        if project_id == 'p2':
+            return {'error': '500 Server Error'}
+        return {'project': {'name': 'Good'}, 'tasks': [{'id': 't1', 'title': 'Task', 'projectId': project_id}]}
+
+    mock_client.get_project_with_data.side_effect = project_data
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result = await get_all_tasks()
+
+    assert "Found 1 tasks" in result
+    assert "Could not fetch 1 project(s)" in result
+    assert "Broken (p2): 500 Server Error" in result
+    called_ids = [c.args[0] for c in mock_client.get_project_with_data.call_args_list]
+    assert sorted(called_ids) == ['p1', 'p2']
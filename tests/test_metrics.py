@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from ticktick_mcp.src.metrics import Histogram, MetricsRegistry, endpoint_template
+from ticktick_mcp.src.server import get_projects, get_server_stats
+
+
+def test_endpoint_template_folds_ids():
+    assert endpoint_template("/project/abc/task/123") == "/project/{id}/task/{id}"
+    assert endpoint_template("/project/abc/data") == "/project/{id}/data"
+    assert endpoint_template("/task/123") == "/task/{id}"
+    assert endpoint_template("/project") == "/project"
+
+
+def test_histogram_quantiles():
+    histogram = Histogram()
+    for seconds in [0.001] * 90 + [0.3] * 10:
+        histogram.observe(seconds)
+
+    assert histogram.quantile(0.5) == 0.005
+    assert histogram.quantile(0.95) == 0.3
+    assert histogram.snapshot()["count"] == 100
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_per_endpoint_and_tool(make_client):
+    """Requests, errors, retries and bytes are recorded, and counted for the running tool."""
+    attempts = 0
+
+    async def handler(request):
+        nonlocal attempts
+        if request.url.path.endswith("/data"):
+            attempts += 1
+            if attempts == 1:
+                return httpx.Response(503)
+        return httpx.Response(200, json={"id": "p1", "tasks": []})
+
+    client = make_client(handler)
+    token = client.metrics.start_tool()
+    await asyncio.gather(client.get_project_with_data("p1"), client.get_project("p2"))
+    client.metrics.finish_tool("get_things", 0.2, False, token)
+
+    stats = client.metrics.snapshot()
+    data = stats["endpoints"]["GET /project/{id}/data"]
+    assert data["count"] == 2
+    assert data["errors"] == 1 and data["error_rate"] == 0.5
+    assert data["statuses"] == {"200": 1, "503": 1}
+    assert data["retries"] == 1
+    assert data["bytes_received"] > 0
+    assert stats["endpoints"]["GET /project/{id}"]["count"] == 1
+    assert stats["tools"]["get_things"]["api_requests"] == 3
+
+    text = client.metrics.to_prometheus()
+    assert 'ticktick_api_responses_total{method="GET",endpoint="/project/{id}/data",status="503"} 1' in text
+    assert 'ticktick_tool_duration_seconds_count{tool="get_things"} 1' in text
+
+
+def test_prometheus_dump_is_written(tmp_path):
+    registry = MetricsRegistry()
+    registry.record_request("GET", "/project", 200, 0.01, 0, 10)
+
+    assert registry.dump_prometheus(tmp_path / "metrics" / "ticktick.prom")
+    assert "ticktick_api_received_bytes_total" in (tmp_path / "metrics" / "ticktick.prom").read_text()
+
+
+@pytest.mark.asyncio
+async def test_server_stats_tool_reports_tool_latency():
+    """Tool invocations show up in get_server_stats with the client counters."""
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': 'p1', 'name': 'Work'}]
+    mock_client.get_cache_stats = lambda: {"hits": 1}
+    mock_client.get_pool_stats = lambda: {}
+    mock_client.get_rate_limit_stats = lambda: {}
+    mock_client.get_coalescing_stats = lambda: {}
+    mock_client.retry_policy.retries = 0
+    with patch('ticktick_mcp.src.server.ticktick', mock_client), \
+         patch('ticktick_mcp.src.server.get_metrics', return_value=MetricsRegistry()):
+        await get_projects()
+        await get_projects(size=0)
+        stats = json.loads(await get_server_stats())
+
+    assert stats["tools"]["get_projects"]["count"] == 2
+    assert stats["cache"] == {"hits": 1}
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from ticktick_mcp.src.models import Priority, Project, Subtask, Task, TaskStatus, decode_response, to_json
+from ticktick_mcp.src.server import get_all_tasks
+from ticktick_mcp.src.task_index import DueRange, TaskIndex, parse_due_timestamp
+
+TASK = {
+    'id': 't1',
+    'projectId': 'p1',
+    'title': 'Write report',
+    'dueDate': '2024-03-01T12:00:00.000+0000',
+    'priority': 5,
+    'status': 0,
+    'items': [{'id': 's1', 'title': 'Outline', 'status': 1}],
+    'reminders': ['TRIGGER:PT0S'],
+}
+
+
+def test_task_behaves_like_its_json_dict():
+    """Decoded tasks answer the dict lookups the server uses and convert back unchanged."""
+    task = Task(TASK)
+
+    assert task.get('title') == 'Write report'
+    assert task['dueDate'] == TASK['dueDate']
+    assert task.get('content') is None and 'content' not in task
+    assert task.get('reminders') == ['TRIGGER:PT0S']
+    assert task.priority is Priority.HIGH and task.status is TaskStatus.ACTIVE
+    assert isinstance(task.get('items')[0], Subtask)
+    assert task == TASK
+    assert task.to_dict() == TASK
+    assert json.loads(json.dumps(task, default=to_json)) == TASK
+
+
+def test_task_is_compact_and_pre_parsed():
+    """Tasks have no per-object dict, parse their due date once and share project IDs."""
+    first = Task(TASK)
+    second = Task(dict(TASK, id='t2', projectId=''.join(['p', '1'])))
+
+    assert not hasattr(first, '__dict__')
+    assert first.due_ts == parse_due_timestamp(TASK['dueDate'])
+    assert first.project_id is second.project_id
+    assert Task({'id': 't3', 'priority': 2}).priority == 2
+
+
+def test_decode_response_by_endpoint():
+    """Responses are decoded according to the endpoint they come from."""
+    projects = decode_response("/project", [{'id': 'p1', 'name': 'Work'}])
+    data = decode_response("/project/p1/data", {'project': {'id': 'p1'}, 'tasks': [TASK], 'columns': []})
+
+    assert isinstance(projects[0], Project)
+    assert isinstance(data['project'], Project) and isinstance(data['tasks'][0], Task)
+    assert data['columns'] == []
+    assert isinstance(decode_response("/task", TASK), Task)
+    assert decode_response("/project/p1", {}) == {}
+    assert decode_response("/project/p1/task/t1/complete", {'ok': True}) == {'ok': True}
+
+
+def test_index_uses_pre_parsed_due_date():
+    """The task index takes the due timestamp of decoded tasks instead of parsing it."""
+    index = TaskIndex()
+    task = Task(TASK)
+    index.update_project('p1', {'tasks': [task]})
+
+    assert index.get(('p1', 't1')).due_ts == task.due_ts
+    assert DueRange(task.due_ts, task.due_ts + 1).lookup(index) == {('p1', 't1')}
+    assert index._parsed_due == {}
+
+
+@pytest.mark.asyncio
+async def test_tools_accept_decoded_models():
+    """The listing tools format and serialize decoded models like JSON dicts."""
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = decode_response("/project", [{'id': 'p1', 'name': 'Work'}])
+    mock_client.get_project_with_data.return_value = decode_response(
+        "/project/p1/data", {'project': {'id': 'p1', 'name': 'Work'}, 'tasks': [TASK]}
+    )
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        text = await get_all_tasks()
+        result = json.loads(await get_all_tasks(output_format="json", fields=["id", "priority", "items"]))
+
+    assert "Title: Write report" in text and "Priority: High" in text and "1. [✓] Outline" in text
+    assert result["tasks"] == [{"id": "t1", "priority": 5, "items": [{"title": "Outline", "status": 1}]}]
+
+
+def test_formatting_and_indexing_read_slots_directly():
+    """The formatters and the task index read decoded tasks through their slots, not Mapping.get."""
+    from ticktick_mcp.src.models import Model
+    from ticktick_mcp.src.server import format_task, project_task, serialize_task
+
+    task = Task(TASK)
+    with patch.object(Model, 'get', side_effect=AssertionError("Mapping lookup on the hot path")):
+        text = format_task(task)
+        projected = project_task(task, None)
+        compact = serialize_task(task, "compact")
+        index = TaskIndex()
+        index.update_project('p1', {'tasks': [task]})
+
+    assert "Title: Write report" in text and "Priority: High" in text
+    assert projected['dueDate'] == TASK['dueDate'] and 'content' not in projected
+    assert compact == {'id': 't1', 'projectId': 'p1', 'title': 'Write report',
+                       'dueDate': TASK['dueDate'], 'priority': 5}
+    assert index.with_field('priority', 5) == {('p1', 't1')}
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from ticktick_mcp.src.server import get_all_tasks, get_project_tasks, get_projects
+
+
+def make_client():
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': 'p1', 'name': 'Work', 'color': '#fff', 'kind': 'TASK'}]
+    mock_client.get_project_with_data.return_value = {
+        'project': {'id': 'p1', 'name': 'Work'},
+        'tasks': [
+            {'id': f't{i}', 'projectId': 'p1', 'title': f'Task {i}', 'priority': 0, 'status': 0,
+             'content': 'Long description ' * 20, 'items': [{'title': 'Step', 'status': 1}]}
+            for i in range(3)
+        ],
+    }
+    return mock_client
+
+
+@pytest.mark.asyncio
+async def test_filter_tools_return_json():
+    """The json format returns the selected task fields and the paging information."""
+    with patch('ticktick_mcp.src.server.ticktick', make_client()):
+        result = json.loads(await get_all_tasks(size=2, output_format="json"))
+
+    assert result["total"] == 3
+    assert result["pages"] == 2
+    assert result["projects"] == {"p1": "Work"}
+    assert [task["id"] for task in result["tasks"]] == ["t0", "t1"]
+    assert result["tasks"][0]["items"] == [{"title": "Step", "status": 1}]
+
+
+@pytest.mark.asyncio
+async def test_compact_format_is_smallest():
+    """The compact format keeps only essential, non-default fields."""
+    with patch('ticktick_mcp.src.server.ticktick', make_client()):
+        text = await get_project_tasks("p1")
+        compact = await get_project_tasks("p1", output_format="compact")
+
+    result = json.loads(compact)
+    assert result["tasks"][0] == {"id": "t0", "projectId": "p1", "title": "Task 0"}
+    assert len(compact) < len(text) / 4
+
+
+@pytest.mark.asyncio
+async def test_invalid_output_format_is_rejected():
+    """Unknown formats are reported before any API call."""
+    mock_client = make_client()
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result = await get_projects(output_format="xml")
+
+    assert "Invalid output_format 'xml'" in result
+    mock_client.get_projects.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_fields_restrict_every_format():
+    """Only the requested fields are returned, in text and JSON."""
+    with patch('ticktick_mcp.src.server.ticktick', make_client()):
+        text = await get_all_tasks(fields=["id", "title"])
+        result = json.loads(await get_project_tasks("p1", output_format="json", fields=["title", "items"]))
+
+    assert "Title: Task 0" in text
+    assert "Priority" not in text and "Content" not in text and "Subtasks" not in text
+    assert result["tasks"][0] == {"title": "Task 0", "items": [{"title": "Step", "status": 1}]}
+
+
+@pytest.mark.asyncio
+async def test_text_format_renders_is_all_day():
+    """Requesting isAllDay in text mode shows it for every task."""
+    mock_client = make_client()
+    mock_client.get_project_with_data.return_value['tasks'][0]['isAllDay'] = True
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        text = await get_project_tasks("p1", fields=["isAllDay"])
+
+    assert text.count("All Day: Yes") == 1 and text.count("All Day: No") == 2
+
+
+@pytest.mark.asyncio
+async def test_invalid_fields_are_rejected():
+    """Unknown field names are reported before any API call."""
+    mock_client = make_client()
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result = await get_all_tasks(fields=["title", "secret"])
+
+    assert "Invalid fields ['secret']" in result
+    mock_client.get_projects.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_long_content_is_truncated(monkeypatch):
+    """Task descriptions are cut at TICKTICK_MAX_CONTENT_LENGTH characters."""
+    monkeypatch.setenv("TICKTICK_MAX_CONTENT_LENGTH", "20")
+    with patch('ticktick_mcp.src.server.ticktick', make_client()):
+        result = json.loads(await get_all_tasks(output_format="json", fields=["content"]))
+
+    content = result["tasks"][0]["content"]
+    assert content.startswith("Long description Lon…")
+    assert "truncated, 320 more characters" in content
+
+
+@pytest.mark.asyncio
+async def test_json_formats_answer_an_account_without_projects():
+    """An empty account gives an empty JSON document, not prose."""
+    mock_client = make_client()
+    mock_client.get_projects.return_value = []
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        tasks = json.loads(await get_all_tasks(output_format="compact"))
+        projects = json.loads(await get_projects(output_format="json"))
+
+    assert tasks["tasks"] == [] and tasks["total"] == 0
+    assert projects["projects"] == [] and projects["total"] == 0
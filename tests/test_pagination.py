@@ -1,5 +1,7 @@
+import asyncio
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock
 from ticktick_mcp.src.server import (
     get_projects,
     get_project_tasks,
@@ -12,7 +14,7 @@ from ticktick_mcp.src.server import (
 @pytest.mark.asyncio
 async def test_get_projects_pagination():
     """Test get_projects pagination logic."""
-    mock_client = MagicMock()
+    mock_client = AsyncMock()
     # Create 25 projects
     mock_projects = [{'id': f'proj_{i}', 'name': f'Project {i}'} for i in range(25)]
     mock_client.get_projects.return_value = mock_projects
@@ -51,7 +53,7 @@ async def test_get_projects_pagination():
 @pytest.mark.asyncio
 async def test_get_project_tasks_pagination():
     """Test get_project_tasks pagination logic."""
-    mock_client = MagicMock()
+    mock_client = AsyncMock()
     # Create 15 tasks
     mock_tasks = [{'id': f'task_{i}', 'title': f'Task {i}', 'projectId': 'p1'} for i in range(15)]
     mock_client.get_project_with_data.return_value = {
@@ -76,7 +78,7 @@ async def test_get_project_tasks_pagination():
 @pytest.mark.asyncio
 async def test_filtered_tasks_pagination():
     """Test pagination in helper function via get_all_tasks."""
-    mock_client = MagicMock()
+    mock_client = AsyncMock()
     mock_projects = [{'id': 'p1', 'name': 'P1'}]
     # Create 12 tasks
     mock_tasks = [{'id': f't{i}', 'title': f'Task {i}', 'projectId': 'p1'} for i in range(12)]
@@ -105,7 +107,7 @@ async def test_filtered_tasks_pagination():
 @pytest.mark.asyncio
 async def test_empty_results_pagination():
     """Test pagination with empty results."""
-    mock_client = MagicMock()
+    mock_client = AsyncMock()
     mock_client.get_projects.return_value = []
 
     with patch('ticktick_mcp.src.server.ticktick', mock_client):
@@ -115,6 +117,68 @@ async def test_empty_results_pagination():
 @pytest.mark.asyncio
 async def test_invalid_params():
     """Test invalid page/size parameters."""
-    with patch('ticktick_mcp.src.server.ticktick', MagicMock()):
+    with patch('ticktick_mcp.src.server.ticktick', AsyncMock()):
         assert await get_projects(page=0) == "Page must be at least 1."
         assert await get_projects(size=0) == "Size must be at least 1."
+
+@pytest.mark.asyncio
+async def test_get_all_tasks_fast_page_stops_early(monkeypatch):
+    """Fast pages stop fetching projects once the page is full and resume from a cursor."""
+    monkeypatch.setenv("TICKTICK_MAX_CONCURRENCY", "2")
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': f'p{i}', 'name': f'Project {i}'} for i in range(6)]
+
+    async def get_project_with_data(project_id):
+        return {'tasks': [{'id': f'{project_id}_t{i}', 'title': f'{project_id} task {i}', 'projectId': project_id}
+                          for i in range(3)]}
+
+    mock_client.get_project_with_data.side_effect = get_project_with_data
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result_p1 = await get_all_tasks(size=4, fast_page=True)
+        assert "Showing tasks 1-4" in result_p1
+        assert "more tasks may be available" in result_p1
+        assert "Found" not in result_p1
+        assert "p1 task 0" in result_p1
+        assert "p1 task 1" not in result_p1
+        # Only the first window of two projects was fetched
+        assert mock_client.get_project_with_data.await_count == 2
+
+        cursor = result_p1.split('cursor="')[1].split('"')[0]
+        result_p2 = await get_all_tasks(size=4, cursor=cursor)
+        assert "Showing tasks 5-8" in result_p2
+        assert "Task 5:" in result_p2
+        assert "p1 task 1" in result_p2
+        assert "p2 task 1" in result_p2
+        assert "p2 task 2" not in result_p2
+
+        invalid = await get_all_tasks(size=4, cursor="not-a-cursor")
+        assert "Invalid cursor" in invalid
+
+        # The last page reports that nothing is left
+        last = await get_all_tasks(size=4, page=5, fast_page=True)
+        assert "Showing tasks 17-18" in last
+        assert "no more tasks" in last
+        assert "cursor=" not in last
+
+@pytest.mark.asyncio
+async def test_get_all_tasks_reports_timed_out_projects(monkeypatch):
+    """A project still loading at the tool deadline is listed instead of blocking the tool."""
+    monkeypatch.setenv("TICKTICK_TOOL_DEADLINE", "0.2")
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': 'fast', 'name': 'Fast'}, {'id': 'hung', 'name': 'Hung'}]
+
+    async def get_project_with_data(project_id):
+        if project_id == 'hung':
+            await asyncio.sleep(10)
+        return {'tasks': [{'id': 't1', 'title': 'Quick task', 'projectId': project_id}]}
+
+    mock_client.get_project_with_data.side_effect = get_project_with_data
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result = await asyncio.wait_for(get_all_tasks(), 2)
+
+    assert "Found 1 tasks" in result
+    assert "Quick task" in result
+    assert "Timed out projects (1)" in result
+    assert "- Hung (hung)" in result
@@ -0,0 +1,64 @@
+import httpx
+import pytest
+
+from ticktick_mcp.src.ratelimit import TokenBucket
+
+
+def test_bucket_allows_bursts_then_spaces_requests():
+    """The first `burst` requests go out at once, the next ones wait for a refill."""
+    bucket = TokenBucket(rate=10, burst=3)
+
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(0.1, abs=0.01)
+    assert waits[4] == pytest.approx(0.2, abs=0.01)
+    stats = bucket.stats()
+    assert stats["acquired"] == 5
+    assert stats["delayed"] == 2
+    assert stats["wait_time"] == pytest.approx(0.3, abs=0.02)
+
+
+def test_bucket_slows_down_on_429_and_recovers():
+    """A 429 halves the rate and pauses for Retry-After; successes recover the rate."""
+    bucket = TokenBucket(rate=10, burst=5)
+
+    bucket.observe(429, "2")
+    assert bucket.rate == 5
+    assert bucket.reserve() == pytest.approx(2, abs=0.01)
+    assert bucket.stats()["throttled"] == 1
+
+    for _ in range(20):
+        bucket.observe(200)
+    assert bucket.rate == 10
+
+
+def test_bucket_keeps_tokens_it_cannot_hand_out_in_time():
+    """A reservation whose wait would reach max_wait takes no token."""
+    bucket = TokenBucket(rate=10, burst=1)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve(max_wait=0.05) is None
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.stats()["acquired"] == 2
+
+
+def test_disabled_bucket_never_waits():
+    """A rate of 0 turns the limiter off."""
+    bucket = TokenBucket(rate=0, burst=1)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_clients_share_the_process_wide_limiter(monkeypatch, make_client):
+    """Every request sent by any client takes a token from the same bucket."""
+    monkeypatch.setenv("TICKTICK_RATE_LIMIT", "100")
+
+    first, second = (make_client(lambda request: httpx.Response(200, json={})) for _ in range(2))
+
+    await first.get_project_with_data("p1")
+    await second.get_project_with_data("p2")
+
+    assert first.rate_limiter is second.rate_limiter
+    assert first.get_rate_limit_stats()["acquired"] == 2
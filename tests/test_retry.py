@@ -0,0 +1,96 @@
+import httpx
+import pytest
+
+from ticktick_mcp.src.retry import RetryPolicy, is_idempotent, parse_retry_after, tool_deadline
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_after_server_error(make_client):
+    """A transient 503 on a GET is retried until it succeeds."""
+    statuses = iter([503, 502, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json={"tasks": []} if status == 200 else None)
+
+    client = make_client(handler)
+
+    assert await client.get_project_with_data("p1") == {"tasks": []}
+    assert client.retry_policy.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_create_is_not_retried_after_server_error(make_client):
+    """A POST that creates a task is not repeated after a 5xx: it may have been applied."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(503)
+
+    client = make_client(handler)
+    result = await client.create_task(title="New", project_id="p1")
+
+    assert "error" in result
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_error_result_carries_http_status(make_client):
+    """Failed requests report their HTTP status as data, not only in the message."""
+    client = make_client(lambda request: httpx.Response(404))
+
+    result = await client.complete_task("65a4291f", "t1")
+
+    assert result["status"] == 404
+    assert "timed_out" not in result
+
+
+@pytest.mark.asyncio
+async def test_create_is_retried_after_429(make_client):
+    """A 429 means the request was rejected, so even a creation is retried."""
+    responses = iter([httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200, json={"id": "t1"})])
+    client = make_client(lambda request: next(responses))
+
+    assert await client.create_task(title="New", project_id="p1") == {"id": "t1"}
+
+
+@pytest.mark.asyncio
+async def test_connection_reset_is_retried_for_reads(make_client):
+    """Read errors are retried for idempotent requests."""
+    attempts = 0
+
+    def handler(request):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise httpx.ReadError("connection reset")
+        return httpx.Response(200, json=[{"id": "p1"}])
+
+    client = make_client(handler)
+
+    assert await client.get_projects() == [{"id": "p1"}]
+    assert attempts == 2
+
+
+def test_retries_stop_at_the_tool_deadline():
+    """No retry is scheduled if its delay would exceed the remaining tool budget."""
+    policy = RetryPolicy(max_retries=3)
+
+    assert policy.delay_for(0, "GET", "/project", status=503, retry_after="5") == 5
+    with tool_deadline(1):
+        assert policy.delay_for(0, "GET", "/project", status=503, retry_after="5") is None
+
+
+def test_retry_policy_rules():
+    """Idempotency, retryable statuses and the retry budget."""
+    policy = RetryPolicy(max_retries=2, base_delay=0.1)
+
+    assert is_idempotent("POST", "/project/p1/task/t1/complete")
+    assert not is_idempotent("POST", "/task")
+    assert policy.delay_for(0, "GET", "/project", status=404) is None
+    assert policy.delay_for(2, "GET", "/project", status=503) is None
+    assert 0.05 <= policy.delay_for(1, "DELETE", "/project/p1/task/t1", failure="transport") <= 0.2
+    assert policy.delay_for(0, "POST", "/task", failure="transport") is None
+    assert policy.delay_for(0, "POST", "/task", failure="connect") is not None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock
 
 from ticktick_mcp.src.server import get_projects, get_project_tasks, get_all_tasks, initialize_client
 
@@ -7,7 +7,7 @@ from ticktick_mcp.src.server import get_projects, get_project_tasks, get_all_tas
 @pytest.mark.asyncio
 async def test_get_projects_with_size_parameter():
     """Test that get_projects accepts and respects size parameter."""
-    mock_client = MagicMock()
+    mock_client = AsyncMock()
     mock_projects = [{'id': f'proj_{i}', 'name': f'Project {i}'} for i in range(100)]
     mock_client.get_projects.return_value = mock_projects
 
@@ -22,7 +22,7 @@ async def test_get_projects_with_size_parameter():
 @pytest.mark.asyncio
 async def test_get_projects_default_size():
     """Test that get_projects uses default size of 50."""
-    mock_client = MagicMock()
+    mock_client = AsyncMock()
     mock_projects = [{'id': f'proj_{i}', 'name': f'Project {i}'} for i in range(100)]
     mock_client.get_projects.return_value = mock_projects
 
@@ -37,7 +37,7 @@ async def test_get_projects_default_size():
 @pytest.mark.asyncio
 async def test_get_project_tasks_with_size_parameter():
     """Test that get_project_tasks accepts and respects size parameter."""
-    mock_client = MagicMock()
+    mock_client = AsyncMock()
     mock_tasks = [{'id': f'task_{i}', 'title': f'Task {i}', 'projectId': 'proj_1'} for i in range(100)]
     mock_client.get_project_with_data.return_value = {'project': {'name': 'Test Project'}, 'tasks': mock_tasks}
 
@@ -52,7 +52,7 @@ async def test_get_project_tasks_with_size_parameter():
 @pytest.mark.asyncio
 async def test_get_all_tasks_with_size_parameter():
     """Test that get_all_tasks accepts and respects size parameter."""
-    mock_client = MagicMock()
+    mock_client = AsyncMock()
     mock_projects = [{'id': 'proj_1', 'name': 'Project 1', 'closed': False}]
     mock_tasks = [{'id': f'task_{i}', 'title': f'Task {i}', 'projectId': 'proj_1'} for i in range(100)]
     mock_client.get_projects.return_value = mock_projects
@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from ticktick_mcp.src.cache import ResponseCache
+from ticktick_mcp.src.retry import tool_deadline
+from ticktick_mcp.src.snapshot import load_snapshot, save_snapshot
+
+
+@pytest.fixture(autouse=True)
+def config_dir(tmp_path):
+    """Keep snapshot files in a temporary ~/.ticktick."""
+    with patch('ticktick_mcp.src.snapshot.TickTickAuth.get_config_path', return_value=tmp_path / "config.json"):
+        yield tmp_path
+
+
+def test_snapshot_round_trip(config_dir):
+    """Saved project data is seeded back as stale entries."""
+    cache = ResponseCache()
+    cache.set("/project", [{"id": "p1"}], 20)
+    cache.set("/project/p1/data", {"tasks": [{"id": "t1"}]}, 30)
+    cache.set("/project/p1/task/t1", {"id": "t1"}, 10)
+
+    assert save_snapshot(cache, "https://api.test")
+    assert (config_dir / "snapshot.json").stat().st_mode & 0o777 == 0o600
+
+    restored = ResponseCache()
+    assert load_snapshot(restored, "https://api.test") == 2
+    assert restored.get("/project") is None
+    assert restored.get_stale("/project") == [{"id": "p1"}]
+    assert restored.get_stale("/project/p1/data") == {"tasks": [{"id": "t1"}]}
+
+
+def test_snapshot_of_other_api_is_ignored():
+    """A snapshot taken against another base URL (e.g. Dida365) is not loaded."""
+    cache = ResponseCache()
+    cache.set("/project", [{"id": "p1"}], 20)
+    save_snapshot(cache, "https://api.ticktick.com/open/v1")
+
+    assert load_snapshot(ResponseCache(), "https://api.dida365.com/open/v1") == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_revalidating(make_client):
+    """A seeded entry is returned immediately and refreshed in the background."""
+    requests_seen = []
+
+    async def handler(request):
+        requests_seen.append(request.url.path)
+        return httpx.Response(200, json=[{"id": "fresh"}])
+
+    client = make_client(handler)
+    client.cache.seed("/project", [{"id": "stale"}], 20)
+
+    assert await client.get_projects() == [{"id": "stale"}]
+    await asyncio.gather(*client._background_tasks)
+
+    assert requests_seen == ["/open/v1/project"]
+    assert await client.get_projects() == [{"id": "fresh"}]
+    assert client.cache.stale_endpoints() == []
+
+
+@pytest.mark.asyncio
+async def test_revalidation_is_not_bound_to_the_calling_tool(make_client):
+    """The background refresh ignores the deadline and request count of the tool that triggered it."""
+    requests_seen = []
+
+    async def handler(request):
+        requests_seen.append(request.url.path)
+        return httpx.Response(200, json=[{"id": "fresh"}])
+
+    client = make_client(handler)
+    client.cache.seed("/project", [{"id": "stale"}], 20)
+
+    token = client.metrics.start_tool()
+    with tool_deadline(0.01):
+        await asyncio.sleep(0.02)
+        assert await client.get_projects() == [{"id": "stale"}]
+        await asyncio.gather(*client._background_tasks)
+    assert requests_seen == ["/open/v1/project"]
+    assert client.metrics.tool_requests() == 0
+    client.metrics.finish_tool("get_projects", 0.02, False, token)
+
+    assert await client.get_projects() == [{"id": "fresh"}]
+
+
+@pytest.mark.asyncio
+async def test_scans_save_the_snapshot_off_the_event_loop(monkeypatch):
+    """Cross-project scans hand the snapshot save to a worker thread instead of writing it inline."""
+    import threading
+    from unittest.mock import AsyncMock
+    from ticktick_mcp.src import server, snapshot
+
+    monkeypatch.setenv("TICKTICK_SNAPSHOT", "1")
+    monkeypatch.setattr(snapshot, "_last_saved", None)
+    monkeypatch.setattr(server, "_snapshot_save", None)
+    saved_in = []
+
+    def fake_save(cache, base_url, throttle=False):
+        saved_in.append(threading.current_thread())
+        return True
+
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': 'p1', 'name': 'Work'}]
+    mock_client.get_project_with_data.return_value = {'tasks': [{'id': 't1', 'title': 'Task'}]}
+    with patch('ticktick_mcp.src.server.ticktick', mock_client), \
+            patch('ticktick_mcp.src.server.save_snapshot', fake_save):
+        await server.get_all_tasks()
+        await server._snapshot_save
+
+    assert len(saved_in) == 1 and saved_in[0] is not threading.main_thread()
@@ -0,0 +1,51 @@
+import asyncio
+import logging
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from ticktick_mcp.src import server
+
+
+def test_cli_import_is_lazy():
+    """Importing the CLI loads neither the server nor the auth flow."""
+    code = ("import sys, ticktick_mcp.cli; "
+            "print(any(m in sys.modules for m in ('mcp.server.fastmcp', 'ticktick_mcp.src.server', 'requests')))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_main_starts_serving_without_api_calls():
+    """main() creates the client and starts the server without waiting for the API."""
+    client = AsyncMock()
+    with patch.object(server, 'ticktick', None), \
+         patch.dict(server._startup_marks, clear=True), \
+         patch.object(server.TickTickAuth, 'load_config', return_value={"access_token": "token"}), \
+         patch.object(server, 'AsyncTickTickClient', return_value=client), \
+         patch.object(server.mcp, 'run') as run:
+        server.main(started=0.0)
+        assert server.ticktick is client
+        assert list(server._startup_marks) == ["start", "imports", "client"]
+
+    run.assert_called_once_with(transport='stdio')
+    client.get_projects.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_checks_connectivity_in_background(caplog):
+    """The connectivity check runs once the server is up, and startup times are reported."""
+    client = AsyncMock()
+    client.get_projects.return_value = [{'id': 'p1'}]
+    marks = {"start": 0.0, "imports": 0.1, "client": 0.2}
+    with patch.object(server, 'ticktick', client), \
+         patch.dict(server._startup_marks, marks, clear=True), \
+         patch.dict('os.environ', {"TICKTICK_WARMUP_PROJECTS": "0"}), \
+         caplog.at_level(logging.DEBUG, logger=server.logger.name):
+        async with server.server_lifespan(MagicMock()):
+            await asyncio.sleep(0)
+            client.get_projects.assert_awaited_once()
+
+    assert "Server ready in" in caplog.text
+    assert "Successfully connected to TickTick API with 1 projects" in caplog.text
@@ -0,0 +1,141 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from ticktick_mcp.src.sync import SyncEngine, project_fingerprint
+from ticktick_mcp.src.task_index import TaskIndex
+
+
+class FakeClient:
+    """Serves `projects` and `data` like AsyncTickTickClient.refresh and counts the calls."""
+
+    def __init__(self, projects, data):
+        self.projects = projects
+        self.data = data
+        self.write_listeners = []
+        self.calls = []
+
+    async def refresh(self, endpoint):
+        self.calls.append(endpoint)
+        if endpoint == "/project":
+            return self.projects
+        return self.data[endpoint.split("/")[2]]
+
+
+def make_data(project_id, *titles):
+    return {"tasks": [{"id": f"{project_id}-{n}", "projectId": project_id, "title": title}
+                      for n, title in enumerate(titles)]}
+
+
+@pytest.mark.asyncio
+async def test_sync_only_reindexes_changed_projects():
+    """Unchanged projects keep their indexed data; deleted projects leave the index."""
+    client = FakeClient([{"id": "a"}, {"id": "b"}, {"id": "c"}],
+                        {"a": make_data("a", "Buy milk"), "b": make_data("b", "Call mom"), "c": make_data("c", "Gym")})
+    index = TaskIndex()
+    engine = SyncEngine(client, index, interval=60)
+
+    assert await engine.sync_once() == {"synced": 3, "changed": 3, "removed": 0}
+    first_a = engine.project_data("a")
+
+    client.projects = [{"id": "a"}, {"id": "b"}]
+    client.data = {"a": make_data("a", "Buy milk"), "b": make_data("b", "Call dad")}
+    assert await engine.sync_once() == {"synced": 2, "changed": 1, "removed": 1}
+
+    assert engine.project_data("a") is first_a
+    assert engine.project_data("c") is None
+    assert set(index.search(["dad"])) == {("b", "b-0")}
+    assert index.search(["gym"]) == {}
+    assert engine.projects() == [{"id": "a"}, {"id": "b"}]
+
+
+@pytest.mark.asyncio
+async def test_writes_stop_serving_replica_data():
+    """A write marks its project dirty until the next sync."""
+    client = FakeClient([{"id": "a"}, {"id": "b"}], {"a": make_data("a", "One"), "b": make_data("b", "Two")})
+    engine = SyncEngine(client, TaskIndex(), interval=60)
+    await engine.sync_once()
+
+    for listener in client.write_listeners:
+        listener("a", False)
+
+    assert engine.project_data("a") is None
+    assert engine.project_data("b") is not None
+    assert engine.projects() is not None
+
+    await engine.sync_once()
+    assert engine.project_data("a") is not None
+
+
+@pytest.mark.asyncio
+async def test_replica_expires_after_max_staleness():
+    """Replica data older than the staleness bound is not served."""
+    client = FakeClient([{"id": "a"}], {"a": make_data("a", "One")})
+    engine = SyncEngine(client, TaskIndex(), interval=60, max_staleness=0)
+    await engine.sync_once()
+
+    assert engine.projects() is None
+    assert engine.project_data("a") is None
+
+
+def test_fingerprint_uses_modification_markers():
+    """With etags on every task, only the markers decide whether a project changed."""
+    data = {"tasks": [{"id": "t1", "title": "Old", "etag": "e1"}]}
+    same_etag = {"tasks": [{"id": "t1", "title": "Renamed", "etag": "e1"}]}
+    new_etag = {"tasks": [{"id": "t1", "title": "Old", "etag": "e2"}]}
+
+    assert project_fingerprint(data) == project_fingerprint(same_etag)
+    assert project_fingerprint(data) != project_fingerprint(new_etag)
+    assert project_fingerprint({"tasks": [{"id": "t1", "title": "A"}]}) != \
+        project_fingerprint({"tasks": [{"id": "t1", "title": "B"}]})
+
+
+@pytest.mark.asyncio
+async def test_read_tools_are_served_from_the_replica():
+    """Cross-project tools make no API call for fresh replicated projects."""
+    from ticktick_mcp.src.server import get_all_tasks
+
+    client = FakeClient([{"id": "a", "name": "Inbox"}], {"a": make_data("a", "Replicated task")})
+    engine = SyncEngine(client, TaskIndex(), interval=60)
+    await engine.sync_once()
+    mock_client = AsyncMock()
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client), \
+            patch('ticktick_mcp.src.server.sync_engine', engine):
+        result = await get_all_tasks()
+
+    assert "Replicated task" in result
+    mock_client.get_projects.assert_not_called()
+    mock_client.get_project_with_data.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reauthentication_rebuilds_the_sync_engine(monkeypatch):
+    """A new client gets a new sync engine and task index; the old ones are dropped."""
+    import asyncio
+    from ticktick_mcp.src import server
+
+    monkeypatch.setenv("TICKTICK_SYNC_INTERVAL", "60")
+    old_client = FakeClient([], {})
+    old_client.aclose = AsyncMock()
+    new_client = FakeClient([{"id": "b", "name": "Work"}], {"b": make_data("b", "New account task")})
+    new_client.get_projects = AsyncMock(return_value=[{"id": "b"}])
+    old_index = TaskIndex()
+    old_task = asyncio.create_task(asyncio.sleep(3600))
+
+    with patch.object(server, 'ticktick', old_client), \
+            patch.object(server, 'task_index', old_index), \
+            patch.object(server, 'sync_engine', SyncEngine(old_client, old_index, interval=60)), \
+            patch.object(server, '_refresher_tasks', [old_task]), \
+            patch.object(server, '_serving', True), \
+            patch.object(server.TickTickAuth, 'load_config', return_value={"access_token": "new"}), \
+            patch.object(server, 'AsyncTickTickClient', return_value=new_client):
+        assert await server.reinitialize_client()
+        try:
+            assert server.ticktick is new_client
+            assert server.sync_engine.client is new_client
+            assert server.task_index is not old_index and server.sync_engine.index is server.task_index
+            await asyncio.sleep(0)
+            assert old_task.cancelled()
+            old_client.aclose.assert_awaited_once()
+        finally:
+            server._stop_refreshers()
@@ -0,0 +1,252 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, AsyncMock
+
+from ticktick_mcp.src.task_index import And, DueRange, FieldEquals, Or, TaskIndex, TextSearch, select_tasks, tokenize
+from ticktick_mcp.src.server import (
+    get_engaged_tasks,
+    get_next_tasks,
+    get_overdue_tasks,
+    get_tasks_by_priority,
+    get_tasks_due_today,
+    get_tasks_due_this_week,
+    search_tasks,
+)
+
+
+def _due(days: int, hour: int = 12) -> str:
+    """TickTick-style dueDate `days` days from today (UTC)."""
+    day = datetime.now(timezone.utc).replace(hour=hour, minute=0, second=0, microsecond=0) + timedelta(days=days)
+    return day.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def _timestamp(days: int) -> float:
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (today + timedelta(days=days)).timestamp()
+
+
+def test_due_range_lookup_is_half_open():
+    """Range lookups include the start of the range and exclude its end."""
+    index = TaskIndex()
+    index.update_project('p1', {'tasks': [
+        {'id': 'midnight', 'dueDate': _due(1, hour=0)},
+        {'id': 'noon', 'dueDate': _due(1)},
+        {'id': 'next-midnight', 'dueDate': _due(2, hour=0)},
+        {'id': 'no-date'},
+        {'id': 'bad-date', 'dueDate': 'tomorrow'},
+    ]})
+
+    keys = index.due_between(_timestamp(1), _timestamp(2))
+
+    assert keys == [('p1', 'midnight'), ('p1', 'noon')]
+
+
+def test_unchanged_project_data_is_not_reindexed():
+    """The same project data object is indexed only once."""
+    index = TaskIndex()
+    data = {'tasks': [{'id': 't1', 'dueDate': _due(0)}]}
+
+    assert index.update_project('p1', data) is True
+    assert index.update_project('p1', data) is False
+    assert index.update_project('p1', {'tasks': []}) is True
+    assert len(index) == 0
+
+
+def test_mutations_keep_index_current():
+    """Upserts and removals are visible to the next lookup."""
+    index = TaskIndex()
+    index.update_project('p1', {'tasks': [{'id': 't1', 'dueDate': _due(0)}]})
+
+    index.upsert_task({'id': 't2', 'projectId': 'p1', 'dueDate': _due(0)})
+    index.upsert_task({'id': 't1', 'projectId': 'p1', 'dueDate': _due(3)})
+    assert index.due_between(_timestamp(0), _timestamp(1)) == [('p1', 't2')]
+
+    index.remove_task('p1', 't2')
+    assert index.due_between(_timestamp(0), _timestamp(1)) == []
+
+
+def test_select_tasks_keeps_project_then_task_order():
+    """Matches are returned grouped by project in display order."""
+    index = TaskIndex()
+    p1 = {'id': 'p1'}
+    p2 = {'id': 'p2'}
+    data1 = {'tasks': [{'id': 'a', 'dueDate': _due(0, 18)}, {'id': 'b', 'dueDate': _due(0, 9)}]}
+    data2 = {'tasks': [{'id': 'c', 'dueDate': _due(0, 6)}]}
+    index.update_project('p1', data1)
+    index.update_project('p2', data2)
+
+    matches = select_tasks(index, DueRange(_timestamp(0), _timestamp(1)), [(p2, data2), (p1, data1)])
+
+    assert [task['id'] for _, task in matches] == ['c', 'a', 'b']
+
+
+@pytest.mark.asyncio
+async def test_date_tools_use_due_ranges():
+    """Date-filter tools return the same tasks as the previous per-task checks."""
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': 'idx1', 'name': 'P1'}]
+    mock_client.get_project_with_data.return_value = {'tasks': [
+        {'id': 'yesterday', 'title': 'Yesterday', 'dueDate': _due(-1)},
+        {'id': 'today', 'title': 'Today', 'dueDate': _due(0, 0)},
+        {'id': 'in-week', 'title': 'In a week', 'dueDate': _due(7)},
+        {'id': 'later', 'title': 'Later', 'dueDate': _due(8)},
+    ]}
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        today = await get_tasks_due_today()
+        overdue = await get_overdue_tasks()
+        week = await get_tasks_due_this_week()
+
+    assert "Found 1 tasks" in today and "Title: Today" in today
+    assert "Found 2 tasks" in overdue and "Title: Yesterday" in overdue and "Title: Today" in overdue
+    assert "Found 2 tasks" in week and "Title: Today" in week and "Title: In a week" in week and "Title: Later" not in week
+
+
+def test_search_requires_every_term_by_prefix():
+    """Multi-term searches AND their terms and match token prefixes."""
+    index = TaskIndex()
+    index.update_project('p1', {'tasks': [
+        {'id': 't1', 'title': 'Write quarterly report'},
+        {'id': 't2', 'title': 'Report bug', 'content': 'In the reporting module'},
+        {'id': 't3', 'title': 'Groceries', 'items': [{'title': 'Quarter pound of coffee'}]},
+    ]})
+
+    assert set(index.search(tokenize('quart rep'))) == {('p1', 't1')}
+    assert set(index.search(tokenize('quarter'))) == {('p1', 't1'), ('p1', 't3')}
+    assert index.search(tokenize('quarterly bug')) == {}
+
+
+def test_search_ranks_title_and_exact_matches_first():
+    """Title matches outrank content matches and exact tokens outrank prefixes."""
+    index = TaskIndex()
+    p1 = {'id': 'p1'}
+    data = {'tasks': [
+        {'id': 'content', 'title': 'Misc', 'content': 'plan'},
+        {'id': 'prefix', 'title': 'Planning session'},
+        {'id': 'exact', 'title': 'Plan the trip'},
+    ]}
+    index.update_project('p1', data)
+
+    matches = select_tasks(index, TextSearch(tokenize('plan')), [(p1, data)])
+
+    assert [task['id'] for _, task in matches] == ['exact', 'prefix', 'content']
+
+
+def test_search_index_follows_task_updates():
+    """Updating or removing a task replaces its tokens in the inverted index."""
+    index = TaskIndex()
+    index.update_project('p1', {'tasks': [{'id': 't1', 'title': 'Old name'}]})
+
+    index.upsert_task({'id': 't1', 'projectId': 'p1', 'title': 'New name'})
+    assert index.search(['old']) == {}
+    assert set(index.search(['new'])) == {('p1', 't1')}
+
+    index.remove_task('p1', 't1')
+    assert index.search(['name']) == {}
+
+
+def test_tokenize_splits_cjk_characters():
+    """CJK text is indexed per character so it can be searched without spaces."""
+    assert tokenize('Review 项目计划') == ['review', '项', '目', '计', '划']
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_matches_word_prefixes_only():
+    """Every search uses the same rule: terms match the start of a word, never its middle."""
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': 'search1', 'name': 'P1'}]
+    mock_client.get_project_with_data.return_value = {'tasks': [
+        {'id': 't1', 'title': 'Project kickoff'},
+        {'id': 't2', 'title': 'Homework'},
+        {'id': 't3', 'title': 'Orkney trip'},
+    ]}
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        by_prefix = await search_tasks('proj')
+        mid_word = await search_tasks('ject')
+        ork = await search_tasks('ork')
+        punctuation = await search_tasks('!!')
+
+    assert "Found 1 tasks" in by_prefix and "Title: Project kickoff" in by_prefix
+    assert "Title: Project kickoff" not in mid_word
+    assert "Title: Orkney trip" in ork and "Homework" not in ork
+    assert punctuation == "Search term must contain letters or digits."
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_results_print_each_project_once():
+    """Results ranked across projects are grouped under one header per project."""
+    data = {
+        'p1': {'tasks': [{'id': 't1', 'title': 'Budget'}, {'id': 't2', 'title': 'Notes', 'content': 'budget'}]},
+        'p2': {'tasks': [{'id': 't3', 'title': 'Budget review'}]},
+    }
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': 'p1', 'name': 'P1'}, {'id': 'p2', 'name': 'P2'}]
+    mock_client.get_project_with_data.side_effect = lambda project_id: data[project_id]
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        result = await search_tasks('budget')
+
+    assert "Found 3 tasks" in result
+    assert result.count("Name: P1") == 1 and result.count("Name: P2") == 1
+    assert result.index("Title: Notes") < result.index("Name: P2")
+
+
+def test_field_indexes_follow_updates():
+    """Priority and status posting lists follow task updates, with 0 as the default."""
+    index = TaskIndex()
+    index.update_project('p1', {'tasks': [
+        {'id': 't1', 'priority': 5},
+        {'id': 't2'},
+        {'id': 't3', 'priority': 5, 'status': 2},
+    ]})
+
+    assert FieldEquals('priority', 5).lookup(index) == {('p1', 't1'), ('p1', 't3')}
+    assert FieldEquals('priority', 0).lookup(index) == {('p1', 't2')}
+    assert FieldEquals('status', 2).lookup(index) == {('p1', 't3')}
+
+    index.upsert_task({'id': 't1', 'projectId': 'p1', 'priority': 1})
+    assert FieldEquals('priority', 5).lookup(index) == {('p1', 't3')}
+    assert FieldEquals('priority', 1).lookup(index) == {('p1', 't1')}
+
+
+def test_query_planner_combines_posting_lists():
+    """And intersects and Or merges the posting lists of their sub-queries."""
+    index = TaskIndex()
+    index.update_project('p1', {'tasks': [
+        {'id': 'high-today', 'priority': 5, 'dueDate': _due(0, 0)},
+        {'id': 'high', 'priority': 5},
+        {'id': 'today', 'dueDate': _due(0, 0)},
+        {'id': 'none'},
+    ]})
+    today = DueRange(_timestamp(0), _timestamp(1))
+    high = FieldEquals('priority', 5)
+
+    assert And(high, today).lookup(index) == {('p1', 'high-today')}
+    assert Or(high, today).lookup(index) == {('p1', 'high-today'), ('p1', 'high'), ('p1', 'today')}
+    assert And(FieldEquals('priority', 3), today).lookup(index) == set()
+    with pytest.raises(ValueError):
+        FieldEquals('title', 'x')
+
+
+@pytest.mark.asyncio
+async def test_gtd_tools_use_secondary_indexes():
+    """Priority, engaged and next views match the GTD definitions."""
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': 'gtd1', 'name': 'P1'}]
+    mock_client.get_project_with_data.return_value = {'tasks': [
+        {'id': 'high', 'title': 'High', 'priority': 5},
+        {'id': 'overdue', 'title': 'Overdue', 'dueDate': _due(-2)},
+        {'id': 'medium', 'title': 'Medium', 'priority': 3},
+        {'id': 'tomorrow', 'title': 'Tomorrow', 'dueDate': _due(1)},
+        {'id': 'someday', 'title': 'Someday', 'dueDate': _due(30)},
+    ]}
+
+    with patch('ticktick_mcp.src.server.ticktick', mock_client):
+        high = await get_tasks_by_priority(5)
+        engaged = await get_engaged_tasks()
+        next_tasks = await get_next_tasks()
+
+    assert "Found 1 tasks" in high and "Title: High" in high
+    assert "Found 2 tasks" in engaged and "Title: High" in engaged and "Title: Overdue" in engaged
+    assert "Found 2 tasks" in next_tasks and "Title: Medium" in next_tasks and "Title: Tomorrow" in next_tasks
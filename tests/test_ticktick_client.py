@@ -0,0 +1,377 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from ticktick_mcp.src.cache import ResponseCache
+from ticktick_mcp.src.retry import tool_deadline
+from ticktick_mcp.src.ticktick_client import AsyncTickTickClient, TickTickClient
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_overlap(make_client):
+    """Requests issued concurrently are in flight at the same time."""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 2)[-2]})
+
+    client = make_client(handler)
+    results = await asyncio.gather(*(client.get_project_with_data(f"p{i}") for i in range(5)))
+
+    assert [r["id"] for r in results] == [f"p{i}" for i in range(5)]
+    assert peak == 5
+
+
+@pytest.mark.asyncio
+async def test_refreshes_token_on_401(make_client):
+    """A 401 triggers a token refresh and the request is retried with the new token."""
+    seen_tokens = []
+
+    def handler(request):
+        if request.url.host == "auth.test":
+            return httpx.Response(200, json={"access_token": "new-token"})
+        seen_tokens.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "Bearer old-token":
+            return httpx.Response(401)
+        return httpx.Response(200, json=[{"id": "p1"}])
+
+    client = make_client(handler)
+    with patch('ticktick_mcp.src.ticktick_client.TickTickAuth.save_config') as save_config:
+        projects = await client.get_projects()
+
+    assert projects == [{"id": "p1"}]
+    assert seen_tokens == ["Bearer old-token", "Bearer new-token"]
+    save_config.assert_called_once_with({"access_token": "new-token"})
+
+
+@pytest.mark.asyncio
+async def test_http_error_returns_error_dict(make_client):
+    """HTTP errors are reported as {'error': ...} like the blocking client."""
+    client = make_client(lambda request: httpx.Response(404))
+
+    result = await client.get_task("p1", "t1")
+
+    assert "error" in result
+    assert "404" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_post_sends_json_body(make_client):
+    """POST endpoints send their payload as JSON."""
+    bodies = []
+
+    def handler(request):
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={"id": "t1", "title": "Hello"})
+
+    client = make_client(handler)
+    task = await client.create_task(title="Hello", project_id="p1")
+
+    assert task["id"] == "t1"
+    assert bodies == [{"title": "Hello", "projectId": "p1", "priority": 0, "isAllDay": False}]
+
+
+@pytest.fixture
+def local_api(monkeypatch):
+    """Serve a tiny keep-alive JSON API on localhost and point the clients at it."""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b'[{"id": "p1"}]'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("TICKTICK_ACCESS_TOKEN", "token")
+    monkeypatch.setenv("TICKTICK_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    # Every call must reach the server
+    monkeypatch.setenv("TICKTICK_CACHE_TTL", "0")
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+def test_blocking_client_reuses_pooled_connection(local_api):
+    """Sequential calls of the blocking client share one keep-alive connection."""
+    with patch('ticktick_mcp.src.ticktick_client.TickTickAuth.load_config', return_value={}):
+        client = TickTickClient()
+
+    for _ in range(3):
+        assert client.get_projects() == [{"id": "p1"}]
+
+    assert client.get_pool_stats() == {"requests": 3, "hits": 2, "misses": 1, "hit_rate": 0.667}
+
+
+@pytest.mark.asyncio
+async def test_async_client_reuses_pooled_connection(local_api):
+    """Sequential calls of the async client share one keep-alive connection."""
+    with patch('ticktick_mcp.src.ticktick_client.TickTickAuth.load_config', return_value={}):
+        client = AsyncTickTickClient()
+
+    for _ in range(3):
+        assert await client.get_projects() == [{"id": "p1"}]
+    await client.aclose()
+
+    assert client.get_pool_stats() == {"requests": 3, "hits": 2, "misses": 1, "hit_rate": 0.667}
+
+
+@pytest.mark.asyncio
+async def test_get_responses_are_cached(make_client):
+    """Repeated GETs are served from the cache."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json=[{"id": "p1"}])
+
+    client = make_client(handler)
+    assert await client.get_projects() == [{"id": "p1"}]
+    assert await client.get_projects() == [{"id": "p1"}]
+
+    assert len(calls) == 1
+    assert client.get_cache_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_task_writes_invalidate_project_data(make_client):
+    """Writes to a task drop the cached data of its project only."""
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        if request.method == "GET":
+            return httpx.Response(200, json={"tasks": []})
+        return httpx.Response(200, json={"id": "t1"})
+
+    client = make_client(handler)
+    await client.get_project_with_data("p1")
+    await client.get_project_with_data("p2")
+    await client.create_task(title="New", project_id="p1")
+    await client.get_project_with_data("p1")
+    await client.get_project_with_data("p2")
+
+    data_fetches = [path for method, path in calls if method == "GET"]
+    assert data_fetches == ["/open/v1/project/p1/data", "/open/v1/project/p2/data", "/open/v1/project/p1/data"]
+
+
+@pytest.mark.asyncio
+async def test_delete_project_invalidates_project_list(make_client):
+    """Deleting a project drops the cached project list and that project's entries."""
+    def handler(request):
+        if request.method == "DELETE":
+            return httpx.Response(200)
+        return httpx.Response(200, json=[{"id": "p1"}])
+
+    client = make_client(handler)
+    await client.get_projects()
+    await client.get_project_with_data("p1")
+    await client.delete_project("p1")
+
+    assert client.get_cache_stats()["entries"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """The cache stays within its entry budget by evicting the LRU entry."""
+    cache = ResponseCache(max_entries=2)
+    cache.set("/project/a", {"id": "a"}, 10)
+    cache.set("/project/b", {"id": "b"}, 10)
+    cache.get("/project/a")
+    cache.set("/project/c", {"id": "c"}, 10)
+
+    assert cache.get("/project/b") is None
+    assert cache.get("/project/a") == {"id": "a"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_drops_values_read_before_invalidation():
+    """A response fetched before an invalidation is not stored afterwards."""
+    cache = ResponseCache()
+    generation = cache.generation
+    cache.invalidate("/project/a/data")
+    cache.set("/project/a/data", {"tasks": []}, 10, generation)
+
+    assert cache.get("/project/a/data") is None
+
+
+@pytest.mark.asyncio
+async def test_requests_stop_at_the_tool_deadline(make_client):
+    """No request is sent once the deadline has passed; timeouts are flagged."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        raise httpx.ReadTimeout("timed out")
+
+    client = make_client(handler)
+    client.retry_policy.max_retries = 0
+
+    result = await client.get_projects()
+    assert result["timed_out"] is True
+
+    with tool_deadline(0.01):
+        await asyncio.sleep(0.02)
+        result = await client.get_project_with_data("p1")
+
+    assert result["timed_out"] is True
+    assert calls == ["/open/v1/project"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_401s_share_one_token_refresh(make_client):
+    """Requests failing with the same expired token trigger a single refresh."""
+    refreshes = 0
+
+    async def handler(request):
+        nonlocal refreshes
+        if request.url.host == "auth.test":
+            refreshes += 1
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json={"access_token": "new-token", "expires_in": 3600})
+        if request.headers["Authorization"] == "Bearer old-token":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"tasks": []})
+
+    client = make_client(handler)
+    with patch('ticktick_mcp.src.ticktick_client.TickTickAuth.save_config') as save_config:
+        results = await asyncio.gather(*(client.get_project_with_data(f"p{i}") for i in range(5)))
+
+    assert results == [{"tasks": []}] * 5
+    assert refreshes == 1
+    save_config.assert_called_once()
+    assert client.token_expires_at > time.time() + 3000
+
+
+@pytest.mark.asyncio
+async def test_token_is_refreshed_before_it_expires(make_client):
+    """A token about to expire is refreshed before the request instead of after a 401."""
+    seen_tokens = []
+
+    def handler(request):
+        if request.url.host == "auth.test":
+            return httpx.Response(200, json={"access_token": "new-token", "expires_in": 3600})
+        seen_tokens.append(request.headers["Authorization"])
+        return httpx.Response(200, json=[])
+
+    client = make_client(handler)
+    client.token_expires_at = time.time() + 60
+    with patch('ticktick_mcp.src.ticktick_client.TickTickAuth.save_config'):
+        await client.get_projects()
+
+    assert seen_tokens == ["Bearer new-token"]
+
+
+@pytest.mark.asyncio
+async def test_failed_proactive_refresh_backs_off(make_client):
+    """After a failed refresh, requests with the still valid token do not retry the refresh."""
+    refreshes = 0
+
+    async def handler(request):
+        nonlocal refreshes
+        if request.url.host == "auth.test":
+            refreshes += 1
+            await asyncio.sleep(0.01)
+            return httpx.Response(400, json={"error": "invalid_grant"})
+        return httpx.Response(200, json={"tasks": []})
+
+    client = make_client(handler)
+    client.token_expires_at = time.time() + 60
+    results = await asyncio.gather(*(client.get_project_with_data(f"p{i}") for i in range(20)))
+
+    assert results == [{"tasks": []}] * 20
+    assert refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_gets_are_coalesced(make_client):
+    """Concurrent GETs of one endpoint share a single round-trip and response."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"tasks": []})
+
+    client = make_client(handler)
+    results = await asyncio.gather(
+        client.get_project_with_data("p1"),
+        client.get_project_with_data("p1"),
+        client.get_project_with_data("p2"),
+        client.get_project_with_data("p1"),
+    )
+
+    assert calls == ["/open/v1/project/p1/data", "/open/v1/project/p2/data"]
+    assert results[0] is results[1] is results[3]
+    assert client.get_coalescing_stats() == {"coalesced": 2, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_coalesced_gets_apply_each_callers_deadline(make_client):
+    """The shared fetch is not cut short by the deadline of the caller that started it."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={"tasks": []})
+
+    client = make_client(handler)
+
+    async def hurried():
+        with tool_deadline(0.02):
+            return await client.get_project_with_data("p1")
+
+    first, second = await asyncio.gather(hurried(), client.get_project_with_data("p1"))
+
+    assert first.get("timed_out") is True
+    assert second == {"tasks": []}
+    assert calls == ["/open/v1/project/p1/data"]
+
+
+def test_blocking_client_coalesces_gets_across_threads(local_api):
+    """Threads requesting the same endpoint at once share one request."""
+    with patch('ticktick_mcp.src.ticktick_client.TickTickAuth.load_config', return_value={}):
+        client = TickTickClient()
+    barrier = threading.Barrier(4)
+    original_fetch = client._fetch
+
+    def slow_fetch(*args):
+        time.sleep(0.05)
+        return original_fetch(*args)
+
+    client._fetch = slow_fetch
+
+    def worker(results):
+        barrier.wait()
+        results.append(client.get_projects())
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[{"id": "p1"}]] * 4
+    assert client.get_pool_stats()["requests"] == 1
+    assert client.get_coalescing_stats()["coalesced"] == 3
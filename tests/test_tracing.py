@@ -0,0 +1,73 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from ticktick_mcp.src.server import get_engaged_tasks
+from ticktick_mcp.src.tracing import Trace, span, trace_tool
+
+
+@pytest.mark.asyncio
+async def test_span_without_trace_is_a_no_op(monkeypatch, tmp_path):
+    monkeypatch.setenv("TICKTICK_TRACE_DIR", str(tmp_path))
+    with span("outside"):
+        pass
+    async with trace_tool("disabled") as trace:
+        assert trace is None
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_tool_invocation_writes_a_span_tree(monkeypatch, tmp_path):
+    """A traced fan-out tool records the project fetches, filter and formatting under the tool span, saved off the loop."""
+    monkeypatch.setenv("TICKTICK_TRACE", "1")
+    monkeypatch.setenv("TICKTICK_TRACE_DIR", str(tmp_path))
+
+    async def get_project_with_data(project_id):
+        await asyncio.sleep(0.01)
+        return {'tasks': [{'id': f'{project_id}-t', 'projectId': project_id, 'title': 'Urgent', 'priority': 5}]}
+
+    saved_in = []
+    save = Trace.save
+
+    def save_in_thread(trace, directory):
+        saved_in.append(threading.current_thread())
+        return save(trace, directory)
+
+    mock_client = AsyncMock()
+    mock_client.get_projects.return_value = [{'id': 'trace1', 'name': 'A'}, {'id': 'trace2', 'name': 'B'}]
+    mock_client.get_project_with_data.side_effect = get_project_with_data
+    with patch('ticktick_mcp.src.server.ticktick', mock_client), patch.object(Trace, 'save', save_in_thread):
+        result = await get_engaged_tasks()
+
+    assert "Urgent" in result
+    assert saved_in and saved_in[0] is not threading.main_thread()
+    files = list(tmp_path.glob("*-get_engaged_tasks.json"))
+    assert len(files) == 1
+    events = json.loads(files[0].read_text())["traceEvents"]
+    by_name = {}
+    for event in events:
+        by_name.setdefault(event["name"], []).append(event)
+
+    root = by_name["get_engaged_tasks"][0]
+    assert root["args"]["parent_id"] is None
+    fetches = by_name["get_project_with_data"]
+    assert sorted(event["args"]["project_id"] for event in fetches) == ["trace1", "trace2"]
+    # Concurrent fetches are drawn on separate lanes
+    assert len({event["tid"] for event in fetches}) == 2
+    for name in ("get_projects", "filter", "format"):
+        assert by_name[name][0]["args"]["parent_id"] == root["args"]["span_id"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+
+
+def test_span_records_errors():
+    trace = Trace("tool")
+    with patch('ticktick_mcp.src.tracing._trace') as current:
+        current.get.return_value = trace
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+
+    assert trace.to_chrome()["traceEvents"][0]["args"]["error"] == "ValueError"
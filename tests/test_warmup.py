@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from ticktick_mcp.src.warmup import AccessTracker, WarmupScheduler, get_warmup_projects
+
+
+class FakeClient:
+    def __init__(self, projects):
+        self.projects = projects
+        self.refreshed = []
+
+    async def refresh(self, endpoint):
+        self.refreshed.append(endpoint)
+        return self.projects if endpoint == "/project" else {"tasks": []}
+
+
+@pytest.mark.asyncio
+async def test_warmup_fetches_the_most_used_open_projects():
+    """The project list and the most used open projects are refreshed."""
+    client = FakeClient([{"id": "a"}, {"id": "b"}, {"id": "c", "closed": True}, {"id": "d"}])
+    tracker = AccessTracker()
+    tracker.record(["d", "d", "c", "c", "c", "b"])
+
+    assert await WarmupScheduler(client, tracker, projects=2, interval=60).warm() == 2
+
+    assert client.refreshed[0] == "/project"
+    assert sorted(client.refreshed[1:]) == ["/project/b/data", "/project/d/data"]
+
+
+@pytest.mark.asyncio
+async def test_warmup_runs_at_startup_then_only_while_idle(monkeypatch):
+    """The first warmup is immediate; later ones are skipped while tools are running."""
+    monkeypatch.setattr('ticktick_mcp.src.warmup.MIN_IDLE', 10)
+    client = FakeClient([{"id": "a"}])
+    scheduler = WarmupScheduler(client, AccessTracker(), projects=1, interval=0.01)
+
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert scheduler.warmups == 1
+
+
+@pytest.mark.asyncio
+async def test_warmup_waits_for_long_running_tools(monkeypatch):
+    """A tool running longer than MIN_IDLE keeps the server busy until it finishes."""
+    monkeypatch.setattr('ticktick_mcp.src.warmup.MIN_IDLE', 0.01)
+    tracker = AccessTracker()
+    scheduler = WarmupScheduler(FakeClient([{"id": "a"}]), tracker, projects=1, interval=0.01)
+
+    tracker.tool_started()
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(0.1)
+    assert scheduler.warmups == 1
+
+    tracker.tool_finished()
+    await asyncio.sleep(0.1)
+    task.cancel()
+    assert scheduler.warmups > 1
+
+
+def test_usage_survives_restarts(tmp_path):
+    """Saved access counts are loaded back, scaled down."""
+    with patch('ticktick_mcp.src.warmup.TickTickAuth.get_config_path', return_value=tmp_path / "config.json"):
+        tracker = AccessTracker()
+        tracker.record(["a", "a", "b"])
+        tracker.save()
+
+        restored = AccessTracker()
+        restored.load()
+
+    assert restored.counts == {"a": 1.0, "b": 0.5}
+    assert restored.most_used(["b", "a", "c"], 2) == ["a", "b"]
+
+
+def test_warmup_is_opt_in(monkeypatch):
+    """No project is warmed unless TICKTICK_WARMUP_PROJECTS is set."""
+    monkeypatch.delenv("TICKTICK_WARMUP_PROJECTS", raising=False)
+    assert get_warmup_projects() == 0
+    monkeypatch.setenv("TICKTICK_WARMUP_PROJECTS", "3")
+    assert get_warmup_projects() == 3
@@ -5,16 +5,18 @@ Command-line interface for TickTick MCP server.
 
 import sys
 import os
+import time
 import argparse
 import logging
-from pathlib import Path
-from .src.server import main as server_main
-from .src.auth import TickTickAuth
-from .authenticate import main as auth_main
+
+# The server (FastMCP, the tool registry, HTTP clients) and the auth flow are
+# imported by the subcommand that needs them, so `auth` and `--help` stay fast
 
 
 def check_auth_setup() -> bool:
     """Check if authentication is set up properly."""
+    from .src.auth import TickTickAuth
+
     tokens = TickTickAuth.load_tokens()
     if tokens.get("access_token"):
         return True
@@ -23,6 +25,7 @@ def check_auth_setup() -> bool:
 
 def main():
     """Entry point for the CLI."""
+    started = time.perf_counter()
     parser = argparse.ArgumentParser(description="TickTick MCP Server")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
@@ -31,7 +34,7 @@ def main():
     run_parser.add_argument(
         "--debug", 
         action="store_true", 
-        help="Enable debug logging"
+        help="Enable debug logging and tool call tracing"
     )
     run_parser.add_argument(
         "--transport", 
@@ -59,10 +62,14 @@ def main():
     # Run the appropriate command
     if args.command == "auth":
         # Run authentication flow
+        from .authenticate import main as auth_main
         sys.exit(auth_main(manual=args.manual))
     elif args.command == "run":
         # Configure logging based on debug flag
         log_level = logging.DEBUG if args.debug else logging.INFO
+        if args.debug:
+            # Write a trace of every tool call (see src/tracing.py)
+            os.environ.setdefault("TICKTICK_TRACE", "1")
         logging.basicConfig(
             level=log_level,
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -70,7 +77,8 @@ def main():
         
         # Start the server
         try:
-            server_main()
+            from .src.server import main as server_main
+            server_main(started=started)
         except KeyboardInterrupt:
             print("Server stopped by user", file=sys.stderr)
             sys.exit(0)
@@ -14,11 +14,19 @@ import base64
 import http.server
 import socketserver
 import urllib.parse
+import tempfile
+import threading
 import requests
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Any
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple, Any
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock is used
+    fcntl = None
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -409,32 +417,16 @@ class TickTickAuth:
 
     @staticmethod
     def load_config() -> Dict[str, str]:
-        """Load config (credentials + tokens) from ~/.ticktick/config.json."""
-        config_path = TickTickAuth.get_config_path()
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        return {}
+        """Load config (credentials + tokens) from ~/.ticktick/config.json (cached, see ConfigStore)."""
+        return config_store.load()
 
     # Keep backward compatibility alias
     load_tokens = load_config
 
     @staticmethod
     def save_config(data: Dict[str, str]) -> None:
-        """Save/merge data into ~/.ticktick/config.json."""
-        config_path = TickTickAuth.get_config_path()
-
-        existing = {}
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                existing = json.load(f)
-
-        existing.update(data)
-
-        with open(config_path, 'w') as f:
-            json.dump(existing, f, indent=2)
-
-        config_path.chmod(0o600)
+        """Save/merge data into ~/.ticktick/config.json (atomically, see ConfigStore)."""
+        config_store.save(data)
 
     def _save_tokens_to_env(self) -> None:
         """Save the tokens to ~/.ticktick/config.json."""
@@ -445,6 +437,8 @@ class TickTickAuth:
         data["access_token"] = self.tokens.get('access_token', '')
         if 'refresh_token' in self.tokens:
             data["refresh_token"] = self.tokens.get('refresh_token', '')
+        if self.tokens.get('expires_in'):
+            data["token_expires_at"] = time.time() + float(self.tokens['expires_in'])
 
         # Also persist client credentials so they survive across sessions
         if self.client_id:
@@ -455,6 +449,103 @@ class TickTickAuth:
         self.save_config(data)
         logger.info(f"Config saved to {self.get_config_path()}")
 
+class ConfigStore:
+    """
+    Cached access to ~/.ticktick/config.json.
+
+    The file is parsed once and kept in memory. Each load() only stat()s the
+    file and re-reads it when it changed on disk (e.g. after the `auth` CLI
+    wrote new tokens). save() merges into the current content and replaces
+    the file atomically (temp file + rename) while holding a lock, so
+    concurrent token saves neither corrupt the file nor lose each other's
+    keys.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path: Optional[Path] = None
+        # (st_mtime_ns, st_size, st_ino) of the file the cached config was read from
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._config: Dict[str, Any] = {}
+        self.reads = 0
+        self.writes = 0
+
+    def load(self) -> Dict[str, Any]:
+        """Return a copy of the config, re-reading the file only if it changed."""
+        with self._lock:
+            return dict(self._current(TickTickAuth.get_config_path()))
+
+    def save(self, data: Dict[str, Any]) -> None:
+        """Merge `data` into the config file."""
+        path = TickTickAuth.get_config_path()
+        with self._lock, self._file_lock(path):
+            config = dict(self._current(path))
+            config.update(data)
+
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".config-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(config, f, indent=2)
+                os.chmod(tmp_path, 0o600)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+            self.writes += 1
+            self._path = path
+            self._signature = self._stat(path)
+            self._config = config
+
+    def invalidate(self) -> None:
+        """Forget the cached config; the next load() reads the file."""
+        with self._lock:
+            self._path = None
+            self._signature = None
+            self._config = {}
+
+    def _current(self, path: Path) -> Dict[str, Any]:
+        # Must be called with self._lock held
+        signature = self._stat(path)
+        if path == self._path and signature == self._signature:
+            return self._config
+
+        config: Dict[str, Any] = {}
+        if signature is not None:
+            with open(path, 'r') as f:
+                config = json.load(f)
+            self.reads += 1
+        self._path = path
+        self._signature = signature
+        self._config = config
+        return config
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    @staticmethod
+    @contextmanager
+    def _file_lock(path: Path) -> Iterator[None]:
+        """Advisory lock against other processes saving the config at the same time."""
+        if fcntl is None:
+            yield
+            return
+        with open(path.with_name(path.name + ".lock"), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# Process-wide config store used by TickTickAuth.load_config/save_config
+config_store = ConfigStore()
+
 def setup_auth_cli():
     """Run the authentication flow as a CLI utility."""
     import argparse
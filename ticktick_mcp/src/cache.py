@@ -0,0 +1,212 @@
+"""
+In-memory read-through cache for TickTick API GET responses.
+
+Entries expire after a per-endpoint TTL and the least recently used ones are
+evicted once the cache exceeds its entry or byte budget. Writes made through
+the client invalidate the affected project entries (see
+TickTickClient._invalidate_after_write).
+
+Entries can also be seeded from an on-disk snapshot (see snapshot.py). Seeded
+entries are always expired but remain available through get_stale() until a
+fresh response replaces them, which lets the async client serve them
+stale-while-revalidate.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Default TTL per endpoint kind, in seconds
+DEFAULT_TTLS = {
+    "projects": 60.0,       # /project
+    "project": 60.0,        # /project/{id}
+    "project_data": 30.0,   # /project/{id}/data
+    "task": 30.0,           # /project/{id}/task/{id}
+}
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def endpoint_kind(endpoint: str) -> Optional[str]:
+    """Classify a GET endpoint into one of the DEFAULT_TTLS kinds (None if not cacheable)."""
+    parts = endpoint.strip("/").split("/")
+    if parts[0] != "project":
+        return None
+    if len(parts) == 1:
+        return "projects"
+    if len(parts) == 2:
+        return "project"
+    if len(parts) == 3 and parts[2] == "data":
+        return "project_data"
+    if len(parts) == 4 and parts[2] == "task":
+        return "task"
+    return None
+
+
+def get_default_ttls() -> Dict[str, float]:
+    """
+    Return the per-endpoint TTLs.
+
+    TICKTICK_CACHE_TTL overrides every TTL with a single value in seconds;
+    0 disables caching.
+    """
+    value = os.getenv("TICKTICK_CACHE_TTL")
+    if value:
+        try:
+            ttl = max(0.0, float(value))
+            return {kind: ttl for kind in DEFAULT_TTLS}
+        except ValueError:
+            logger.warning(f"Invalid TICKTICK_CACHE_TTL '{value}', using defaults")
+    return dict(DEFAULT_TTLS)
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache keyed by API endpoint.
+
+    Cached values are the parsed JSON responses and are shared between
+    callers, so they must be treated as read-only.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.ttls = ttls if ttls is not None else get_default_ttls()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # endpoint -> (value, size, expires_at, seeded)
+        self._entries: "OrderedDict[str, Tuple[Any, int, float, bool]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so in-flight reads never store stale data
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL of an endpoint (0 when it is not cacheable)."""
+        kind = endpoint_kind(endpoint)
+        return self.ttls.get(kind, 0.0) if kind else 0.0
+
+    def get(self, endpoint: str) -> Optional[Any]:
+        """Return the cached response of an endpoint, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is None or entry[2] <= time.monotonic():
+                if entry is not None and not entry[3]:
+                    self._remove(endpoint)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(endpoint)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, endpoint: str, value: Any, size: int, generation: Optional[int] = None) -> None:
+        """
+        Store a response.
+
+        Args:
+            endpoint: API endpoint the response belongs to
+            value: Parsed JSON response
+            size: Size of the raw response body in bytes
+            generation: Cache generation observed before the request was sent;
+                the value is dropped if an invalidation happened since
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._store(endpoint, (value, size, time.monotonic() + ttl, False))
+
+    def seed(self, endpoint: str, value: Any, size: int) -> bool:
+        """
+        Store a stale value (e.g. loaded from a snapshot) unless the endpoint is already cached.
+
+        Returns:
+            True if the value was stored
+        """
+        if self.ttl_for(endpoint) <= 0 or size > self.max_bytes:
+            return False
+        with self._lock:
+            if endpoint in self._entries:
+                return False
+            self._store(endpoint, (value, size, float("-inf"), True))
+            return True
+
+    def get_stale(self, endpoint: str) -> Optional[Any]:
+        """Return the seeded value of an endpoint that has not been refreshed yet, or None."""
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is None or not entry[3]:
+                return None
+            self._entries.move_to_end(endpoint)
+            self.stale_hits += 1
+            return entry[0]
+
+    def stale_endpoints(self) -> List[str]:
+        """Return the endpoints whose seeded value has not been refreshed yet."""
+        with self._lock:
+            return [key for key, entry in self._entries.items() if entry[3]]
+
+    def export(self, kinds: Iterable[str]) -> Dict[str, Tuple[Any, int]]:
+        """Return {endpoint: (value, size)} for every entry of the given endpoint kinds."""
+        kinds = set(kinds)
+        with self._lock:
+            return {
+                key: (entry[0], entry[1])
+                for key, entry in self._entries.items()
+                if endpoint_kind(key) in kinds
+            }
+
+    def invalidate(self, endpoint: str, recursive: bool = True) -> None:
+        """Drop an endpoint and, if `recursive`, every endpoint below it (e.g. /project/{id}/...)."""
+        prefix = endpoint.rstrip("/") + "/"
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._entries if k == endpoint or (recursive and k.startswith(prefix))]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _store(self, endpoint: str, entry: Tuple[Any, int, float, bool]) -> None:
+        if endpoint in self._entries:
+            self._remove(endpoint)
+        self._entries[endpoint] = entry
+        self._bytes += entry[1]
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, endpoint: str) -> None:
+        _, size, _, _ = self._entries.pop(endpoint)
+        self._bytes -= size
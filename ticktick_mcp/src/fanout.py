@@ -0,0 +1,86 @@
+"""
+Bounded-concurrency fan-out for per-project API calls.
+
+The cross-project tools need the data of every open project. Fetching them
+one after another makes latency grow linearly with the number of projects,
+so this module runs the calls concurrently while capping how many are in
+flight at once.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def get_max_concurrency() -> int:
+    """Return the fan-out limit from TICKTICK_MAX_CONCURRENCY (default: 8)."""
+    value = os.getenv("TICKTICK_MAX_CONCURRENCY")
+    if not value:
+        return DEFAULT_MAX_CONCURRENCY
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Invalid TICKTICK_MAX_CONCURRENCY '{value}', using {DEFAULT_MAX_CONCURRENCY}")
+        return DEFAULT_MAX_CONCURRENCY
+
+
+def get_batch_concurrency() -> int:
+    """Return the limit of concurrent writes of the batch tools from TICKTICK_BATCH_CONCURRENCY (default: TICKTICK_MAX_CONCURRENCY)."""
+    value = os.getenv("TICKTICK_BATCH_CONCURRENCY")
+    if not value:
+        return get_max_concurrency()
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Invalid TICKTICK_BATCH_CONCURRENCY '{value}', using TICKTICK_MAX_CONCURRENCY")
+        return get_max_concurrency()
+
+
+@dataclass
+class FanOutResult:
+    """Outcome of one fan-out call: either a value or an error message."""
+    item: Any
+    value: Any = None
+    error: Optional[str] = None
+    # The call failed with a timeout (e.g. the tool deadline expired)
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def fan_out(items: Iterable[Any],
+                  func: Callable[[Any], Awaitable[Any]],
+                  max_concurrency: Optional[int] = None) -> List[FanOutResult]:
+    """
+    Run `func` for every item with at most `max_concurrency` calls in flight.
+
+    Args:
+        items: Inputs to process (e.g. project dictionaries)
+        func: Coroutine function called with each item
+        max_concurrency: Maximum concurrent calls (default: TICKTICK_MAX_CONCURRENCY)
+
+    Returns:
+        One FanOutResult per item, in input order. A failing item is reported
+        through its `error` field and never aborts the other calls.
+    """
+    limit = max_concurrency or get_max_concurrency()
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(item: Any) -> FanOutResult:
+        async with semaphore:
+            try:
+                return FanOutResult(item=item, value=await func(item))
+            except Exception as e:
+                return FanOutResult(item=item, error=str(e) or type(e).__name__,
+                                    timed_out=isinstance(e, (TimeoutError, asyncio.TimeoutError)))
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
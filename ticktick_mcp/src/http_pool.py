@@ -0,0 +1,155 @@
+"""
+Connection pooling for the TickTick API clients.
+
+Both clients keep their HTTP connections alive for the lifetime of the
+process, so a cross-project scan pays for one TCP+TLS handshake per pooled
+connection instead of one per API call. PoolStats counts how many requests
+reused a pooled connection and how many had to open a new one.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .fanout import get_max_concurrency
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Idle pooled connections are kept this long before being closed (seconds)
+KEEPALIVE_EXPIRY = 60.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+
+
+def get_pool_size() -> int:
+    """Return the pool size from TICKTICK_POOL_SIZE (default: the fan-out limit)."""
+    value = os.getenv("TICKTICK_POOL_SIZE")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            logger.warning(f"Invalid TICKTICK_POOL_SIZE '{value}', using the fan-out limit")
+    return get_max_concurrency()
+
+
+def get_timeouts() -> Tuple[float, float]:
+    """
+    Return the (connect, read) timeouts of API requests in seconds.
+
+    They come from TICKTICK_CONNECT_TIMEOUT (default: 5) and
+    TICKTICK_READ_TIMEOUT (default: 30).
+    """
+    timeouts = []
+    for name, default in (("TICKTICK_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+                          ("TICKTICK_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)):
+        value = os.getenv(name)
+        try:
+            timeouts.append(float(value) if value else default)
+        except ValueError:
+            logger.warning(f"Invalid {name} '{value}', using {default}")
+            timeouts.append(default)
+        if timeouts[-1] <= 0:
+            timeouts[-1] = default
+    return timeouts[0], timeouts[1]
+
+
+class PoolStats:
+    """Thread-safe counters of pooled connection reuse."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Return the current counters.
+
+        A request is a hit when it was sent over an already open connection
+        and a miss when a new connection had to be opened for it.
+        """
+        with self._lock:
+            requests_sent = self.requests
+            misses = min(self.connections_opened, requests_sent)
+        hits = requests_sent - misses
+        return {
+            "requests": requests_sent,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / requests_sent, 3) if requests_sent else 0.0,
+        }
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection to PoolStats."""
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self._stats
+
+        def counting(pool_class):
+            def _new_conn(pool):
+                stats.record_connect()
+                return pool_class._new_conn(pool)
+            return type(f"Counting{pool_class.__name__}", (pool_class,), {"_new_conn": _new_conn})
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting(HTTPConnectionPool),
+            "https": counting(HTTPSConnectionPool),
+        }
+
+
+def create_session(stats: PoolStats, pool_size: int) -> requests.Session:
+    """Create a keep-alive requests.Session with `pool_size` connections per host."""
+    session = requests.Session()
+    adapter = _CountingAdapter(stats, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def create_async_client(stats: PoolStats, pool_size: int) -> httpx.AsyncClient:
+    """
+    Create a keep-alive httpx.AsyncClient keeping up to `pool_size` idle connections.
+
+    The total number of connections is not capped here: in-flight requests are
+    already bounded by the fan-out limit, and a hard cap would make concurrent
+    tool calls fail with pool timeouts instead of waiting their turn.
+    """
+    async def on_trace(event_name: str, info: Dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            stats.record_connect()
+
+    async def on_request(request: httpx.Request) -> None:
+        request.extensions["trace"] = on_trace
+
+    limits = httpx.Limits(
+        max_connections=None,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    connect_timeout, read_timeout = get_timeouts()
+    client = httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                               event_hooks={"request": [on_request]})
+    # Mirror requests' behaviour for "Accept-Encoding": None
+    del client.headers["Accept-Encoding"]
+    return client
@@ -0,0 +1,317 @@
+"""
+Latency and throughput metrics of the MCP tools and the TickTick API calls.
+
+A process-wide MetricsRegistry records:
+
+- per tool: invocations, errors, a latency histogram and the number of API
+  requests each invocation sent (fan-outs included);
+- per API endpoint (IDs replaced by {id}, e.g. GET /project/{id}/data):
+  requests, errors by status, a latency histogram, bytes sent and received,
+  and retries.
+
+The get_server_stats tool returns these metrics together with the cache,
+pool, rate limiter and sync counters. When TICKTICK_METRICS_FILE is set, the
+server also writes them in the Prometheus text format to that file every
+METRICS_DUMP_INTERVAL seconds (e.g. for the node_exporter textfile collector).
+"""
+
+import bisect
+import contextvars
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRICS_DUMP_INTERVAL = 15.0
+
+# API requests sent by the current tool invocation (a one-element list shared
+# with the tasks it starts)
+_tool_requests: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar(
+    "ticktick_tool_requests", default=None
+)
+
+
+def get_metrics_file() -> Optional[Path]:
+    """Return the Prometheus dump file from TICKTICK_METRICS_FILE (default: none)."""
+    value = os.getenv("TICKTICK_METRICS_FILE")
+    return Path(value).expanduser() if value else None
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Replace the IDs of an endpoint by {id}, e.g. /project/{id}/task/{id}."""
+    parts = endpoint.split("?", 1)[0].strip("/").split("/")
+    for i in range(1, len(parts)):
+        if parts[i - 1] in ("project", "task"):
+            parts[i] = "{id}"
+    return "/" + "/".join(parts)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 2),
+            "p95_ms": round(self.quantile(0.95) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+class _ToolMetrics:
+    __slots__ = ("latency", "errors", "requests", "max_requests")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.requests = 0
+        self.max_requests = 0
+
+
+class _EndpointMetrics:
+    __slots__ = ("latency", "statuses", "failures", "bytes_sent", "bytes_received", "retries")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses: Dict[int, int] = {}
+        # Requests that got no response (connection errors, timeouts)
+        self.failures = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+
+    @property
+    def errors(self) -> int:
+        return self.failures + sum(count for status, count in self.statuses.items() if status >= 400)
+
+
+class MetricsRegistry:
+    """Thread-safe registry of tool and API endpoint metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _ToolMetrics] = {}
+        # (method, endpoint template) -> metrics
+        self._endpoints: Dict[Tuple[str, str], _EndpointMetrics] = {}
+
+    def start_tool(self) -> contextvars.Token:
+        """Start counting the API requests of a tool invocation (see finish_tool)."""
+        return _tool_requests.set([0])
+
+    def tool_requests(self) -> int:
+        """Return the API requests counted so far in this context (see start_tool)."""
+        requests = _tool_requests.get()
+        return requests[0] if requests else 0
+
+    def add_tool_requests(self, count: int) -> None:
+        """Count requests sent for the running tool invocation by another task (e.g. a shared fetch)."""
+        requests = _tool_requests.get()
+        if requests is not None:
+            requests[0] += count
+
+    def finish_tool(self, name: str, seconds: float, error: bool, token: contextvars.Token) -> None:
+        """
+        Record a finished tool invocation.
+
+        Args:
+            name: Tool name
+            seconds: Duration of the invocation
+            error: Whether the invocation failed
+            token: Token returned by start_tool
+        """
+        requests = _tool_requests.get()
+        _tool_requests.reset(token)
+        sent = requests[0] if requests else 0
+        with self._lock:
+            metrics = self._tools.get(name)
+            if metrics is None:
+                metrics = self._tools[name] = _ToolMetrics()
+            metrics.latency.observe(seconds)
+            metrics.errors += int(error)
+            metrics.requests += sent
+            metrics.max_requests = max(metrics.max_requests, sent)
+
+    def record_request(self, method: str, endpoint: str, status: Optional[int], seconds: float,
+                       bytes_sent: int = 0, bytes_received: int = 0) -> None:
+        """
+        Record an HTTP request sent to the API.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (IDs are folded into {id})
+            status: HTTP status, or None if no response was received
+            seconds: Time until the response (or the failure)
+            bytes_sent: Size of the request body
+            bytes_received: Size of the response body
+        """
+        requests = _tool_requests.get()
+        if requests is not None:
+            requests[0] += 1
+        with self._lock:
+            metrics = self._endpoint(method, endpoint)
+            metrics.latency.observe(seconds)
+            if status is None:
+                metrics.failures += 1
+            else:
+                metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+
+    def record_retry(self, method: str, endpoint: str) -> None:
+        """Record that a failed request is retried."""
+        with self._lock:
+            self._endpoint(method, endpoint).retries += 1
+
+    def _endpoint(self, method: str, endpoint: str) -> _EndpointMetrics:
+        key = (method, endpoint_template(endpoint))
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = _EndpointMetrics()
+        return metrics
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the tool and endpoint metrics as plain dicts."""
+        with self._lock:
+            tools = {}
+            for name, metrics in sorted(self._tools.items()):
+                calls = metrics.latency.count
+                tools[name] = dict(
+                    metrics.latency.snapshot(),
+                    errors=metrics.errors,
+                    api_requests=metrics.requests,
+                    api_requests_per_call=round(metrics.requests / calls, 2) if calls else 0.0,
+                    max_api_requests=metrics.max_requests,
+                )
+            endpoints = {}
+            for (method, template), metrics in sorted(self._endpoints.items()):
+                requests = metrics.latency.count
+                endpoints[f"{method} {template}"] = dict(
+                    metrics.latency.snapshot(),
+                    errors=metrics.errors,
+                    error_rate=round(metrics.errors / requests, 3) if requests else 0.0,
+                    statuses={str(status): count for status, count in sorted(metrics.statuses.items())},
+                    retries=metrics.retries,
+                    bytes_sent=metrics.bytes_sent,
+                    bytes_received=metrics.bytes_received,
+                )
+            return {"tools": tools, "endpoints": endpoints}
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = ["# TYPE ticktick_tool_duration_seconds histogram"]
+        with self._lock:
+            for name, metrics in sorted(self._tools.items()):
+                lines.extend(_histogram_lines("ticktick_tool_duration_seconds", f'tool="{name}"', metrics.latency))
+            lines.append("# TYPE ticktick_tool_errors_total counter")
+            lines.extend(f'ticktick_tool_errors_total{{tool="{name}"}} {metrics.errors}'
+                         for name, metrics in sorted(self._tools.items()))
+            lines.append("# TYPE ticktick_tool_api_requests_total counter")
+            lines.extend(f'ticktick_tool_api_requests_total{{tool="{name}"}} {metrics.requests}'
+                         for name, metrics in sorted(self._tools.items()))
+
+            endpoints = sorted(self._endpoints.items())
+            lines.append("# TYPE ticktick_api_request_duration_seconds histogram")
+            for (method, template), metrics in endpoints:
+                labels = f'method="{method}",endpoint="{template}"'
+                lines.extend(_histogram_lines("ticktick_api_request_duration_seconds", labels, metrics.latency))
+            lines.append("# TYPE ticktick_api_responses_total counter")
+            for (method, template), metrics in endpoints:
+                labels = f'method="{method}",endpoint="{template}"'
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'ticktick_api_responses_total{{{labels},status="{status}"}} {count}')
+                if metrics.failures:
+                    lines.append(f'ticktick_api_responses_total{{{labels},status="none"}} {metrics.failures}')
+            for metric, attr in (("ticktick_api_retries_total", "retries"),
+                                 ("ticktick_api_sent_bytes_total", "bytes_sent"),
+                                 ("ticktick_api_received_bytes_total", "bytes_received")):
+                lines.append(f"# TYPE {metric} counter")
+                for (method, template), metrics in endpoints:
+                    lines.append(f'{metric}{{method="{method}",endpoint="{template}"}} {getattr(metrics, attr)}')
+        return "\n".join(lines) + "\n"
+
+    def dump_prometheus(self, path: Path) -> bool:
+        """
+        Write the Prometheus text format to a file (atomically).
+
+        Returns:
+            True if the file was written
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".metrics-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(self.to_prometheus())
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to write metrics file {path}: {e}")
+            return False
+        return True
+
+    def reset(self) -> None:
+        """Drop every recorded metric."""
+        with self._lock:
+            self._tools.clear()
+            self._endpoints.clear()
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
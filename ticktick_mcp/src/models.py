@@ -0,0 +1,274 @@
+"""
+Compact models of the projects and tasks returned by the TickTick API.
+
+The clients decode every response once, when it is received (see
+decode_response), instead of keeping the raw JSON dicts around:
+
+- models use __slots__ instead of a per-object dict; fields a model does
+  not know about are kept in its `extra` dict so nothing is lost;
+- dueDate and startDate are parsed once into POSIX timestamps (due_ts,
+  start_ts), so date filters never re-parse them;
+- project IDs are interned, so the tasks of a project share one string;
+- priority and status are IntEnum members.
+
+Models are read-only Mappings keyed by the API field names, so code written
+for the JSON dicts (task.get('dueDate'), task['title'], 'content' in task)
+keeps working, and to_dict() returns the JSON form. The Mapping interface is
+only there for compatibility: a lookup through it costs a Python-level call,
+so the formatters and the task index read the attributes (task.title,
+task.due_ts, ...) when given a Task.
+"""
+
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+from enum import IntEnum
+from typing import Any, Dict, Iterator, Optional
+
+DUE_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+_MISSING = object()
+
+
+class Priority(IntEnum):
+    NONE = 0
+    LOW = 1
+    MEDIUM = 3
+    HIGH = 5
+
+
+class TaskStatus(IntEnum):
+    ACTIVE = 0
+    COMPLETED = 2
+
+
+class SubtaskStatus(IntEnum):
+    ACTIVE = 0
+    COMPLETED = 1
+
+
+def parse_due_timestamp(due_date: Optional[str]) -> Optional[float]:
+    """Parse a TickTick dueDate into a POSIX timestamp (None if missing or invalid)."""
+    if not due_date:
+        return None
+    try:
+        return datetime.strptime(due_date, DUE_DATE_FORMAT).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+def _coded(enum, value: Any) -> Any:
+    """Return the enum member for a value, or the value itself if it has none."""
+    try:
+        return enum(value)
+    except ValueError:
+        return value
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Model(Mapping):
+    """Base class of the models: a read-only Mapping over slots."""
+
+    __slots__ = ("extra",)
+
+    # API field name -> attribute name
+    FIELDS: Dict[str, str] = {}
+
+    def __init__(self, data: Dict[str, Any]):
+        for attr in self.FIELDS.values():
+            setattr(self, attr, None)
+        extra = None
+        for key, value in data.items():
+            attr = self.FIELDS.get(key)
+            if attr is not None:
+                setattr(self, attr, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra: Optional[Dict[str, Any]] = extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self.FIELDS.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            return default if value is None else value
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        for key, attr in self.FIELDS.items():
+            if getattr(self, attr) is not None:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON form of the object."""
+        return {key: _to_json_value(self[key]) for key in self}
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, IntEnum):
+        return int(value)
+    if isinstance(value, list):
+        return [_to_json_value(item) for item in value]
+    return value
+
+
+_PROJECT_FIELDS = {
+    "id": "id",
+    "name": "name",
+    "color": "color",
+    "sortOrder": "sort_order",
+    "closed": "closed",
+    "groupId": "group_id",
+    "viewMode": "view_mode",
+    "permission": "permission",
+    "kind": "kind",
+}
+
+
+class Project(Model):
+    """A project (list) of the user."""
+
+    __slots__ = tuple(_PROJECT_FIELDS.values())
+    FIELDS = _PROJECT_FIELDS
+
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__(data)
+        self.id = _intern(self.id)
+
+
+_SUBTASK_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "status": "status",
+    "sortOrder": "sort_order",
+    "startDate": "start_date",
+    "isAllDay": "is_all_day",
+    "timeZone": "time_zone",
+    "completedTime": "completed_time",
+}
+
+
+class Subtask(Model):
+    """A checklist item of a task."""
+
+    __slots__ = tuple(_SUBTASK_FIELDS.values())
+    FIELDS = _SUBTASK_FIELDS
+
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__(data)
+        if self.status is not None:
+            self.status = _coded(SubtaskStatus, self.status)
+
+
+_TASK_FIELDS = {
+    "id": "id",
+    "projectId": "project_id",
+    "title": "title",
+    "content": "content",
+    "desc": "desc",
+    "startDate": "start_date",
+    "dueDate": "due_date",
+    "timeZone": "time_zone",
+    "isAllDay": "is_all_day",
+    "priority": "priority",
+    "status": "status",
+    "tags": "tags",
+    # Not "items", which would hide Mapping.items()
+    "items": "subtasks",
+    "sortOrder": "sort_order",
+    "columnId": "column_id",
+    "kind": "kind",
+    "etag": "etag",
+    "modifiedTime": "modified_time",
+    "completedTime": "completed_time",
+}
+
+
+class Task(Model):
+    """A task, with its due and start dates parsed into POSIX timestamps."""
+
+    __slots__ = tuple(_TASK_FIELDS.values()) + ("due_ts", "start_ts")
+    FIELDS = _TASK_FIELDS
+
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__(data)
+        self.project_id = _intern(self.project_id)
+        if self.priority is not None:
+            self.priority = _coded(Priority, self.priority)
+        if self.status is not None:
+            self.status = _coded(TaskStatus, self.status)
+        if self.subtasks is not None:
+            self.subtasks = [Subtask(item) if isinstance(item, dict) else item for item in self.subtasks]
+        self.due_ts = parse_due_timestamp(self.due_date)
+        self.start_ts = parse_due_timestamp(self.start_date)
+
+
+def decode_project_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode a /project/{id}/data response; the container stays a dict."""
+    decoded = dict(data)
+    if isinstance(data.get('project'), dict):
+        decoded['project'] = Project(data['project'])
+    if isinstance(data.get('tasks'), list):
+        decoded['tasks'] = [Task(task) if isinstance(task, dict) else task for task in data['tasks']]
+    return decoded
+
+
+def decode_response(endpoint: str, data: Any) -> Any:
+    """
+    Decode a successful API response into models.
+
+    Args:
+        endpoint: API endpoint the response belongs to
+        data: Parsed JSON response
+
+    Returns:
+        The decoded response; responses of other endpoints, and empty ones,
+        are returned unchanged
+    """
+    if not data:
+        return data
+    parts = endpoint.strip("/").split("/")
+    if parts[0] == "project":
+        if len(parts) == 1 and isinstance(data, list):
+            return [Project(project) if isinstance(project, dict) else project for project in data]
+        if len(parts) == 2 and isinstance(data, dict):
+            return Project(data)
+        if len(parts) == 3 and parts[2] == "data" and isinstance(data, dict):
+            return decode_project_data(data)
+        if len(parts) == 4 and parts[2] == "task" and isinstance(data, dict):
+            return Task(data)
+    elif parts[0] == "task" and len(parts) <= 2 and isinstance(data, dict):
+        return Task(data)
+    return data
+
+
+def to_json(value: Any) -> Any:
+    """`default` hook for json.dump(s) that encodes models as their JSON form."""
+    if isinstance(value, Model):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,166 @@
+"""
+Client-side rate limiting of TickTick API requests.
+
+Concurrent tool calls and fan-outs can easily exceed the Open API rate
+limits. Every request sent by a client first takes a token from a
+process-wide token bucket (TICKTICK_RATE_LIMIT requests per second with
+bursts of up to TICKTICK_RATE_BURST requests).
+
+The bucket adapts to the server: every HTTP 429 halves the refill rate and
+pauses all requests for the Retry-After delay, and each successful response
+recovers a little of the configured rate.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from .retry import parse_retry_after
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_LIMIT = 10.0
+DEFAULT_RATE_BURST = 20
+# The adaptive rate never drops below this fraction of the configured rate
+MIN_RATE_FACTOR = 0.1
+# Fraction of the configured rate recovered by each successful response
+RECOVERY_STEP = 0.05
+
+
+def get_rate_limit() -> float:
+    """Return the allowed requests per second from TICKTICK_RATE_LIMIT (default: 10, 0 disables the limiter)."""
+    value = os.getenv("TICKTICK_RATE_LIMIT")
+    if not value:
+        return DEFAULT_RATE_LIMIT
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        logger.warning(f"Invalid TICKTICK_RATE_LIMIT '{value}', using {DEFAULT_RATE_LIMIT}")
+        return DEFAULT_RATE_LIMIT
+
+
+def get_rate_burst() -> int:
+    """Return the bucket size from TICKTICK_RATE_BURST (default: 20)."""
+    value = os.getenv("TICKTICK_RATE_BURST")
+    if not value:
+        return DEFAULT_RATE_BURST
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Invalid TICKTICK_RATE_BURST '{value}', using {DEFAULT_RATE_BURST}")
+        return DEFAULT_RATE_BURST
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with adaptive slowdown on HTTP 429.
+
+    reserve() never blocks: it takes a token (possibly one that will only be
+    available in the future) and returns how long the caller must wait, so
+    the blocking client can time.sleep() and the async client can
+    asyncio.sleep() on the same bucket.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        # No token is handed out before this time (set from Retry-After)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.delayed = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.throttled = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rate > 0
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take a token.
+
+        Args:
+            max_wait: Longest acceptable wait; no token is taken if it would
+                take this long (e.g. the time left before a tool deadline)
+
+        Returns:
+            Seconds to wait before sending the request (0 if a token was
+            available), or None if the wait would reach `max_wait`
+        """
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, (1 - self._tokens) / self.rate, self._paused_until - now)
+            if max_wait is not None and wait >= max_wait:
+                return None
+            self._tokens -= 1
+            self.acquired += 1
+            if wait > 0:
+                self.delayed += 1
+                self.wait_time += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def observe(self, status: int, retry_after: Optional[str] = None) -> None:
+        """
+        Adapt the rate to a response status.
+
+        Args:
+            status: HTTP status of the response
+            retry_after: Retry-After header of the response
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if status == 429:
+                self._refill(time.monotonic())
+                self.throttled += 1
+                self.rate = max(self.max_rate * MIN_RATE_FACTOR, self.rate / 2)
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                logger.warning(f"Rate limited by the API, slowing down to {self.rate:.2f} requests/s")
+            elif status < 400 and self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_STEP)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the acquisition and waiting counters and the current rate."""
+        with self._lock:
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "wait_time": round(self.wait_time, 3),
+                "max_wait": round(self.max_wait, 3),
+                "throttled": self.throttled,
+            }
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+_limiter: Optional[TokenBucket] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Return the process-wide token bucket shared by every client."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = TokenBucket(get_rate_limit(), get_rate_burst())
+        return _limiter
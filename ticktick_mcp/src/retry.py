@@ -0,0 +1,188 @@
+"""
+Retry policy for TickTick API requests.
+
+A transient failure (HTTP 429/5xx, connection reset, timeout) during a
+cross-project scan used to drop a project from the results. The client now
+retries such failures with exponential backoff and jitter, honoring the
+Retry-After header, as long as retrying is safe for the request:
+
+- GET and DELETE requests are idempotent and always retried;
+- POST requests that set state (task/project updates, task completion) are
+  idempotent too;
+- POST requests that create something (/task, /project) are only retried
+  when the server cannot have applied them: on HTTP 429, or when the
+  connection could not be established.
+
+Every retry must also fit in the deadline of the current tool call (see
+tool_deadline), so a tool never waits past its budget.
+"""
+
+import contextvars
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Iterator, Optional
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 8.0
+# Longest Retry-After the client is willing to wait (seconds)
+MAX_RETRY_AFTER = 60.0
+DEFAULT_TOOL_DEADLINE = 60.0
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Failure kinds reported by the client
+CONNECT_FAILURE = "connect"      # the request never reached the server
+TRANSPORT_FAILURE = "transport"  # reset or timeout after the request was sent
+
+# Absolute time.monotonic() deadline of the current tool call
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("ticktick_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of sending a request once the tool deadline has passed."""
+
+
+def _get_env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        logger.warning(f"Invalid {name} '{value}', using {default}")
+        return default
+
+
+def get_max_retries() -> int:
+    """Return the number of retries from TICKTICK_MAX_RETRIES (default: 3, 0 disables retries)."""
+    return int(_get_env_float("TICKTICK_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+
+
+def get_tool_deadline() -> float:
+    """Return the time budget of a tool call from TICKTICK_TOOL_DEADLINE (default: 60s, 0 disables it)."""
+    return _get_env_float("TICKTICK_TOOL_DEADLINE", DEFAULT_TOOL_DEADLINE)
+
+
+@contextmanager
+def tool_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Limit the time the API calls made in this context may take, retries included.
+
+    Nested deadlines never extend an enclosing one. Tasks started inside the
+    context (e.g. by fan_out) inherit the deadline.
+
+    Args:
+        seconds: Budget from now, or None/0 for no deadline
+    """
+    current = _deadline.get()
+    if seconds:
+        new = time.monotonic() + seconds
+        if current is not None:
+            new = min(new, current)
+    else:
+        new = current
+    token = _deadline.set(new)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Return the seconds left before the current deadline, or None without a deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_idempotent(method: str, endpoint: str) -> bool:
+    """Check whether repeating a request has the same effect as sending it once."""
+    if method in ("GET", "DELETE"):
+        return True
+    # POST /task and POST /project create a new object on every call
+    return endpoint.rstrip("/") not in ("/task", "/project")
+
+
+class RetryPolicy:
+    """Decides whether and when a failed API request is retried."""
+
+    def __init__(self, max_retries: Optional[int] = None,
+                 base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY):
+        self.max_retries = get_max_retries() if max_retries is None else max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter: a random delay in [cap/2, cap] for the attempt."""
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    def delay_for(self, attempt: int, method: str, endpoint: str, status: Optional[int] = None,
+                  retry_after: Optional[str] = None, failure: Optional[str] = None) -> Optional[float]:
+        """
+        Return how long to wait before retrying a failed request, or None to give up.
+
+        Args:
+            attempt: Number of retries already made for this request
+            method: HTTP method of the request
+            endpoint: API endpoint of the request
+            status: HTTP status of the response, if one was received
+            retry_after: Retry-After header of the response
+            failure: CONNECT_FAILURE or TRANSPORT_FAILURE if no response was received
+
+        Returns:
+            Delay in seconds, or None if the request must not be retried
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        idempotent = is_idempotent(method, endpoint)
+        if status is not None:
+            if status not in RETRYABLE_STATUSES or (status != 429 and not idempotent):
+                return None
+        elif failure == TRANSPORT_FAILURE:
+            if not idempotent:
+                return None
+        elif failure != CONNECT_FAILURE:
+            return None
+
+        delay = self.backoff(attempt)
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            if requested > MAX_RETRY_AFTER:
+                return None
+            delay = max(delay, requested)
+
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            logger.info(f"Not retrying {method} {endpoint}: the tool deadline would be exceeded")
+            return None
+
+        self.retries += 1
+        return delay
@@ -1,26 +1,201 @@
 import asyncio
+import base64
+import functools
 import json
 import math
 import os
 import logging
+import time
+import zlib
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, date, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 from mcp.server.fastmcp import FastMCP
 
-from .ticktick_client import TickTickClient
+from .ticktick_client import AsyncTickTickClient
 from .auth import TickTickAuth
+from .tracing import span, trace_tool, traced
+from .metrics import METRICS_DUMP_INTERVAL, get_metrics, get_metrics_file
+from .fanout import FanOutResult, fan_out, get_batch_concurrency, get_max_concurrency
+from .models import Subtask, Task, to_json
+from .task_index import DueRange, FieldEquals, Or, TaskIndex, TextSearch, select_tasks, tokenize
+from .retry import get_tool_deadline, remaining_time, tool_deadline
+from .sync import SyncEngine, get_sync_interval
+from .warmup import AccessTracker, WarmupScheduler, get_warmup_interval, get_warmup_projects
+from .snapshot import delete_snapshot, is_save_due, is_snapshot_enabled, load_snapshot, save_snapshot
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create FastMCP server
-mcp = FastMCP("ticktick")
-
 # Create TickTick client
 ticktick = None
 
+# Index of the tasks fetched by the cross-project tools
+task_index = TaskIndex()
+
+# Background sync of the project replica (see TICKTICK_SYNC_INTERVAL)
+sync_engine: Optional[SyncEngine] = None
+
+# Project access frequencies and tool activity, used by the cache warmup
+access_tracker = AccessTracker()
+
+# Background tasks started by the server lifespan
+_background_tasks = set()
+
+# Whether the server lifespan is running, i.e. background tasks can be started
+_serving = False
+
+# Sync engine or warmup scheduler task bound to the current client
+_refresher_tasks: List[asyncio.Task] = []
+
+def _start_background_task(coro) -> asyncio.Task:
+    """Run a coroutine in the background until it finishes or the server stops."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+def _start_refreshers() -> None:
+    """Start the sync engine, or else the cache warmup, for the current client."""
+    global sync_engine
+    if get_sync_interval() > 0:
+        sync_engine = SyncEngine(ticktick, task_index, get_sync_interval())
+        _refresher_tasks.append(_start_background_task(sync_engine.run()))
+    elif get_warmup_projects() > 0:
+        # The sync engine already keeps every project fresh
+        scheduler = WarmupScheduler(ticktick, access_tracker, get_warmup_projects(), get_warmup_interval())
+        _refresher_tasks.append(_start_background_task(scheduler.run()))
+
+def _stop_refreshers() -> None:
+    """Stop the sync engine and cache warmup started by _start_refreshers."""
+    global sync_engine
+    for task in _refresher_tasks:
+        task.cancel()
+    _refresher_tasks.clear()
+    sync_engine = None
+
+# Snapshot save running in a worker thread, if any
+_snapshot_save: Optional[asyncio.Task] = None
+
+async def _refresh_snapshot_entries() -> None:
+    """Revalidate the entries loaded from the on-disk snapshot, then save a fresh snapshot."""
+    refreshed = await ticktick.refresh_stale_entries()
+    logger.info(f"Refreshed {refreshed} snapshot entries in the background")
+    await asyncio.to_thread(save_snapshot, ticktick.cache, ticktick.base_url)
+
+def _save_snapshot_in_background() -> None:
+    """
+    Save the snapshot in a worker thread, at most every SNAPSHOT_SAVE_INTERVAL.
+
+    Encoding and writing a large snapshot takes a while, so it must not run on
+    the event loop inside a tool call. Nothing is started while a save is running.
+    """
+    global _snapshot_save
+    if (_snapshot_save is not None and not _snapshot_save.done()) or not is_save_due():
+        return
+    _snapshot_save = _start_background_task(
+        asyncio.to_thread(save_snapshot, ticktick.cache, ticktick.base_url, throttle=True)
+    )
+
+# time.perf_counter() at the end of each startup phase, reported under --debug
+_startup_marks: Dict[str, float] = {}
+
+def _report_startup() -> None:
+    """Log how long each startup phase took (debug level)."""
+    marks = list(_startup_marks.items())
+    if len(marks) < 2:
+        return
+    phases = ", ".join(f"{name} {(mark - previous) * 1000:.1f} ms"
+                       for (_, previous), (name, mark) in zip(marks, marks[1:]))
+    logger.debug(f"Server ready in {(marks[-1][1] - marks[0][1]) * 1000:.1f} ms ({phases})")
+
+async def _dump_metrics_periodically(path) -> None:
+    """Write the Prometheus metrics file every METRICS_DUMP_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(METRICS_DUMP_INTERVAL)
+        get_metrics().dump_prometheus(path)
+
+async def _check_connectivity() -> None:
+    """Check that the API accepts the configured token, off the startup critical path."""
+    projects = await ticktick.get_projects()
+    if 'error' in projects:
+        logger.error(f"Failed to access TickTick API: {projects['error']}")
+        logger.error("Your access token may have expired. Please run 'uv run -m ticktick_mcp.cli auth' to refresh it.")
+        return
+    logger.info(f"Successfully connected to TickTick API with {len(projects)} projects")
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """Run background work for the lifetime of the MCP server."""
+    global _serving
+
+    if _startup_marks:
+        _startup_marks["serving"] = time.perf_counter()
+        _report_startup()
+
+    if ticktick:
+        _start_background_task(_check_connectivity())
+    if ticktick and is_snapshot_enabled():
+        _start_background_task(_refresh_snapshot_entries())
+    if get_sync_interval() <= 0 and get_warmup_projects() > 0:
+        access_tracker.load()
+    _serving = True
+    if ticktick:
+        _start_refreshers()
+    metrics_file = get_metrics_file()
+    if metrics_file:
+        _start_background_task(_dump_metrics_periodically(metrics_file))
+    try:
+        yield {}
+    finally:
+        _serving = False
+        _stop_refreshers()
+        for task in list(_background_tasks):
+            task.cancel()
+        if metrics_file:
+            get_metrics().dump_prometheus(metrics_file)
+        if access_tracker.counts:
+            access_tracker.save()
+        if ticktick and is_snapshot_enabled():
+            save_snapshot(ticktick.cache, ticktick.base_url)
+
+# Create FastMCP server
+mcp = FastMCP("ticktick", lifespan=server_lifespan)
+
+def tool():
+    """
+    Register an MCP tool whose API calls share one TICKTICK_TOOL_DEADLINE budget.
+
+    Request timeouts are shortened to the time left, retries of failed API
+    calls (see retry.py) stop once the budget is spent, and cross-project
+    scans report the projects they could not fetch in time. Invocations are
+    traced when TICKTICK_TRACE is enabled (see tracing.py). The latency and
+    API requests of every invocation are recorded in the metrics registry;
+    an invocation counts as an error when it raises or returns an "Error..."
+    message.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            metrics = get_metrics()
+            token = metrics.start_tool()
+            started = time.perf_counter()
+            error = True
+            access_tracker.tool_started()
+            try:
+                async with trace_tool(func.__name__):
+                    with tool_deadline(get_tool_deadline()):
+                        result = await func(*args, **kwargs)
+                error = isinstance(result, str) and result.startswith("Error")
+                return result
+            finally:
+                metrics.finish_tool(func.__name__, time.perf_counter() - started, error, token)
+                access_tracker.tool_finished()
+        return mcp.tool()(wrapper)
+    return decorator
+
 def get_auth_error_message() -> str:
     """Return a helpful authentication error message for AI to show users."""
     return """⚠️ TickTick Authentication Required
@@ -70,7 +245,8 @@ For China users (Dida365), also add these env vars to MCP config:
 - `TICKTICK_TOKEN_URL=https://dida365.com/oauth/token`
 """
 
-def initialize_client():
+def create_client() -> bool:
+    """Create the TickTick client from the stored credentials, without any network call."""
     global ticktick
     try:
         # Load config: env vars (MCP config) + ~/.ticktick/config.json
@@ -82,83 +258,250 @@ def initialize_client():
             return False
         
         # Initialize the client
-        ticktick = TickTickClient()
+        ticktick = AsyncTickTickClient()
         logger.info("TickTick client initialized successfully")
-        
+
+        # Serve reads from the last snapshot while they are refreshed
+        if is_snapshot_enabled():
+            load_snapshot(ticktick.cache, ticktick.base_url)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to initialize TickTick client: {e}")
+        return False
+
+async def initialize_client():
+    """
+    Create the TickTick client and check that the API accepts its token.
+
+    When the server is running without a sync engine or warmup (e.g. it was
+    started without credentials), they are started for the new client.
+    """
+    if not create_client():
+        return False
+    try:
         # Test API connectivity
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             logger.error(f"Failed to access TickTick API: {projects['error']}")
             logger.error("Your access token may have expired. Please run 'uv run -m ticktick_mcp.cli auth' to refresh it.")
             return False
             
         logger.info(f"Successfully connected to TickTick API with {len(projects)} projects")
-        return True
     except Exception as e:
         logger.error(f"Failed to initialize TickTick client: {e}")
         return False
+    if _serving and not _refresher_tasks:
+        _start_refreshers()
+    return True
+
+async def reinitialize_client() -> bool:
+    """
+    Replace the client after a new authentication, which may be for another account.
+
+    The sync engine and warmup of the old client are stopped, the task index is
+    emptied and the old client's connections are closed.
+    """
+    global task_index
+    old_client = ticktick
+    _stop_refreshers()
+    task_index = TaskIndex()
+    initialized = await initialize_client()
+    if old_client is not None and old_client is not ticktick:
+        await old_client.aclose()
+    return initialized
 
 # Format a task object from TickTick for better display
-def format_task(task: Dict) -> str:
-    """Format a task into a human-readable string."""
-    formatted = f"ID: {task.get('id', 'No ID')}\n"
-    formatted += f"Title: {task.get('title', 'No title')}\n"
+def format_task(task: Dict, fields: Optional[List[str]] = None) -> str:
+    """
+    Format a task into a human-readable string.
+
+    Args:
+        task: Task dictionary
+        fields: Only show these fields (see TASK_FIELDS); all of them by default
+    """
+    def show(field: str) -> bool:
+        return fields is None or field in fields
+
+    # Decoded tasks are read through their slots, JSON dicts by key
+    if isinstance(task, Task):
+        task_id, title, project_id = task.id, task.title, task.project_id
+        start_date, due_date, priority, status = task.start_date, task.due_date, task.priority, task.status
+        is_all_day, tags, content, items = task.is_all_day, task.tags, task.content, task.subtasks
+    else:
+        task_id, title, project_id = task.get('id'), task.get('title'), task.get('projectId')
+        start_date, due_date, priority, status = (task.get('startDate'), task.get('dueDate'),
+                                                  task.get('priority'), task.get('status'))
+        is_all_day, tags, content, items = (task.get('isAllDay'), task.get('tags'),
+                                            task.get('content'), task.get('items'))
+
+    lines = []
+    if show('id'):
+        lines.append(f"ID: {task_id if task_id is not None else 'No ID'}")
+    if show('title'):
+        lines.append(f"Title: {title if title is not None else 'No title'}")
     
     # Add project ID
-    formatted += f"Project ID: {task.get('projectId', 'None')}\n"
+    if show('projectId'):
+        lines.append(f"Project ID: {project_id if project_id is not None else 'None'}")
     
     # Add dates if available
-    if task.get('startDate'):
-        formatted += f"Start Date: {task.get('startDate')}\n"
-    if task.get('dueDate'):
-        formatted += f"Due Date: {task.get('dueDate')}\n"
+    if show('startDate') and start_date:
+        lines.append(f"Start Date: {start_date}")
+    if show('dueDate') and due_date:
+        lines.append(f"Due Date: {due_date}")
+    if fields is not None and 'isAllDay' in fields:
+        lines.append(f"All Day: {'Yes' if is_all_day else 'No'}")
     
     # Add priority if available
-    priority_map = {0: "None", 1: "Low", 3: "Medium", 5: "High"}
-    priority = task.get('priority', 0)
-    formatted += f"Priority: {priority_map.get(priority, str(priority))}\n"
+    if show('priority'):
+        priority = priority or 0
+        lines.append(f"Priority: {PRIORITY_MAP.get(priority, str(priority))}")
     
     # Add status if available
-    status = "Completed" if task.get('status') == 2 else "Active"
-    formatted += f"Status: {status}\n"
+    if show('status'):
+        lines.append(f"Status: {'Completed' if status == 2 else 'Active'}")
+
+    if fields is not None and 'tags' in fields and tags:
+        lines.append(f"Tags: {', '.join(tags)}")
     
     # Add content if available
-    if task.get('content'):
-        formatted += f"\nContent:\n{task.get('content')}\n"
+    if show('content') and content:
+        lines.append(f"\nContent:\n{content}")
     
     # Add subtasks if available
-    items = task.get('items', [])
-    if items:
-        formatted += f"\nSubtasks ({len(items)}):\n"
+    if show('items') and items:
+        lines.append(f"\nSubtasks ({len(items)}):")
         for i, item in enumerate(items, 1):
-            status = "✓" if item.get('status') == 1 else "□"
-            formatted += f"{i}. [{status}] {item.get('title', 'No title')}\n"
+            item_title, item_status = _subtask_values(item)
+            lines.append(f"{i}. [{'✓' if item_status == 1 else '□'}] {item_title if item_title is not None else 'No title'}")
     
-    return formatted
+    return "\n".join(lines) + "\n"
 
 # Format a project object from TickTick for better display
 def format_project(project: Dict) -> str:
     """Format a project into a human-readable string."""
-    formatted = f"Name: {project.get('name', 'No name')}\n"
-    formatted += f"ID: {project.get('id', 'No ID')}\n"
+    lines = [
+        f"Name: {project.get('name', 'No name')}",
+        f"ID: {project.get('id', 'No ID')}",
+    ]
     
     # Add color if available
     if project.get('color'):
-        formatted += f"Color: {project.get('color')}\n"
+        lines.append(f"Color: {project.get('color')}")
     
     # Add view mode if available
     if project.get('viewMode'):
-        formatted += f"View Mode: {project.get('viewMode')}\n"
+        lines.append(f"View Mode: {project.get('viewMode')}")
     
     # Add closed status if available
     if 'closed' in project:
-        formatted += f"Closed: {'Yes' if project.get('closed') else 'No'}\n"
+        lines.append(f"Closed: {'Yes' if project.get('closed') else 'No'}")
     
     # Add kind if available
     if project.get('kind'):
-        formatted += f"Kind: {project.get('kind')}\n"
+        lines.append(f"Kind: {project.get('kind')}")
     
-    return formatted
+    return "\n".join(lines) + "\n"
+
+# Output formats of the list tools: "json" and "compact" return a JSON
+# document instead of text; "compact" keeps only the essential fields and
+# drops empty and default values
+OUTPUT_FORMATS = ("text", "json", "compact")
+JSON_TASK_FIELDS = ("id", "projectId", "title", "content", "startDate", "dueDate", "isAllDay",
+                    "priority", "status", "tags")
+COMPACT_TASK_FIELDS = ("id", "projectId", "title", "dueDate", "priority")
+JSON_PROJECT_FIELDS = ("id", "name", "color", "viewMode", "closed", "kind")
+COMPACT_PROJECT_FIELDS = ("id", "name")
+
+# Task fields that can be selected with the `fields` parameter of the list tools
+TASK_FIELDS = JSON_TASK_FIELDS + ("items",)
+DEFAULT_MAX_CONTENT_LENGTH = 2000
+
+def get_max_content_length() -> int:
+    """Return the content truncation limit from TICKTICK_MAX_CONTENT_LENGTH (default: 2000, 0 disables it)."""
+    value = os.getenv("TICKTICK_MAX_CONTENT_LENGTH")
+    if not value:
+        return DEFAULT_MAX_CONTENT_LENGTH
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logger.warning(f"Invalid TICKTICK_MAX_CONTENT_LENGTH '{value}', using {DEFAULT_MAX_CONTENT_LENGTH}")
+        return DEFAULT_MAX_CONTENT_LENGTH
+
+def truncate_content(content: str) -> str:
+    """Cut a task description down to TICKTICK_MAX_CONTENT_LENGTH characters."""
+    limit = get_max_content_length()
+    if not limit or len(content) <= limit:
+        return content
+    return f"{content[:limit]}… [truncated, {len(content) - limit} more characters]"
+
+def _check_fields(fields: Optional[List[str]]) -> Optional[str]:
+    """Return an error message if `fields` names a field that is not in TASK_FIELDS."""
+    if fields is None:
+        return None
+    unknown = [field for field in fields if field not in TASK_FIELDS]
+    if unknown:
+        return f"Invalid fields {unknown}. Valid fields: {', '.join(TASK_FIELDS)}"
+    if not fields:
+        return f"fields must name at least one field. Valid fields: {', '.join(TASK_FIELDS)}"
+    return None
+
+def _subtask_values(item: Dict) -> Tuple[Optional[str], Any]:
+    """Return the (title, status) of a subtask."""
+    if isinstance(item, Subtask):
+        return item.title, item.status
+    return item.get('title'), item.get('status')
+
+def _task_values(task: Dict, fields) -> List[Tuple[str, Any]]:
+    """Return the (field, value) pairs of a task for the given API field names (None when missing)."""
+    if isinstance(task, Task):
+        # Read the slots directly instead of going through the Mapping interface
+        attrs = Task.FIELDS
+        return [(field, getattr(task, attrs[field])) for field in fields]
+    return [(field, task.get(field)) for field in fields]
+
+def project_task(task: Dict, fields: Optional[List[str]]) -> Dict:
+    """
+    Return a copy of a task with only the requested fields (and truncated content).
+
+    This only slims the output of a tool: the response cache, the task index and
+    the sync replica keep the full task payloads.
+    """
+    projected = {field: value for field, value in _task_values(task, fields or TASK_FIELDS) if value is not None}
+    if projected.get('content'):
+        projected['content'] = truncate_content(projected['content'])
+    return projected
+
+def _check_output_format(output_format: str) -> Optional[str]:
+    """Return an error message if `output_format` is not one of OUTPUT_FORMATS."""
+    if output_format not in OUTPUT_FORMATS:
+        return f"Invalid output_format '{output_format}'. Valid values: {', '.join(OUTPUT_FORMATS)}"
+    return None
+
+def serialize_task(task: Dict, output_format: str = "json", fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Select the fields of a task (`fields`, or the defaults of the format) for the json or compact output format."""
+    if output_format == "compact":
+        return {field: value for field, value in _task_values(task, fields or COMPACT_TASK_FIELDS) if value}
+
+    data = {}
+    items = None
+    for field, value in _task_values(task, fields or TASK_FIELDS):
+        if field == 'items':
+            items = value
+        elif value is not None and value != "" and value != []:
+            data[field] = value
+    if items:
+        data['items'] = [{"title": title, "status": status or 0} for title, status in map(_subtask_values, items)]
+    return data
+
+def serialize_project(project: Dict, output_format: str = "json") -> Dict[str, Any]:
+    """Select the fields of a project for the json or compact output format."""
+    fields = COMPACT_PROJECT_FIELDS if output_format == "compact" else JSON_PROJECT_FIELDS
+    return {field: project[field] for field in fields if project.get(field) not in (None, "")}
+
+def _dump_output(payload: Dict[str, Any]) -> str:
+    """Encode the result of a list tool in the json/compact formats."""
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=to_json)
 
 # Module-level state for MCP auth flow
 _pending_auth_state: Optional[str] = None
@@ -166,7 +509,7 @@ _pending_auth: Optional[TickTickAuth] = None
 
 # MCP Tools — Authentication
 
-@mcp.tool()
+@tool()
 async def ticktick_auth_start() -> str:
     """
     Start the TickTick OAuth authorization flow.
@@ -206,7 +549,7 @@ async def ticktick_auth_start() -> str:
     )
 
 
-@mcp.tool()
+@tool()
 async def ticktick_auth_complete(callback_url: str) -> str:
     """
     Complete the TickTick OAuth flow by parsing the callback URL.
@@ -227,8 +570,11 @@ async def ticktick_auth_complete(callback_url: str) -> str:
     _pending_auth = None
 
     if "successful" in result.lower():
+        # The snapshot may belong to another account
+        delete_snapshot()
+
         # Re-initialize client with new tokens
-        if initialize_client():
+        if await reinitialize_client():
             return result + "\n\nTickTick client re-initialized. You can now use all TickTick tools."
         else:
             return result + "\n\nWarning: Config saved but client re-initialization failed. Please restart the server."
@@ -238,17 +584,19 @@ async def ticktick_auth_complete(callback_url: str) -> str:
 
 # MCP Tools — Data
 
-@mcp.tool()
-async def get_projects(size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_projects(size: int = 50, page: int = 1, output_format: str = "text") -> str:
     """
     Get all projects from TickTick.
 
     Args:
         size: Maximum number of projects to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     # Validate parameters
@@ -256,12 +604,15 @@ async def get_projects(size: int = 50, page: int = 1) -> str:
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        if not projects:
+        if not projects and output_format == "text":
             return "No projects found."
 
         total_projects = len(projects)
@@ -274,20 +625,28 @@ async def get_projects(size: int = 50, page: int = 1) -> str:
         end = start + size
         paginated_projects = projects[start:end]
 
-        result = f"Found {total_projects} projects (page {page}/{total_pages}, showing {start + 1}-{min(end, total_projects)}):\n\n"
+        if output_format != "text":
+            return _dump_output({
+                "total": total_projects,
+                "page": page,
+                "pages": total_pages,
+                "projects": [serialize_project(project, output_format) for project in paginated_projects],
+            })
+
+        parts = [f"Found {total_projects} projects (page {page}/{total_pages}, showing {start + 1}-{min(end, total_projects)}):\n\n"]
 
         for i, project in enumerate(paginated_projects, start + 1):
-            result += f"Project {i}:\n" + format_project(project) + "\n"
+            parts.append(f"Project {i}:\n{format_project(project)}\n")
 
         if page < total_pages:
-            result += f"\nUse page={page + 1} to see next page."
+            parts.append(f"\nUse page={page + 1} to see next page.")
 
-        return result
+        return "".join(parts)
     except Exception as e:
         logger.error(f"Error in get_projects: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def get_project(project_id: str) -> str:
     """
     Get details about a specific project.
@@ -296,11 +655,12 @@ async def get_project(project_id: str) -> str:
         project_id: ID of the project
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     try:
-        project = ticktick.get_project(project_id)
+        access_tracker.record([project_id])
+        project = await ticktick.get_project(project_id)
         if 'error' in project:
             return f"Error fetching project: {project['error']}"
         
@@ -309,8 +669,9 @@ async def get_project(project_id: str) -> str:
         logger.error(f"Error in get_project: {e}")
         return f"Error retrieving project: {str(e)}"
 
-@mcp.tool()
-async def get_project_tasks(project_id: str, size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_project_tasks(project_id: str, size: int = 50, page: int = 1, output_format: str = "text",
+                            fields: Optional[List[str]] = None) -> str:
     """
     Get all tasks in a specific project.
 
@@ -318,9 +679,14 @@ async def get_project_tasks(project_id: str, size: int = 50, page: int = 1) -> s
         project_id: ID of the project
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     # Validate parameters
@@ -328,13 +694,17 @@ async def get_project_tasks(project_id: str, size: int = 50, page: int = 1) -> s
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        project_data = ticktick.get_project_with_data(project_id)
+        access_tracker.record([project_id])
+        project_data = await ticktick.get_project_with_data(project_id)
         if 'error' in project_data:
             return f"Error fetching project data: {project_data['error']}"
 
         tasks = project_data.get('tasks', [])
-        if not tasks:
+        if not tasks and output_format == "text":
             return f"No tasks found in project '{project_data.get('project', {}).get('name', project_id)}'."
 
         total_tasks = len(tasks)
@@ -345,22 +715,31 @@ async def get_project_tasks(project_id: str, size: int = 50, page: int = 1) -> s
 
         start = (page - 1) * size
         end = start + size
-        paginated_tasks = tasks[start:end]
+        paginated_tasks = [project_task(task, fields) for task in tasks[start:end]]
 
-        result = f"Found {total_tasks} tasks in project '{project_data.get('project', {}).get('name', project_id)}' (page {page}/{total_pages}, showing {start + 1}-{min(end, total_tasks)}):\n\n"
+        if output_format != "text":
+            return _dump_output({
+                "project": serialize_project(project_data.get('project') or {'id': project_id}, output_format),
+                "total": total_tasks,
+                "page": page,
+                "pages": total_pages,
+                "tasks": [serialize_task(task, output_format, fields) for task in paginated_tasks],
+            })
+
+        parts = [f"Found {total_tasks} tasks in project '{project_data.get('project', {}).get('name', project_id)}' (page {page}/{total_pages}, showing {start + 1}-{min(end, total_tasks)}):\n\n"]
 
         for i, task in enumerate(paginated_tasks, start + 1):
-            result += f"Task {i}:\n" + format_task(task) + "\n"
+            parts.append(f"Task {i}:\n{format_task(task, fields)}\n")
 
         if page < total_pages:
-            result += f"\nUse page={page + 1} to see next page."
+            parts.append(f"\nUse page={page + 1} to see next page.")
 
-        return result
+        return "".join(parts)
     except Exception as e:
         logger.error(f"Error in get_project_tasks: {e}")
         return f"Error retrieving project tasks: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def get_task(project_id: str, task_id: str) -> str:
     """
     Get details about a specific task.
@@ -370,11 +749,12 @@ async def get_task(project_id: str, task_id: str) -> str:
         task_id: ID of the task
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     try:
-        task = ticktick.get_task(project_id, task_id)
+        access_tracker.record([project_id])
+        task = await ticktick.get_task(project_id, task_id)
         if 'error' in task:
             return f"Error fetching task: {task['error']}"
         
@@ -383,7 +763,7 @@ async def get_task(project_id: str, task_id: str) -> str:
         logger.error(f"Error in get_task: {e}")
         return f"Error retrieving task: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def create_task(
     title: str, 
     project_id: str, 
@@ -404,7 +784,7 @@ async def create_task(
         priority: Priority level (0: None, 1: Low, 3: Medium, 5: High) (optional)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     # Validate priority
@@ -421,7 +801,7 @@ async def create_task(
                 except ValueError:
                     return f"Invalid {date_name} format. Use ISO format: YYYY-MM-DDThh:mm:ss+0000"
         
-        task = ticktick.create_task(
+        task = await ticktick.create_task(
             title=title,
             project_id=project_id,
             content=content,
@@ -432,13 +812,14 @@ async def create_task(
         
         if 'error' in task:
             return f"Error creating task: {task['error']}"
-        
+
+        task_index.upsert_task(task)
         return f"Task created successfully:\n\n" + format_task(task)
     except Exception as e:
         logger.error(f"Error in create_task: {e}")
         return f"Error creating task: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def update_task(
     task_id: str,
     project_id: str,
@@ -461,7 +842,7 @@ async def update_task(
         priority: New priority level (0: None, 1: Low, 3: Medium, 5: High) (optional)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     # Validate priority if provided
@@ -478,7 +859,7 @@ async def update_task(
                 except ValueError:
                     return f"Invalid {date_name} format. Use ISO format: YYYY-MM-DDThh:mm:ss+0000"
         
-        task = ticktick.update_task(
+        task = await ticktick.update_task(
             task_id=task_id,
             project_id=project_id,
             title=title,
@@ -490,13 +871,14 @@ async def update_task(
         
         if 'error' in task:
             return f"Error updating task: {task['error']}"
-        
+
+        task_index.upsert_task(task)
         return f"Task updated successfully:\n\n" + format_task(task)
     except Exception as e:
         logger.error(f"Error in update_task: {e}")
         return f"Error updating task: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def complete_task(project_id: str, task_id: str) -> str:
     """
     Mark a task as complete.
@@ -506,20 +888,21 @@ async def complete_task(project_id: str, task_id: str) -> str:
         task_id: ID of the task
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     try:
-        result = ticktick.complete_task(project_id, task_id)
+        result = await ticktick.complete_task(project_id, task_id)
         if 'error' in result:
             return f"Error completing task: {result['error']}"
-        
+
+        task_index.remove_task(project_id, task_id)
         return f"Task {task_id} marked as complete."
     except Exception as e:
         logger.error(f"Error in complete_task: {e}")
         return f"Error completing task: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def delete_task(project_id: str, task_id: str) -> str:
     """
     Delete a task.
@@ -529,20 +912,21 @@ async def delete_task(project_id: str, task_id: str) -> str:
         task_id: ID of the task
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     try:
-        result = ticktick.delete_task(project_id, task_id)
+        result = await ticktick.delete_task(project_id, task_id)
         if 'error' in result:
             return f"Error deleting task: {result['error']}"
-        
+
+        task_index.remove_task(project_id, task_id)
         return f"Task {task_id} deleted successfully."
     except Exception as e:
         logger.error(f"Error in delete_task: {e}")
         return f"Error deleting task: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def create_project(
     name: str,
     color: str = "#F18181",
@@ -557,7 +941,7 @@ async def create_project(
         view_mode: View mode - one of list, kanban, or timeline (optional)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     # Validate view_mode
@@ -565,7 +949,7 @@ async def create_project(
         return "Invalid view_mode. Must be one of: list, kanban, timeline."
     
     try:
-        project = ticktick.create_project(
+        project = await ticktick.create_project(
             name=name,
             color=color,
             view_mode=view_mode
@@ -579,7 +963,7 @@ async def create_project(
         logger.error(f"Error in create_project: {e}")
         return f"Error creating project: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def delete_project(project_id: str) -> str:
     """
     Delete a project.
@@ -588,14 +972,15 @@ async def delete_project(project_id: str) -> str:
         project_id: ID of the project
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     try:
-        result = ticktick.delete_project(project_id)
+        result = await ticktick.delete_project(project_id)
         if 'error' in result:
             return f"Error deleting project: {result['error']}"
-        
+
+        task_index.remove_project(project_id)
         return f"Project {project_id} deleted successfully."
     except Exception as e:
         logger.error(f"Error in delete_project: {e}")
@@ -608,66 +993,14 @@ async def delete_project(project_id: str) -> str:
 
 PRIORITY_MAP = {0: "None", 1: "Low", 3: "Medium", 5: "High"}
 
-def _is_task_due_today(task: Dict[str, Any]) -> bool:
-    """Check if a task is due today."""
-    due_date = task.get('dueDate')
-    if not due_date:
-        return False
-    
-    try:
-        task_due_date = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S.%f%z").date()
-        today_date = datetime.now(timezone.utc).date()
-        return task_due_date == today_date
-    except (ValueError, TypeError):
-        return False
-
-def _is_task_overdue(task: Dict[str, Any]) -> bool:
-    """Check if a task is overdue."""
-    due_date = task.get('dueDate')
-    if not due_date:
-        return False
-    
-    try:
-        task_due = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-        return task_due < datetime.now(timezone.utc)
-    except (ValueError, TypeError):
-        return False
-
-def _is_task_due_in_days(task: Dict[str, Any], days: int) -> bool:
-    """Check if a task is due in exactly X days."""
-    due_date = task.get('dueDate')
-    if not due_date:
-        return False
-    
-    try:
-        task_due_date = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S.%f%z").date()
-        target_date = (datetime.now(timezone.utc) + timedelta(days=days)).date()
-        return task_due_date == target_date
-    except (ValueError, TypeError):
-        return False
+def _utc_day_start(days: int = 0) -> float:
+    """Return the timestamp of UTC midnight `days` days from today."""
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (today + timedelta(days=days)).timestamp()
 
-def _task_matches_search(task: Dict[str, Any], search_term: str) -> bool:
-    """Check if a task matches the search term (case-insensitive)."""
-    search_term = search_term.lower()
-    
-    # Search in title
-    title = task.get('title', '').lower()
-    if search_term in title:
-        return True
-    
-    # Search in content
-    content = task.get('content', '').lower()
-    if search_term in content:
-        return True
-    
-    # Search in subtasks
-    items = task.get('items', [])
-    for item in items:
-        item_title = item.get('title', '').lower()
-        if search_term in item_title:
-            return True
-    
-    return False
+def _due_in_days_range(days: int) -> DueRange:
+    """Index query for the tasks due on the UTC day `days` days from today."""
+    return DueRange(_utc_day_start(days), _utc_day_start(days + 1))
 
 def _validate_task_data(task_data: Dict[str, Any], task_index: int) -> Optional[str]:
     """
@@ -689,6 +1022,15 @@ def _validate_task_data(task_data: Dict[str, Any], task_index: int) -> Optional[
         return f"Task {task_index + 1}: Invalid priority {priority}. Must be 0 (None), 1 (Low), 3 (Medium), or 5 (High)"
     
     # Validate dates if provided
+    return _validate_task_dates(task_data, task_index)
+
+def _validate_task_dates(task_data: Dict[str, Any], task_index: int) -> Optional[str]:
+    """
+    Validate the start_date and due_date of a batch item, if provided.
+
+    Returns:
+        None if valid, error message string if invalid
+    """
     for date_field in ['start_date', 'due_date']:
         date_str = task_data.get(date_field)
         if date_str:
@@ -704,19 +1046,403 @@ def _validate_task_data(task_data: Dict[str, Any], task_index: int) -> Optional[
                     datetime.fromisoformat(date_str)
             except ValueError:
                 return f"Task {task_index + 1}: Invalid {date_field} format '{date_str}'. Use ISO format: YYYY-MM-DDTHH:mm:ss or with timezone"
-    
+
     return None
 
-def _get_project_tasks_by_filter(projects: List[Dict], filter_func, filter_name: str, size: int = 50, page: int = 1) -> str:
+def _validate_batch_task_references(tasks: List[Dict[str, Any]], action: str) -> Optional[str]:
+    """
+    Validate the task list of a batch tool that acts on existing tasks.
+
+    Returns:
+        None if valid, error message string if invalid
+    """
+    if not tasks:
+        return f"No tasks provided. Please provide a list of tasks to {action}."
+
+    if not isinstance(tasks, list):
+        return "Tasks must be provided as a list of dictionaries."
+
+    validation_errors = []
+    for i, task_data in enumerate(tasks):
+        if not isinstance(task_data, dict):
+            validation_errors.append(f"Task {i + 1}: Must be a dictionary")
+            continue
+
+        for field in ('task_id', 'project_id'):
+            if not task_data.get(field):
+                validation_errors.append(f"Task {i + 1}: '{field}' is required and cannot be empty")
+
+        priority = task_data.get('priority')
+        if priority is not None and priority not in [0, 1, 3, 5]:
+            validation_errors.append(f"Task {i + 1}: Invalid priority {priority}. Must be 0 (None), 1 (Low), 3 (Medium), or 5 (High)")
+
+        date_error = _validate_task_dates(task_data, i)
+        if date_error:
+            validation_errors.append(date_error)
+
+    if validation_errors:
+        return "Validation errors found:\n" + "\n".join(validation_errors)
+
+    return None
+
+async def _run_batch(items: List[Dict[str, Any]], operation) -> List[FanOutResult]:
+    """
+    Run a batch tool's operation for every item concurrently.
+
+    At most TICKTICK_BATCH_CONCURRENCY operations are in flight. Requests
+    rejected with HTTP 429 or failing transiently are already retried by the
+    client (see retry.RetryPolicy, which honors Retry-After), so failed items
+    are reported as they are instead of being sent again.
+
+    Args:
+        items: Validated task dictionaries
+        operation: Coroutine function called with each item; raises on failure
+
+    Returns:
+        One FanOutResult per item, in input order
+    """
+    return await fan_out(items, operation, get_batch_concurrency())
+
+def _format_batch_results(action: str, verb: str, results: List[FanOutResult]) -> str:
+    """
+    Format the per-task report of a batch tool, ordered by input index.
+
+    Args:
+        action: Noun of the operation (e.g. "creation")
+        verb: Past participle of the operation (e.g. "created")
+        results: Results of _run_batch
+    """
+    succeeded = [(n, outcome) for n, outcome in enumerate(results, 1) if outcome.ok]
+    failed = [(n, outcome) for n, outcome in enumerate(results, 1) if not outcome.ok]
+
+    def describe(task_data: Dict[str, Any], task: Optional[Dict] = None) -> str:
+        title = task_data.get('title') or (task or {}).get('title')
+        return title or task_data.get('task_id', 'Unknown')
+
+    result_message = f"Batch task {action} completed.\n\n"
+    result_message += f"Successfully {verb}: {len(succeeded)} tasks\n"
+    result_message += f"Failed: {len(failed)} tasks\n\n"
+
+    if succeeded:
+        result_message += f"✅ Successfully {verb.capitalize()} Tasks:\n"
+        for task_num, outcome in succeeded:
+            result_message += f"{task_num}. {describe(outcome.item, outcome.value)} (ID: {outcome.value.get('id', 'Unknown')})\n"
+        result_message += "\n"
+
+    if failed:
+        result_message += "❌ Failed Tasks:\n"
+        for task_num, outcome in failed:
+            result_message += f"Task {task_num} ('{describe(outcome.item)}'): {outcome.error}\n"
+
+    return result_message
+
+@traced("get_projects")
+async def _get_projects() -> List[Dict]:
+    """Return the project list, from the sync replica when it is fresh enough."""
+    if sync_engine:
+        projects = sync_engine.projects()
+        if projects is not None:
+            return projects
+    return await ticktick.get_projects()
+
+async def _fetch_projects_data(projects: List[Dict]) -> Tuple[List[Tuple[Dict, Dict]], List[Tuple[Dict, str]], List[Dict]]:
+    """
+    Fetch the data of the given projects concurrently.
+
+    Projects whose data is fresh in the sync replica are served from it.
+    Fetches still running when the tool deadline (TICKTICK_TOOL_DEADLINE)
+    expires are abandoned, so a hung endpoint yields partial results instead
+    of blocking the tool.
+
+    Args:
+        projects: List of project dictionaries
+
+    Returns:
+        Tuple of (fetched, failed, timed_out): `fetched` holds (project, project_data)
+        pairs in the original project order, `failed` holds (project, error) pairs
+        and `timed_out` the projects that could not be fetched in time.
+    """
+    async def fetch(project: Dict) -> Dict:
+        with span("get_project_with_data", project_id=project.get('id')):
+            project_data = await asyncio.wait_for(ticktick.get_project_with_data(project.get('id', 'No ID')),
+                                                  remaining_time())
+        if 'error' in project_data:
+            if project_data.get('timed_out'):
+                raise TimeoutError(project_data['error'])
+            raise RuntimeError(project_data['error'])
+        return project_data
+
+    access_tracker.record(project.get('id') for project in projects)
+
+    # Projects with fresh data in the sync replica need no request
+    replicated = {}
+    if sync_engine:
+        for project in projects:
+            project_data = sync_engine.project_data(project.get('id'))
+            if project_data is not None:
+                replicated[project.get('id')] = project_data
+    outcomes = {}
+    for outcome in await fan_out([project for project in projects if project.get('id') not in replicated], fetch):
+        outcomes[outcome.item.get('id')] = outcome
+
+    fetched = []
+    failed = []
+    timed_out = []
+    for project in projects:
+        if project.get('id') in replicated:
+            fetched.append((project, replicated[project.get('id')]))
+            continue
+        outcome = outcomes[project.get('id')]
+        if outcome.ok:
+            fetched.append((outcome.item, outcome.value))
+        elif outcome.timed_out:
+            logger.warning(f"Timed out fetching project {outcome.item.get('id')}: {outcome.error}")
+            timed_out.append(outcome.item)
+        else:
+            logger.warning(f"Failed to fetch project {outcome.item.get('id')}: {outcome.error}")
+            failed.append((outcome.item, outcome.error))
+
+    if is_snapshot_enabled():
+        _save_snapshot_in_background()
+
+    return fetched, failed, timed_out
+
+async def _fetch_open_projects_data(projects: List[Dict]) -> Tuple[List[Tuple[Dict, Dict]], List[Tuple[Dict, str]], List[Dict]]:
+    """Fetch the data of every open project concurrently (see _fetch_projects_data)."""
+    return await _fetch_projects_data([project for project in projects if not project.get('closed')])
+
+async def _iter_open_projects_data(projects: List[Dict], start: int = 0):
+    """
+    Fetch open projects window by window, starting at position `start`.
+
+    Each window holds TICKTICK_MAX_CONCURRENCY projects fetched concurrently,
+    so a consumer that stops early never fetches the remaining projects.
+
+    Yields:
+        Tuples of (position of the window's first project, fetched, failed, timed_out)
+    """
+    open_projects = [project for project in projects if not project.get('closed')]
+    window = get_max_concurrency()
+    for position in range(start, len(open_projects), window):
+        fetched, failed, timed_out = await _fetch_projects_data(open_projects[position:position + window])
+        yield position, fetched, failed, timed_out
+
+@traced("filter")
+def _match_tasks(fetched: List[Tuple[Dict, Dict]], filter_func, query=None) -> List[Tuple[Dict, Dict]]:
+    """
+    Collect the (project, task) pairs of the fetched projects that match a filter.
+
+    Args:
+        fetched: (project, project_data) pairs
+        filter_func: Function that takes a task and returns True if it matches the filter
+            (unused, and may be None, when `query` is given)
+        query: Optional task index query (e.g. DueRange); when given, matching
+            tasks are looked up in the task index instead of scanning every task
+    """
+    if query is not None:
+        for project, project_data in fetched:
+            task_index.update_project(project.get('id'), project_data)
+        return select_tasks(task_index, query, fetched)
+
+    matches = []
+    for project, project_data in fetched:
+        tasks = project_data.get('tasks', [])
+
+        for task in tasks:
+            if filter_func(task):
+                matches.append((project, task))
+
+    return matches
+
+@traced("format")
+def _format_task_list(tasks: List[Tuple[Dict, Dict]], first_number: int, fields: Optional[List[str]] = None) -> str:
+    """
+    Format (project, task) pairs grouped by project, numbering tasks from `first_number`.
+
+    Ranked search results mix projects, so the tasks of each project are
+    gathered under one header, in the order the projects first appear.
+    """
+    groups: Dict[Any, Tuple[Dict, List[Dict]]] = {}
+    for project, task in tasks:
+        groups.setdefault(project.get('id'), (project, []))[1].append(task)
+
+    parts = []
+    task_counter = first_number
+    for project, project_tasks in groups.values():
+        parts.append(f"Project: {format_project(project)}\n")
+        for task in project_tasks:
+            parts.append(f"Task {task_counter}:\n{format_task(task, fields)}\n")
+            task_counter += 1
+
+    return "".join(parts)
+
+@traced("serialize")
+def _serialize_task_page(tasks: List[Tuple[Dict, Dict]], output_format: str, failed: List[Tuple[Dict, str]],
+                         timed_out: List[Dict], fields: Optional[List[str]] = None, **meta) -> str:
+    """
+    Encode a page of (project, task) pairs for the json/compact output formats.
+
+    Args:
+        tasks: Tasks of the page
+        output_format: "json" or "compact"
+        failed: (project, error) pairs of the projects that could not be fetched
+        timed_out: Projects that could not be fetched before the tool deadline
+        fields: Task fields to include instead of the defaults of the format
+        **meta: Paging information (total, page, cursor, ...) added to the document
+    """
+    payload: Dict[str, Any] = dict(meta)
+    payload["tasks"] = [serialize_task(task, output_format, fields) for _, task in tasks]
+    payload["projects"] = {project.get('id'): project.get('name') for project, _ in tasks}
+    if failed:
+        payload["failed_projects"] = [
+            {"id": project.get('id'), "name": project.get('name'), "error": error} for project, error in failed
+        ]
+    if timed_out:
+        payload["timed_out_projects"] = [{"id": project.get('id'), "name": project.get('name')} for project in timed_out]
+    return _dump_output(payload)
+
+def _format_failed_projects(failed: List[Tuple[Dict, str]], timed_out: Optional[List[Dict]] = None) -> str:
+    """Format the projects that could not be fetched (or not in time) during a cross-project scan."""
+    result = ""
+    if failed:
+        result += f"\n\n⚠️ Could not fetch {len(failed)} project(s), results may be incomplete:\n"
+        for project, error in failed:
+            result += f"- {project.get('name', 'No name')} ({project.get('id', 'No ID')}): {error}\n"
+    if timed_out:
+        result += f"\n\n⏱️ Timed out projects ({len(timed_out)}), results are partial:\n"
+        for project in timed_out:
+            result += f"- {project.get('name', 'No name')} ({project.get('id', 'No ID')})\n"
+    return result
+
+def _encode_cursor(filter_name: str, project_id: str, offset: int, shown: int) -> str:
+    """
+    Build the opaque cursor of a fast page.
+
+    Args:
+        filter_name: Name of the filter the cursor belongs to
+        project_id: Project to resume the scan at
+        offset: Number of matches of that project already returned
+        shown: Number of tasks returned so far (to keep task numbering)
+    """
+    state = {"f": zlib.crc32(filter_name.encode()), "p": project_id, "o": offset, "n": shown}
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str, filter_name: str) -> Optional[Dict[str, Any]]:
+    """Decode a cursor built by _encode_cursor; None if it is invalid or belongs to another filter."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if state["f"] != zlib.crc32(filter_name.encode()):
+            return None
+        return {"project_id": str(state["p"]), "offset": int(state["o"]), "shown": int(state["n"])}
+    except (ValueError, KeyError, TypeError):
+        return None
+
+async def _get_project_tasks_fast_page(projects: List[Dict], filter_func, filter_name: str, size: int, page: int,
+                                       query=None, cursor: Optional[str] = None, output_format: str = "text",
+                                       fields: Optional[List[str]] = None) -> str:
+    """
+    Return one page of filtered tasks, fetching projects only until the page is full.
+
+    Unlike _get_project_tasks_by_filter, no total is computed: the result says
+    whether more tasks may exist and carries a cursor to resume the scan where
+    it stopped. Tasks are listed in project order.
+    """
+    open_projects = [project for project in projects if not project.get('closed')]
+    start_position = 0
+    skip = (page - 1) * size
+    shown_before = skip
+
+    if cursor:
+        state = _decode_cursor(cursor, filter_name)
+        if state is None:
+            return "Invalid cursor. Call the tool again without a cursor to start over."
+        positions = {project.get('id'): position for position, project in enumerate(open_projects)}
+        if state["project_id"] not in positions:
+            return "The cursor refers to a project that is no longer available. Call the tool again without a cursor to start over."
+        start_position = positions[state["project_id"]]
+        skip = state["offset"]
+        shown_before = state["shown"]
+
+    page_tasks = []
+    all_failed = []
+    all_timed_out = []
+    next_cursor = None
+    async for position, fetched, failed, timed_out in _iter_open_projects_data(open_projects, start_position):
+        all_failed.extend(failed)
+        all_timed_out.extend(timed_out)
+        # Keep the window in project order (ranking only applies within a
+        # project) so a cursor can resume at a project boundary
+        order = {project.get('id'): n for n, (project, _) in enumerate(fetched)}
+        matches = sorted(_match_tasks(fetched, filter_func, query), key=lambda match: order[match[0].get('id')])
+
+        # Per-project offsets let the cursor resume inside a project
+        offsets: Dict[str, int] = {}
+        for project, task in matches:
+            project_id = project.get('id')
+            offsets[project_id] = offsets.get(project_id, 0) + 1
+            if skip > 0:
+                skip -= 1
+                continue
+            if len(page_tasks) == size:
+                next_cursor = _encode_cursor(filter_name, project_id, offsets[project_id] - 1, shown_before + size)
+                break
+            page_tasks.append((project, project_task(task, fields)))
+
+        if next_cursor:
+            break
+
+        if len(page_tasks) == size:
+            # Page is full at a window boundary: resume at the next project
+            next_position = position + len(fetched) + len(failed) + len(timed_out)
+            if next_position < len(open_projects):
+                next_project_id = open_projects[next_position].get('id')
+                next_cursor = _encode_cursor(filter_name, next_project_id, 0, shown_before + size)
+            break
+
+    if output_format != "text":
+        return _serialize_task_page(page_tasks, output_format, all_failed, all_timed_out, fields,
+                                    filter=filter_name, first=shown_before + 1, has_more=next_cursor is not None,
+                                    cursor=next_cursor)
+
+    if page_tasks:
+        result = f"Showing tasks {shown_before + 1}-{shown_before + len(page_tasks)} matching '{filter_name}'"
+        result += " (more tasks may be available):\n\n" if next_cursor else " (no more tasks):\n\n"
+    else:
+        result = f"No more tasks matching '{filter_name}'.\n\n"
+
+    result += _format_task_list(page_tasks, shown_before + 1, fields)
+
+    if next_cursor:
+        result += f"\nUse cursor=\"{next_cursor}\" to see the next page."
+
+    if all_failed or all_timed_out:
+        result += _format_failed_projects(all_failed, all_timed_out)
+
+    return result
+
+async def _get_project_tasks_by_filter(projects: List[Dict], filter_func, filter_name: str, size: int = 50, page: int = 1,
+                                       query=None, fast_page: bool = False, cursor: Optional[str] = None,
+                                       output_format: str = "text", fields: Optional[List[str]] = None) -> str:
     """
     Helper function to filter tasks across all projects.
 
+    Project data is fetched concurrently (see TICKTICK_MAX_CONCURRENCY); a project
+    that fails to load is listed at the end instead of aborting the scan.
+
     Args:
         projects: List of project dictionaries
         filter_func: Function that takes a task and returns True if it matches the filter
+            (unused, and may be None, when `query` is given)
         filter_name: Name of the filter for output formatting
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        query: Optional task index query (e.g. DueRange); when given, matching
+            tasks are looked up in the task index instead of scanning every task
+        fast_page: Stop fetching projects once the page is full (see
+            _get_project_tasks_fast_page); implied by `cursor`
+        cursor: Cursor returned by a previous fast page
+        output_format: "text", "json" or "compact" (see OUTPUT_FORMATS)
+        fields: Task fields to include (see TASK_FIELDS); all of them by default
 
     Returns:
         Formatted string of filtered tasks
@@ -726,22 +1452,21 @@ def _get_project_tasks_by_filter(projects: List[Dict], filter_func, filter_name:
         size = 1
 
     if not projects:
-        return "No projects found."
-
-    all_filtered_tasks = []
+        if output_format == "text":
+            return "No projects found."
+        # The same document as a scan that matched nothing
+        if fast_page or cursor:
+            return _serialize_task_page([], output_format, [], [], fields, filter=filter_name,
+                                        first=1, has_more=False, cursor=None)
+        return _serialize_task_page([], output_format, [], [], fields, filter=filter_name, total=0, page=1, pages=1)
 
-    # First pass: collect all matching tasks
-    for project in projects:
-        if project.get('closed'):
-            continue
+    if fast_page or cursor:
+        return await _get_project_tasks_fast_page(projects, filter_func, filter_name, size, page, query, cursor,
+                                                  output_format, fields)
 
-        project_id = project.get('id', 'No ID')
-        project_data = ticktick.get_project_with_data(project_id)
-        tasks = project_data.get('tasks', [])
-
-        for task in tasks:
-            if filter_func(task):
-                all_filtered_tasks.append((project, task))
+    # First pass: fetch every open project and collect all matching tasks
+    fetched, failed, timed_out = await _fetch_open_projects_data(projects)
+    all_filtered_tasks = _match_tasks(fetched, filter_func, query)
 
     total_matched_tasks = len(all_filtered_tasks)
     total_pages = max(1, math.ceil(total_matched_tasks / size)) if total_matched_tasks > 0 else 1
@@ -751,7 +1476,11 @@ def _get_project_tasks_by_filter(projects: List[Dict], filter_func, filter_name:
 
     start = (page - 1) * size
     end = start + size
-    paginated_tasks = all_filtered_tasks[start:end]
+    paginated_tasks = [(project, project_task(task, fields)) for project, task in all_filtered_tasks[start:end]]
+
+    if output_format != "text":
+        return _serialize_task_page(paginated_tasks, output_format, failed, timed_out, fields,
+                                    filter=filter_name, total=total_matched_tasks, page=page, pages=total_pages)
 
     if total_matched_tasks > 0:
         result = f"Found {total_matched_tasks} tasks matching '{filter_name}' (page {page}/{total_pages}, showing {start + 1}-{min(end, total_matched_tasks)}):\n\n"
@@ -759,35 +1488,38 @@ def _get_project_tasks_by_filter(projects: List[Dict], filter_func, filter_name:
         result = f"Found 0 tasks matching '{filter_name}':\n\n"
 
     # Group tasks by project for display
-    current_project = None
-    task_counter = start
-
-    for project, task in paginated_tasks:
-        if project != current_project:
-            current_project = project
-            result += f"Project: {format_project(project)}\n"
-
-        task_counter += 1
-        result += f"Task {task_counter}:\n{format_task(task)}\n"
+    result += _format_task_list(paginated_tasks, start + 1, fields)
 
     if page < total_pages:
         result += f"\nUse page={page + 1} to see next page."
 
+    if failed or timed_out:
+        result += _format_failed_projects(failed, timed_out)
+
     return result
 
 # New MCP Tools for Tasks
 
-@mcp.tool()
-async def get_all_tasks(size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_all_tasks(size: int = 50, page: int = 1, fast_page: bool = False, cursor: Optional[str] = None,
+                        output_format: str = "text", fields: Optional[List[str]] = None) -> str:
     """
     Get all tasks from TickTick. Ignores closed projects.
 
     Args:
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     # Validate parameters
@@ -795,22 +1527,29 @@ async def get_all_tasks(size: int = 50, page: int = 1) -> str:
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
         def all_tasks_filter(task: Dict[str, Any]) -> bool:
             return True  # Include all tasks
 
-        return _get_project_tasks_by_filter(projects, all_tasks_filter, "included", size, page)
+        return await _get_project_tasks_by_filter(projects, all_tasks_filter, "included", size, page,
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in get_all_tasks: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
-async def get_tasks_by_priority(priority_id: int, size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_tasks_by_priority(priority_id: int, size: int = 50, page: int = 1, fast_page: bool = False,
+                                cursor: Optional[str] = None, output_format: str = "text",
+                                fields: Optional[List[str]] = None) -> str:
     """
     Get all tasks from TickTick by priority. Ignores closed projects.
 
@@ -818,9 +1557,17 @@ async def get_tasks_by_priority(priority_id: int, size: int = 50, page: int = 1)
         priority_id: Priority of tasks to retrieve {0: "None", 1: "Low", 3: "Medium", 5: "High"}
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     if priority_id not in PRIORITY_MAP:
@@ -831,32 +1578,45 @@ async def get_tasks_by_priority(priority_id: int, size: int = 50, page: int = 1)
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        def priority_filter(task: Dict[str, Any]) -> bool:
-            return task.get('priority', 0) == priority_id
-
         priority_name = f"{PRIORITY_MAP[priority_id]} ({priority_id})"
-        return _get_project_tasks_by_filter(projects, priority_filter, f"priority '{priority_name}'", size, page)
+        return await _get_project_tasks_by_filter(projects, None, f"priority '{priority_name}'", size, page,
+                                                  query=FieldEquals('priority', priority_id),
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in get_tasks_by_priority: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
-async def get_tasks_due_today(size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_tasks_due_today(size: int = 50, page: int = 1, fast_page: bool = False,
+                              cursor: Optional[str] = None, output_format: str = "text",
+                              fields: Optional[List[str]] = None) -> str:
     """
     Get all tasks from TickTick that are due today. Ignores closed projects.
 
     Args:
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     # Validate parameters
@@ -864,31 +1624,44 @@ async def get_tasks_due_today(size: int = 50, page: int = 1) -> str:
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        def today_filter(task: Dict[str, Any]) -> bool:
-            return _is_task_due_today(task)
-
-        return _get_project_tasks_by_filter(projects, today_filter, "due today", size, page)
+        return await _get_project_tasks_by_filter(projects, None, "due today", size, page,
+                                                  query=_due_in_days_range(0),
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in get_tasks_due_today: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
-async def get_overdue_tasks(size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_overdue_tasks(size: int = 50, page: int = 1, fast_page: bool = False,
+                            cursor: Optional[str] = None, output_format: str = "text",
+                            fields: Optional[List[str]] = None) -> str:
     """
     Get all overdue tasks from TickTick. Ignores closed projects.
 
     Args:
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     # Validate parameters
@@ -896,31 +1669,45 @@ async def get_overdue_tasks(size: int = 50, page: int = 1) -> str:
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        def overdue_filter(task: Dict[str, Any]) -> bool:
-            return _is_task_overdue(task)
-
-        return _get_project_tasks_by_filter(projects, overdue_filter, "overdue", size, page)
+        overdue_query = DueRange(float("-inf"), datetime.now(timezone.utc).timestamp())
+        return await _get_project_tasks_by_filter(projects, None, "overdue", size, page,
+                                                  query=overdue_query,
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in get_overdue_tasks: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
-async def get_tasks_due_tomorrow(size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_tasks_due_tomorrow(size: int = 50, page: int = 1, fast_page: bool = False,
+                                 cursor: Optional[str] = None, output_format: str = "text",
+                                 fields: Optional[List[str]] = None) -> str:
     """
     Get all tasks from TickTick that are due tomorrow. Ignores closed projects.
 
     Args:
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     # Validate parameters
@@ -928,22 +1715,27 @@ async def get_tasks_due_tomorrow(size: int = 50, page: int = 1) -> str:
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        def tomorrow_filter(task: Dict[str, Any]) -> bool:
-            return _is_task_due_in_days(task, 1)
-
-        return _get_project_tasks_by_filter(projects, tomorrow_filter, "due tomorrow", size, page)
+        return await _get_project_tasks_by_filter(projects, None, "due tomorrow", size, page,
+                                                  query=_due_in_days_range(1),
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in get_tasks_due_tomorrow: {e}")
         return f"Error retrieving projects: {str(e)}"
     
-@mcp.tool()
-async def get_tasks_due_in_days(days: int, size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_tasks_due_in_days(days: int, size: int = 50, page: int = 1, fast_page: bool = False,
+                                cursor: Optional[str] = None, output_format: str = "text",
+                                fields: Optional[List[str]] = None) -> str:
     """
     Get all tasks from TickTick that are due in exactly X days. Ignores closed projects.
 
@@ -951,9 +1743,17 @@ async def get_tasks_due_in_days(days: int, size: int = 50, page: int = 1) -> str
         days: Number of days from today (0 = today, 1 = tomorrow, etc.)
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     if days < 0:
@@ -964,32 +1764,45 @@ async def get_tasks_due_in_days(days: int, size: int = 50, page: int = 1) -> str
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        def days_filter(task: Dict[str, Any]) -> bool:
-            return _is_task_due_in_days(task, days)
-
         day_description = "today" if days == 0 else f"in {days} day{'s' if days != 1 else ''}"
-        return _get_project_tasks_by_filter(projects, days_filter, f"due {day_description}", size, page)
+        return await _get_project_tasks_by_filter(projects, None, f"due {day_description}", size, page,
+                                                  query=_due_in_days_range(days),
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in get_tasks_due_in_days: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
-async def get_tasks_due_this_week(size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_tasks_due_this_week(size: int = 50, page: int = 1, fast_page: bool = False,
+                                  cursor: Optional[str] = None, output_format: str = "text",
+                                  fields: Optional[List[str]] = None) -> str:
     """
     Get all tasks from TickTick that are due within the next 7 days. Ignores closed projects.
 
     Args:
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     # Validate parameters
@@ -997,70 +1810,85 @@ async def get_tasks_due_this_week(size: int = 50, page: int = 1) -> str:
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        def week_filter(task: Dict[str, Any]) -> bool:
-            due_date = task.get('dueDate')
-            if not due_date:
-                return False
-
-            try:
-                task_due_date = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S.%f%z").date()
-                today = datetime.now(timezone.utc).date()
-                week_from_today = today + timedelta(days=7)
-                return today <= task_due_date <= week_from_today
-            except (ValueError, TypeError):
-                return False
-
-        return _get_project_tasks_by_filter(projects, week_filter, "due this week", size, page)
+        week_query = DueRange(_utc_day_start(0), _utc_day_start(8))
+        return await _get_project_tasks_by_filter(projects, None, "due this week", size, page,
+                                                  query=week_query,
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in get_tasks_due_this_week: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
-async def search_tasks(search_term: str, size: int = 50, page: int = 1) -> str:
+@tool()
+async def search_tasks(search_term: str, size: int = 50, page: int = 1, fast_page: bool = False,
+                       cursor: Optional[str] = None, output_format: str = "text",
+                       fields: Optional[List[str]] = None) -> str:
     """
     Search for tasks in TickTick by title, content, or subtask titles. Ignores closed projects.
+    Every word of the search term must match the start of a word in the task;
+    results are ranked by relevance (title matches first).
 
     Args:
         search_term: Text to search for (case-insensitive)
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     if not search_term.strip():
         return "Search term cannot be empty."
+    terms = tokenize(search_term)
+    if not terms:
+        return "Search term must contain letters or digits."
 
     # Validate parameters
     if size < 1:
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        def search_filter(task: Dict[str, Any]) -> bool:
-            return _task_matches_search(task, search_term)
-
-        return _get_project_tasks_by_filter(projects, search_filter, f"matching '{search_term}'", size, page)
+        # Look the terms up in the inverted index (token prefixes only, so the
+        # cost does not grow with the number of tasks)
+        return await _get_project_tasks_by_filter(projects, None, f"matching '{search_term}'", size, page,
+                                                  query=TextSearch(terms),
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in search_tasks: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def batch_create_tasks(tasks: List[Dict[str, Any]]) -> str:
     """
-    Create multiple tasks in TickTick at once
+    Create multiple tasks in TickTick at once. Tasks are created concurrently and
+    the report follows the order of the input list.
     
     Args:
         tasks: List of task dictionaries. Each task must contain:
@@ -1078,7 +1906,7 @@ async def batch_create_tasks(tasks: List[Dict[str, Any]]) -> str:
         ]
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     if not tasks:
@@ -1101,65 +1929,151 @@ async def batch_create_tasks(tasks: List[Dict[str, Any]]) -> str:
     if validation_errors:
         return "Validation errors found:\n" + "\n".join(validation_errors)
     
-    # Create tasks one by one and collect results
-    created_tasks = []
-    failed_tasks = []
-    
+    async def create(task_data: Dict[str, Any]) -> Dict:
+        task = await ticktick.create_task(
+            title=task_data['title'],
+            project_id=task_data['project_id'],
+            content=task_data.get('content'),
+            start_date=task_data.get('start_date'),
+            due_date=task_data.get('due_date'),
+            priority=task_data.get('priority', 0)
+        )
+        if 'error' in task:
+            raise RuntimeError(task['error'])
+        task_index.upsert_task(task)
+        return task
+
     try:
-        for i, task_data in enumerate(tasks):
-            try:
-                # Extract task parameters with defaults
-                title = task_data['title']
-                project_id = task_data['project_id']
-                content = task_data.get('content')
-                start_date = task_data.get('start_date')
-                due_date = task_data.get('due_date')
-                priority = task_data.get('priority', 0)
-                
-                # Create the task
-                result = ticktick.create_task(
-                    title=title,
-                    project_id=project_id,
-                    content=content,
-                    start_date=start_date,
-                    due_date=due_date,
-                    priority=priority
-                )
-                
-                if 'error' in result:
-                    failed_tasks.append(f"Task {i + 1} ('{title}'): {result['error']}")
-                else:
-                    created_tasks.append((i + 1, title, result))
-                    
-            except Exception as e:
-                failed_tasks.append(f"Task {i + 1} ('{task_data.get('title', 'Unknown')}'): {str(e)}")
-        
-        # Format the results
-        result_message = f"Batch task creation completed.\n\n"
-        result_message += f"Successfully created: {len(created_tasks)} tasks\n"
-        result_message += f"Failed: {len(failed_tasks)} tasks\n\n"
-        
-        if created_tasks:
-            result_message += "✅ Successfully Created Tasks:\n"
-            for task_num, title, task_obj in created_tasks:
-                result_message += f"{task_num}. {title} (ID: {task_obj.get('id', 'Unknown')})\n"
-            result_message += "\n"
-        
-        if failed_tasks:
-            result_message += "❌ Failed Tasks:\n"
-            for error in failed_tasks:
-                result_message += f"{error}\n"
-        
-        return result_message
-        
+        results = await _run_batch(tasks, create)
+        return _format_batch_results("creation", "created", results)
+
     except Exception as e:
         logger.error(f"Error in batch_create_tasks: {e}")
         return f"Error during batch task creation: {str(e)}"
 
+@tool()
+async def batch_update_tasks(tasks: List[Dict[str, Any]]) -> str:
+    """
+    Update multiple tasks in TickTick at once
+
+    Args:
+        tasks: List of task dictionaries. Each task must contain:
+            - task_id (required): ID of the task to update
+            - project_id (required): ID of the project the task belongs to
+            - title, content, start_date, due_date, priority (optional): New values,
+              as for update_task
+
+    Example:
+        tasks = [
+            {"task_id": "abc", "project_id": "1234ABC", "priority": 5},
+            {"task_id": "def", "project_id": "1234XYZ", "due_date": "2025-07-19T10:00:00"}
+        ]
+    """
+    if not ticktick:
+        if not await initialize_client():
+            return get_auth_error_message()
+
+    error = _validate_batch_task_references(tasks, "update")
+    if error:
+        return error
+
+    async def update(task_data: Dict[str, Any]) -> Dict:
+        task = await ticktick.update_task(
+            task_id=task_data['task_id'],
+            project_id=task_data['project_id'],
+            title=task_data.get('title'),
+            content=task_data.get('content'),
+            start_date=task_data.get('start_date'),
+            due_date=task_data.get('due_date'),
+            priority=task_data.get('priority')
+        )
+        if 'error' in task:
+            raise RuntimeError(task['error'])
+        task_index.upsert_task(task)
+        return task
+
+    try:
+        results = await _run_batch(tasks, update)
+        return _format_batch_results("update", "updated", results)
+
+    except Exception as e:
+        logger.error(f"Error in batch_update_tasks: {e}")
+        return f"Error during batch task update: {str(e)}"
+
+@tool()
+async def batch_complete_tasks(tasks: List[Dict[str, Any]]) -> str:
+    """
+    Mark multiple tasks as complete at once
+
+    Args:
+        tasks: List of dictionaries with the task_id and project_id of each task
+
+    Example:
+        tasks = [{"task_id": "abc", "project_id": "1234ABC"}, {"task_id": "def", "project_id": "1234XYZ"}]
+    """
+    if not ticktick:
+        if not await initialize_client():
+            return get_auth_error_message()
+
+    error = _validate_batch_task_references(tasks, "complete")
+    if error:
+        return error
+
+    async def complete(task_data: Dict[str, Any]) -> Dict:
+        result = await ticktick.complete_task(task_data['project_id'], task_data['task_id'])
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+        task_index.remove_task(task_data['project_id'], task_data['task_id'])
+        return {'id': task_data['task_id']}
+
+    try:
+        results = await _run_batch(tasks, complete)
+        return _format_batch_results("completion", "completed", results)
+
+    except Exception as e:
+        logger.error(f"Error in batch_complete_tasks: {e}")
+        return f"Error during batch task completion: {str(e)}"
+
+@tool()
+async def batch_delete_tasks(tasks: List[Dict[str, Any]]) -> str:
+    """
+    Delete multiple tasks at once
+
+    Args:
+        tasks: List of dictionaries with the task_id and project_id of each task
+
+    Example:
+        tasks = [{"task_id": "abc", "project_id": "1234ABC"}, {"task_id": "def", "project_id": "1234XYZ"}]
+    """
+    if not ticktick:
+        if not await initialize_client():
+            return get_auth_error_message()
+
+    error = _validate_batch_task_references(tasks, "delete")
+    if error:
+        return error
+
+    async def delete(task_data: Dict[str, Any]) -> Dict:
+        result = await ticktick.delete_task(task_data['project_id'], task_data['task_id'])
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+        task_index.remove_task(task_data['project_id'], task_data['task_id'])
+        return {'id': task_data['task_id']}
+
+    try:
+        results = await _run_batch(tasks, delete)
+        return _format_batch_results("deletion", "deleted", results)
+
+    except Exception as e:
+        logger.error(f"Error in batch_delete_tasks: {e}")
+        return f"Error during batch task deletion: {str(e)}"
+
 # New MCP Tools for Getting things done framework (Priority / Due Dates)
 
-@mcp.tool()
-async def get_engaged_tasks(size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_engaged_tasks(size: int = 50, page: int = 1, fast_page: bool = False,
+                            cursor: Optional[str] = None, output_format: str = "text",
+                            fields: Optional[List[str]] = None) -> str:
     """
     Get all tasks from TickTick that are "Engaged".
     This includes tasks marked as high priority (5), due today or overdue.
@@ -1167,9 +2081,17 @@ async def get_engaged_tasks(size: int = 50, page: int = 1) -> str:
     Args:
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     # Validate parameters
@@ -1177,25 +2099,32 @@ async def get_engaged_tasks(size: int = 50, page: int = 1) -> str:
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        def engaged_filter(task: Dict[str, Any]) -> bool:
-            is_high_priority = task.get('priority', 0) == 5
-            is_overdue = _is_task_overdue(task)
-            is_today = _is_task_due_today(task)
-            return is_high_priority or is_overdue or is_today
-
-        return _get_project_tasks_by_filter(projects, engaged_filter, "engaged", size, page)
+        # High priority OR overdue OR due today
+        engaged_query = Or(
+            FieldEquals('priority', 5),
+            DueRange(float("-inf"), datetime.now(timezone.utc).timestamp()),
+            _due_in_days_range(0),
+        )
+        return await _get_project_tasks_by_filter(projects, None, "engaged", size, page,
+                                                  query=engaged_query,
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in get_engaged_tasks: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
-async def get_next_tasks(size: int = 50, page: int = 1) -> str:
+@tool()
+async def get_next_tasks(size: int = 50, page: int = 1, fast_page: bool = False, cursor: Optional[str] = None,
+                         output_format: str = "text", fields: Optional[List[str]] = None) -> str:
     """
     Get all tasks from TickTick that are "Next".
     This includes tasks marked as medium priority (3) or due tomorrow.
@@ -1203,9 +2132,17 @@ async def get_next_tasks(size: int = 50, page: int = 1) -> str:
     Args:
         size: Maximum number of tasks to return per page (default: 50)
         page: Page number starting from 1 (default: 1)
+        fast_page: Stop scanning projects once the page is full; faster on large
+            accounts but reports no total (default: False)
+        cursor: Cursor from a previous fast page to continue where it stopped
+        output_format: "text" (default), "json", or "compact" (JSON with only the
+            essential fields, smallest output)
+        fields: Only include these task fields, e.g. ["id", "title", "dueDate"]
+            (valid: id, projectId, title, content, startDate, dueDate, isAllDay,
+            priority, status, tags, items)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
 
     # Validate parameters
@@ -1213,23 +2150,26 @@ async def get_next_tasks(size: int = 50, page: int = 1) -> str:
         return "Size must be at least 1."
     if page < 1:
         return "Page must be at least 1."
+    format_error = _check_output_format(output_format) or _check_fields(fields)
+    if format_error:
+        return format_error
     try:
-        projects = ticktick.get_projects()
+        projects = await _get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
 
-        def next_filter(task: Dict[str, Any]) -> bool:
-            is_medium_priority = task.get('priority', 0) == 3
-            is_due_tomorrow = _is_task_due_in_days(task, 1)
-            return is_medium_priority or is_due_tomorrow
-
-        return _get_project_tasks_by_filter(projects, next_filter, "next", size, page)
+        # Medium priority OR due tomorrow
+        next_query = Or(FieldEquals('priority', 3), _due_in_days_range(1))
+        return await _get_project_tasks_by_filter(projects, None, "next", size, page,
+                                                  query=next_query,
+                                                  fast_page=fast_page, cursor=cursor, output_format=output_format,
+                                                  fields=fields)
 
     except Exception as e:
         logger.error(f"Error in get_next_tasks: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
+@tool()
 async def create_subtask(
     subtask_title: str,
     parent_task_id: str,
@@ -1248,7 +2188,7 @@ async def create_subtask(
         priority: Priority level (0: None, 1: Low, 3: Medium, 5: High) (optional)
     """
     if not ticktick:
-        if not initialize_client():
+        if not await initialize_client():
             return get_auth_error_message()
     
     # Validate priority
@@ -1256,7 +2196,7 @@ async def create_subtask(
         return "Invalid priority. Must be 0 (None), 1 (Low), 3 (Medium), or 5 (High)."
     
     try:
-        subtask = ticktick.create_subtask(
+        subtask = await ticktick.create_subtask(
             subtask_title=subtask_title,
             parent_task_id=parent_task_id,
             project_id=project_id,
@@ -1266,18 +2206,51 @@ async def create_subtask(
         
         if 'error' in subtask:
             return f"Error creating subtask: {subtask['error']}"
-        
+
+        task_index.upsert_task(subtask)
         return f"Subtask created successfully:\n\n" + format_task(subtask)
     except Exception as e:
         logger.error(f"Error in create_subtask: {e}")
         return f"Error creating subtask: {str(e)}"
 
-def main():
-    """Main entry point for the MCP server."""
-    # Try to initialize the TickTick client, but start the server regardless.
+# MCP Tools — Diagnostics
+
+@tool()
+async def get_server_stats() -> str:
+    """
+    Get performance statistics of this server as JSON: latency and API requests
+    per tool, requests, latency, errors, retries and bytes per API endpoint, and
+    the cache, connection pool, rate limiter, request coalescing and sync counters.
+    """
+    stats: Dict[str, Any] = get_metrics().snapshot()
+    stats["indexed_tasks"] = len(task_index)
+    if ticktick:
+        stats["cache"] = ticktick.get_cache_stats()
+        stats["pool"] = ticktick.get_pool_stats()
+        stats["rate_limit"] = ticktick.get_rate_limit_stats()
+        stats["coalescing"] = ticktick.get_coalescing_stats()
+        stats["retries"] = ticktick.retry_policy.retries
+    if sync_engine:
+        stats["sync"] = sync_engine.stats()
+    return json.dumps(stats, indent=2)
+
+def main(started: Optional[float] = None):
+    """
+    Main entry point for the MCP server.
+
+    Args:
+        started: time.perf_counter() when the process started handling the
+            command (set by the CLI), to include the imports in the startup report
+    """
+    _startup_marks["start"] = started if started is not None else time.perf_counter()
+    _startup_marks["imports"] = time.perf_counter()
+
+    # Try to create the TickTick client, but start the server regardless.
     # If auth fails, individual tools will return helpful error messages.
-    if not initialize_client():
+    # The API connectivity check runs in the background once the server is up.
+    if not create_client():
         logger.warning("TickTick client not initialized. Tools will prompt for authentication.")
+    _startup_marks["client"] = time.perf_counter()
 
     # Run the server
     mcp.run(transport='stdio')
@@ -0,0 +1,145 @@
+"""
+Optional on-disk snapshot of the project list and project data.
+
+When TICKTICK_SNAPSHOT is enabled, the cached /project and /project/{id}/data
+responses are written to ~/.ticktick/snapshot.json (next to config.json) and
+loaded back into the response cache at startup. The loaded entries are
+served stale-while-revalidate: reads return them immediately while the
+client refreshes them in the background.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from .auth import TickTickAuth
+from .cache import ResponseCache
+from .models import decode_response, to_json
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_KINDS = ("projects", "project_data")
+# Snapshots older than this are ignored at startup (seconds)
+SNAPSHOT_MAX_AGE = 7 * 24 * 3600
+# Minimum delay between two throttled saves (seconds)
+SNAPSHOT_SAVE_INTERVAL = 30.0
+
+_last_saved: Optional[float] = None
+
+
+def is_snapshot_enabled() -> bool:
+    """Check whether TICKTICK_SNAPSHOT enables the on-disk snapshot."""
+    return os.getenv("TICKTICK_SNAPSHOT", "").lower() in ("1", "true", "yes", "on")
+
+
+def is_save_due() -> bool:
+    """Check whether a throttled save would write the snapshot (see save_snapshot)."""
+    return _last_saved is None or time.monotonic() - _last_saved >= SNAPSHOT_SAVE_INTERVAL
+
+
+def get_snapshot_path() -> Path:
+    """Get the path of the snapshot file, next to ~/.ticktick/config.json."""
+    return TickTickAuth.get_config_path().parent / "snapshot.json"
+
+
+def load_snapshot(cache: ResponseCache, base_url: str) -> int:
+    """
+    Seed the cache with the entries of the on-disk snapshot.
+
+    Args:
+        cache: Response cache to seed
+        base_url: API base URL of the client; snapshots of another API are ignored
+
+    Returns:
+        Number of entries seeded
+    """
+    path = get_snapshot_path()
+    if not path.exists():
+        return 0
+
+    try:
+        with open(path, 'rb') as f:
+            snapshot = json.loads(f.read())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return 0
+
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("base_url") != base_url:
+        return 0
+    if time.time() - snapshot.get("saved_at", 0) > SNAPSHOT_MAX_AGE:
+        logger.info("Snapshot is too old, ignoring it")
+        return 0
+
+    seeded = 0
+    for endpoint, (value, size) in snapshot.get("entries", {}).items():
+        if cache.seed(endpoint, decode_response(endpoint, value), size):
+            seeded += 1
+
+    logger.info(f"Loaded {seeded} entries from snapshot {path}")
+    return seeded
+
+
+def save_snapshot(cache: ResponseCache, base_url: str, throttle: bool = False) -> bool:
+    """
+    Write the cached project list and project data to the snapshot file.
+
+    The file is written to a temporary file first and then renamed, so a
+    crash never leaves a truncated snapshot behind.
+
+    Args:
+        cache: Response cache to export
+        base_url: API base URL of the client
+        throttle: Skip the save if the last one happened less than
+            SNAPSHOT_SAVE_INTERVAL seconds ago
+
+    Returns:
+        True if the snapshot was written
+    """
+    global _last_saved
+
+    if throttle and not is_save_due():
+        return False
+    now = time.monotonic()
+
+    entries = cache.export(SNAPSHOT_KINDS)
+    if not entries:
+        return False
+
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "base_url": base_url,
+        "saved_at": time.time(),
+        "entries": entries,
+    }
+    path = get_snapshot_path()
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".snapshot-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f, separators=(',', ':'), default=to_json)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Failed to save snapshot {path}: {e}")
+        return False
+
+    _last_saved = now
+    logger.debug(f"Saved {len(entries)} entries to snapshot {path}")
+    return True
+
+
+def delete_snapshot() -> None:
+    """Remove the snapshot file (e.g. after switching accounts)."""
+    try:
+        get_snapshot_path().unlink()
+    except FileNotFoundError:
+        pass
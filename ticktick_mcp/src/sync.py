@@ -0,0 +1,216 @@
+"""
+Background sync of a local replica of the user's projects and tasks.
+
+The Open API has no delta endpoint, so every read tool used to refetch the
+full payload of every project. When TICKTICK_SYNC_INTERVAL is set, a
+SyncEngine refreshes a replica of the project list and project data in the
+background instead:
+
+- each synced project gets a fingerprint (from the tasks' etag/modifiedTime
+  when every task has one, otherwise a hash of the whole payload), and only
+  projects whose fingerprint changed are re-indexed in the TaskIndex;
+- projects that were deleted or closed are dropped from the replica and
+  the index;
+- read tools are served from the replica while it is younger than
+  TICKTICK_SYNC_MAX_STALENESS, so staleness is bounded;
+- writes made through the client mark the affected project dirty, so it is
+  fetched from the API until the next sync picks the change up.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .fanout import fan_out
+from .models import to_json
+from .task_index import TaskIndex
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _get_env_seconds(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        logger.warning(f"Invalid {name} '{value}', using {default}")
+        return default
+
+
+def get_sync_interval() -> float:
+    """Return the background sync period from TICKTICK_SYNC_INTERVAL in seconds (default: 0, disabled)."""
+    return _get_env_seconds("TICKTICK_SYNC_INTERVAL", 0.0)
+
+
+def get_max_staleness(interval: float) -> float:
+    """Return how old replica data may be when served, from TICKTICK_SYNC_MAX_STALENESS (default: twice the interval)."""
+    return _get_env_seconds("TICKTICK_SYNC_MAX_STALENESS", 2 * interval)
+
+
+def project_fingerprint(project_data: Dict[str, Any]) -> str:
+    """
+    Return a fingerprint that changes whenever the content of a project changes.
+
+    Uses the modification markers of the tasks (etag, modifiedTime) when every
+    task has one, which avoids hashing every title and description; otherwise
+    hashes the whole payload.
+    """
+    tasks = project_data.get('tasks', [])
+    if tasks and all(task.get('etag') or task.get('modifiedTime') for task in tasks):
+        payload = {
+            "project": project_data.get('project'),
+            "columns": project_data.get('columns'),
+            "tasks": sorted((task.get('id', ''), task.get('etag') or task.get('modifiedTime')) for task in tasks),
+        }
+    else:
+        payload = project_data
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=to_json).encode()
+    return hashlib.sha1(encoded).hexdigest()
+
+
+class SyncEngine:
+    """Keeps a replica of the project list and project data fresh in the background."""
+
+    def __init__(self, client, index: TaskIndex, interval: float, max_staleness: Optional[float] = None):
+        """
+        Args:
+            client: AsyncTickTickClient used to fetch the data
+            index: Task index kept in sync with the replica
+            interval: Seconds between two syncs
+            max_staleness: Oldest replica data served to read tools (default: see get_max_staleness)
+        """
+        self.client = client
+        self.index = index
+        self.interval = interval
+        self.max_staleness = get_max_staleness(interval) if max_staleness is None else max_staleness
+
+        self._projects: Optional[List[Dict]] = None
+        self._projects_fetched_at = float("-inf")
+        self._project_data: Dict[str, Dict] = {}
+        self._fingerprints: Dict[str, str] = {}
+        # time.monotonic() at which each project's replica data was requested
+        self._fetched_at: Dict[str, float] = {}
+
+        # Writes since the last sync (time.monotonic() of the write)
+        self._dirty_at: Dict[str, float] = {}
+        self._all_dirty_at = float("-inf")
+        self._list_dirty_at = float("-inf")
+
+        self.syncs = 0
+        self.changed = 0
+        self.removed = 0
+        self.served = 0
+
+        client.write_listeners.append(self.mark_dirty)
+
+    def mark_dirty(self, project_id: Optional[str], project_list_changed: bool = False) -> None:
+        """Stop serving replica data made stale by a write (see TickTickClient.write_listeners)."""
+        now = time.monotonic()
+        if project_id:
+            self._dirty_at[project_id] = now
+        elif not project_list_changed:
+            self._all_dirty_at = now
+        if project_list_changed:
+            self._list_dirty_at = now
+
+    def projects(self) -> Optional[List[Dict]]:
+        """Return the replicated project list, or None if it is missing, too old or dirty."""
+        if self._projects is None or not self._is_fresh(self._projects_fetched_at, self._list_dirty_at):
+            return None
+        self.served += 1
+        return self._projects
+
+    def project_data(self, project_id: str) -> Optional[Dict]:
+        """Return the replicated data of a project, or None if it is missing, too old or dirty."""
+        data = self._project_data.get(project_id)
+        if data is None:
+            return None
+        dirty_at = max(self._dirty_at.get(project_id, float("-inf")), self._all_dirty_at)
+        if not self._is_fresh(self._fetched_at[project_id], dirty_at):
+            return None
+        self.served += 1
+        return data
+
+    def _is_fresh(self, fetched_at: float, dirty_at: float) -> bool:
+        return fetched_at > dirty_at and time.monotonic() - fetched_at <= self.max_staleness
+
+    async def sync_once(self) -> Dict[str, int]:
+        """
+        Refresh the replica and apply the changed projects to the task index.
+
+        Returns:
+            Counts of the projects synced, changed and removed by this sync
+        """
+        started = time.monotonic()
+        projects = await self.client.refresh("/project")
+        if isinstance(projects, dict) and 'error' in projects:
+            logger.warning(f"Sync failed to fetch projects: {projects['error']}")
+            return {"synced": 0, "changed": 0, "removed": 0}
+
+        open_projects = [project for project in projects if not project.get('closed')]
+        results = await fan_out(open_projects, lambda project: self._fetch_project(project.get('id')))
+
+        changed = 0
+        for outcome in results:
+            if not outcome.ok:
+                # Keep the previous data; it stops being served once too old
+                logger.warning(f"Sync failed to fetch project {outcome.item.get('id')}: {outcome.error}")
+                continue
+            project_id = outcome.item.get('id')
+            fingerprint = project_fingerprint(outcome.value)
+            if fingerprint != self._fingerprints.get(project_id):
+                self._fingerprints[project_id] = fingerprint
+                self._project_data[project_id] = outcome.value
+                self.index.update_project(project_id, outcome.value)
+                changed += 1
+            self._fetched_at[project_id] = started
+
+        open_ids = {project.get('id') for project in open_projects}
+        removed = [project_id for project_id in self._project_data if project_id not in open_ids]
+        for project_id in removed:
+            del self._project_data[project_id]
+            del self._fingerprints[project_id]
+            del self._fetched_at[project_id]
+            self.index.remove_project(project_id)
+
+        self._projects = projects
+        self._projects_fetched_at = started
+        self.syncs += 1
+        self.changed += changed
+        self.removed += len(removed)
+        logger.debug(f"Synced {len(open_projects)} projects: {changed} changed, {len(removed)} removed")
+        return {"synced": len(open_projects), "changed": changed, "removed": len(removed)}
+
+    async def _fetch_project(self, project_id: str) -> Dict:
+        project_data = await self.client.refresh(f"/project/{project_id}/data")
+        if 'error' in project_data:
+            raise RuntimeError(project_data['error'])
+        return project_data
+
+    async def run(self) -> None:
+        """Sync every `interval` seconds until cancelled."""
+        while True:
+            try:
+                await self.sync_once()
+            except Exception as e:
+                logger.error(f"Background sync failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the sync counters and the age of the replica."""
+        age = time.monotonic() - self._projects_fetched_at if self._projects is not None else None
+        return {
+            "syncs": self.syncs,
+            "projects": len(self._project_data),
+            "changed": self.changed,
+            "removed": self.removed,
+            "served": self.served,
+            "age": round(age, 3) if age is not None else None,
+        }
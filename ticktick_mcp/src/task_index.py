@@ -0,0 +1,422 @@
+"""
+In-process index of the tasks seen by the cross-project tools.
+
+Every task's dueDate is parsed once and the tasks are kept sorted by due
+timestamp, so the date-filter tools answer with a bisect range lookup
+instead of re-parsing every dueDate on every call. Titles, content and
+subtask titles are tokenized into an inverted index for search_tasks, and
+priority and status have posting lists of their own. Index queries (DueRange,
+TextSearch, FieldEquals) can be combined with And/Or, which intersect or
+merge posting lists instead of evaluating predicates on every task.
+
+The index is fed with the project data fetched by the server. A project is
+only re-indexed when its data object changes (the response cache hands out
+the same object until it expires or a write invalidates it), and parsed due
+dates are reused for tasks whose dueDate did not change (tasks decoded by
+the client into models.Task carry their parsed due date already).
+"""
+
+import bisect
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import Subtask, Task, parse_due_timestamp
+
+# (project_id, task_id)
+TaskKey = Tuple[str, str]
+
+# Bound on the memo of parsed dueDate strings
+MAX_PARSED_DUE_DATES = 100_000
+
+# Task fields with a secondary index, and the value assumed when missing
+INDEXED_FIELDS = {"priority": 0, "status": 0}
+
+# Relevance weight of a token per field it appears in
+TEXT_FIELD_WEIGHTS = {"title": 3, "items": 2, "content": 1}
+
+# CJK characters are indexed one by one since they are not separated by spaces
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_TOKEN_RE = re.compile(f"[{_CJK}]|[^\\W_{_CJK}]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase search tokens."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _field_values(task: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """Return the (field, value) pairs of a task for INDEXED_FIELDS, with the defaults for missing values."""
+    if isinstance(task, Task):
+        priority, status = task.priority, task.status
+    else:
+        priority, status = task.get('priority'), task.get('status')
+    return [("priority", INDEXED_FIELDS["priority"] if priority is None else priority),
+            ("status", INDEXED_FIELDS["status"] if status is None else status)]
+
+
+class IndexedTask:
+    """A task of the index with its pre-parsed due timestamp."""
+
+    __slots__ = ("key", "position", "task", "due_ts")
+
+    def __init__(self, key: TaskKey, position: int, task: Dict[str, Any], due_ts: Optional[float]):
+        self.key = key
+        self.position = position
+        self.task = task
+        self.due_ts = due_ts
+
+
+class _IndexedProject:
+    __slots__ = ("source", "tasks")
+
+    def __init__(self, source: Any):
+        self.source = source
+        self.tasks: Dict[str, IndexedTask] = {}
+
+
+class TaskIndex:
+    """Tasks of all indexed projects, sorted by due timestamp."""
+
+    def __init__(self):
+        self._projects: Dict[str, _IndexedProject] = {}
+        self._tasks: Dict[TaskKey, IndexedTask] = {}
+        # dueDate string -> parsed timestamp, so unchanged due dates are never re-parsed
+        self._parsed_due: Dict[str, Optional[float]] = {}
+        # Sorted (due_ts, key) pairs, rebuilt lazily after changes
+        self._due: List[Tuple[float, TaskKey]] = []
+        self._due_dirty = False
+        # Inverted index: token -> task keys, and task key -> {token: weight}
+        self._postings: Dict[str, Set[TaskKey]] = {}
+        self._task_tokens: Dict[TaskKey, Dict[str, int]] = {}
+        # Sorted vocabulary for prefix lookups, rebuilt lazily after changes
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        # Secondary indexes: field -> value -> task keys
+        self._fields: Dict[str, Dict[Any, Set[TaskKey]]] = {field: {} for field in INDEXED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get(self, key: TaskKey) -> Optional[IndexedTask]:
+        """Return the indexed task for a key, if any."""
+        return self._tasks.get(key)
+
+    def update_project(self, project_id: str, project_data: Dict[str, Any]) -> bool:
+        """
+        Index the tasks of a project's data (as returned by get_project_with_data).
+
+        Returns:
+            True if the project was re-indexed, False if this data object was
+            already indexed
+        """
+        entry = self._projects.get(project_id)
+        if entry is not None and entry.source is project_data:
+            return False
+
+        self._drop_project_tasks(project_id)
+        entry = _IndexedProject(project_data)
+        self._projects[project_id] = entry
+        for position, task in enumerate(project_data.get('tasks', [])):
+            self._add_task(entry, project_id, position, task)
+        self._due_dirty = True
+        return True
+
+    def upsert_task(self, task: Dict[str, Any]) -> None:
+        """Add or replace a single task (e.g. after create_task/update_task succeeded)."""
+        project_id = task.get('projectId')
+        task_id = task.get('id')
+        if not project_id or not task_id:
+            return
+        entry = self._projects.get(project_id)
+        if entry is None:
+            # Unknown project: it is indexed in full the next time it is fetched
+            return
+        existing = entry.tasks.get(task_id)
+        position = existing.position if existing else len(entry.tasks)
+        self._add_task(entry, project_id, position, task)
+        self._due_dirty = True
+
+    def remove_task(self, project_id: str, task_id: str) -> None:
+        """Remove a single task (e.g. after complete_task/delete_task succeeded)."""
+        entry = self._projects.get(project_id)
+        if entry is not None and entry.tasks.pop(task_id, None) is not None:
+            self._unindex_secondary((project_id, task_id))
+            del self._tasks[(project_id, task_id)]
+            self._due_dirty = True
+
+    def remove_project(self, project_id: str) -> None:
+        """Remove a project and all of its tasks."""
+        self._drop_project_tasks(project_id)
+        self._projects.pop(project_id, None)
+
+    def due_between(self, start: float, end: float) -> List[TaskKey]:
+        """Return the keys of the tasks due in [start, end), by due timestamp."""
+        due = self._sorted_due()
+        lo = bisect.bisect_left(due, (start,))
+        hi = bisect.bisect_left(due, (end,))
+        return [key for _, key in due[lo:hi]]
+
+    def count_due_between(self, start: float, end: float) -> int:
+        """Return the number of tasks due in [start, end)."""
+        due = self._sorted_due()
+        return bisect.bisect_left(due, (end,)) - bisect.bisect_left(due, (start,))
+
+    def with_field(self, field: str, value: Any) -> Set[TaskKey]:
+        """Return the keys of the tasks whose indexed `field` equals `value` (do not modify)."""
+        return self._fields[field].get(value, set())
+
+    def search(self, terms: List[str]) -> Dict[TaskKey, float]:
+        """
+        Find the tasks matching every term, by token prefix.
+
+        Args:
+            terms: Tokens as returned by tokenize()
+
+        Returns:
+            {task key: relevance score}; exact token matches score twice as
+            much as prefix matches and titles weigh more than subtasks and content
+        """
+        results: Optional[Dict[TaskKey, float]] = None
+        for term in terms:
+            scores: Dict[TaskKey, float] = {}
+            for token in self._tokens_with_prefix(term):
+                boost = 2 if token == term else 1
+                for key in self._postings[token]:
+                    if results is None or key in results:
+                        scores[key] = scores.get(key, 0) + self._task_tokens[key][token] * boost
+            if results is not None:
+                scores = {key: results[key] + score for key, score in scores.items()}
+            results = scores
+            if not results:
+                break
+        return results or {}
+
+    def _tokens_with_prefix(self, prefix: str) -> List[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        vocabulary = self._vocabulary
+        tokens = []
+        for i in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[i].startswith(prefix):
+                break
+            tokens.append(vocabulary[i])
+        return tokens
+
+    def _index_secondary(self, key: TaskKey, task: Dict[str, Any]) -> None:
+        for field, value in _field_values(task):
+            self._fields[field].setdefault(value, set()).add(key)
+        self._index_text(key, task)
+
+    def _unindex_secondary(self, key: TaskKey) -> None:
+        for field, value in _field_values(self._tasks[key].task):
+            values = self._fields[field]
+            postings = values.get(value)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del values[value]
+        self._unindex_text(key)
+
+    def _index_text(self, key: TaskKey, task: Dict[str, Any]) -> None:
+        weights: Dict[str, int] = {}
+        if isinstance(task, Task):
+            title, content, items = task.title, task.content, task.subtasks
+        else:
+            title, content, items = task.get('title'), task.get('content'), task.get('items')
+        fields = [
+            ("title", [title]),
+            ("content", [content]),
+            ("items", [item.title if isinstance(item, Subtask) else item.get('title') for item in items or []]),
+        ]
+        for field, texts in fields:
+            weight = TEXT_FIELD_WEIGHTS[field]
+            for text in texts:
+                for token in tokenize(text):
+                    weights[token] = weights.get(token, 0) + weight
+        self._task_tokens[key] = weights
+        for token in weights:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._vocabulary_dirty = True
+            postings.add(key)
+
+    def _unindex_text(self, key: TaskKey) -> None:
+        for token in self._task_tokens.pop(key, {}):
+            postings = self._postings[token]
+            postings.discard(key)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+    def _add_task(self, entry: _IndexedProject, project_id: str, position: int, task: Dict[str, Any]) -> None:
+        if isinstance(task, Task):
+            # Decoded by the client, the due date is already parsed
+            task_id = task.id
+            if not task_id:
+                return
+            due_ts = task.due_ts
+        else:
+            task_id = task.get('id')
+            if not task_id:
+                return
+            due_ts = self._parse_due(task.get('dueDate'))
+        key = (project_id, task_id)
+        if key in self._tasks:
+            self._unindex_secondary(key)
+        indexed = IndexedTask(key, position, task, due_ts)
+        entry.tasks[task_id] = indexed
+        self._tasks[key] = indexed
+        self._index_secondary(key, task)
+
+    def _parse_due(self, due_date: Optional[str]) -> Optional[float]:
+        """Parse a dueDate string, reusing the result for dates seen before."""
+        if due_date in self._parsed_due:
+            return self._parsed_due[due_date]
+        due_ts = parse_due_timestamp(due_date)
+        if len(self._parsed_due) >= MAX_PARSED_DUE_DATES:
+            self._parsed_due.clear()
+        if due_date:
+            self._parsed_due[due_date] = due_ts
+        return due_ts
+
+    def _drop_project_tasks(self, project_id: str) -> None:
+        entry = self._projects.get(project_id)
+        if entry is None:
+            return
+        for task_id in entry.tasks:
+            self._unindex_secondary((project_id, task_id))
+            del self._tasks[(project_id, task_id)]
+        entry.tasks = {}
+        self._due_dirty = True
+
+    def _sorted_due(self) -> List[Tuple[float, TaskKey]]:
+        if self._due_dirty:
+            self._due = sorted(
+                (indexed.due_ts, key) for key, indexed in self._tasks.items() if indexed.due_ts is not None
+            )
+            self._due_dirty = False
+        return self._due
+
+
+class DueRange:
+    """Index query: tasks due in [start, end) (POSIX timestamps)."""
+
+    def __init__(self, start: float, end: float):
+        self.start = start
+        self.end = end
+
+    def lookup(self, index: TaskIndex) -> Set[TaskKey]:
+        return set(index.due_between(self.start, self.end))
+
+    def estimate(self, index: TaskIndex) -> int:
+        return index.count_due_between(self.start, self.end)
+
+
+class FieldEquals:
+    """Index query: tasks whose priority or status equals a value."""
+
+    def __init__(self, field: str, value: Any):
+        if field not in INDEXED_FIELDS:
+            raise ValueError(f"Field '{field}' is not indexed")
+        self.field = field
+        self.value = value
+
+    def lookup(self, index: TaskIndex) -> Set[TaskKey]:
+        return set(index.with_field(self.field, self.value))
+
+    def estimate(self, index: TaskIndex) -> int:
+        return len(index.with_field(self.field, self.value))
+
+
+class Or:
+    """Index query: tasks matching any of the sub-queries (posting list union)."""
+
+    def __init__(self, *queries):
+        self.queries = queries
+
+    def lookup(self, index: TaskIndex) -> Set[TaskKey]:
+        keys: Set[TaskKey] = set()
+        for query in self.queries:
+            keys |= query.lookup(index)
+        return keys
+
+    def estimate(self, index: TaskIndex) -> int:
+        return min(len(index), sum(_estimate(query, index) for query in self.queries))
+
+
+class And:
+    """
+    Index query: tasks matching all of the sub-queries (posting list intersection).
+
+    Sub-queries are evaluated from the most to the least selective, and
+    evaluation stops as soon as the intersection is empty.
+    """
+
+    def __init__(self, *queries):
+        self.queries = queries
+
+    def lookup(self, index: TaskIndex) -> Set[TaskKey]:
+        keys: Optional[Set[TaskKey]] = None
+        for query in sorted(self.queries, key=lambda q: _estimate(q, index)):
+            matched = query.lookup(index)
+            keys = matched if keys is None else keys & matched
+            if not keys:
+                break
+        return keys or set()
+
+    def estimate(self, index: TaskIndex) -> int:
+        return min((_estimate(query, index) for query in self.queries), default=0)
+
+
+def _estimate(query: Any, index: TaskIndex) -> int:
+    """Estimated number of matches of a query, used to order And evaluation."""
+    estimate = getattr(query, 'estimate', None)
+    return estimate(index) if estimate else len(index)
+
+
+class TextSearch:
+    """Index query: tasks matching every search term (by token prefix), ranked by relevance."""
+
+    def __init__(self, terms: List[str]):
+        self.terms = terms
+        self._scores: Dict[TaskKey, float] = {}
+
+    def lookup(self, index: TaskIndex) -> Set[TaskKey]:
+        self._scores = index.search(self.terms)
+        return set(self._scores)
+
+    def score(self, key: TaskKey) -> float:
+        return self._scores.get(key, 0)
+
+
+def select_tasks(index: TaskIndex, query: Any, projects: Iterable[Tuple[Dict, Dict]]) -> List[Tuple[Dict, Dict]]:
+    """
+    Run an index query over the given projects.
+
+    Args:
+        index: Task index the projects were fed into
+        query: Index query (e.g. DueRange)
+        projects: (project, project_data) pairs to search, in display order
+
+    Returns:
+        Matching (project, task) pairs ordered by relevance for ranked queries
+        (those with a `score` method), then by project, then by the task's
+        position in its project
+    """
+    order = {}
+    for position, (project, _) in enumerate(projects):
+        order[project.get('id')] = (position, project)
+
+    score = getattr(query, 'score', None)
+    matches = []
+    for key in query.lookup(index):
+        if key[0] in order:
+            indexed = index.get(key)
+            rank = -score(key) if score else 0
+            matches.append((rank, order[key[0]][0], indexed.position, order[key[0]][1], indexed.task))
+    matches.sort(key=lambda match: match[:3])
+    return [(project, task) for _, _, _, project, task in matches]
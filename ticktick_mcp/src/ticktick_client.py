@@ -1,18 +1,50 @@
 import os
 import json
 import base64
+import asyncio
+import contextvars
+import threading
+import time
+import httpx
 import requests
+from urllib3.exceptions import NewConnectionError
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
 from .auth import TickTickAuth
+from .cache import ResponseCache
+from .fanout import fan_out
+from .metrics import endpoint_template, get_metrics
+from .models import decode_response
+from .http_pool import PoolStats, create_async_client, create_session, get_pool_size, get_timeouts
+from .ratelimit import get_rate_limiter
+from .tracing import span
+from .retry import CONNECT_FAILURE, TRANSPORT_FAILURE, DeadlineExceeded, RetryPolicy, remaining_time
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+class _InFlightGet:
+    """A GET being fetched by one thread, whose result other threads wait for."""
+    __slots__ = ("done", "result")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Dict = {"error": "Coalesced request failed"}
+
+# Access tokens are refreshed proactively this long before they expire (seconds)
+TOKEN_REFRESH_MARGIN = 300.0
+# After a failed refresh, proactive refreshes pause this long (seconds); a 401
+# still triggers a refresh in the meantime
+TOKEN_REFRESH_BACKOFF = 60.0
+
 class TickTickClient:
     """
     Client for the TickTick API using OAuth2 authentication.
+
+    Endpoint methods return the result of `_make_request` directly, so a
+    subclass with a coroutine `_make_request` (see AsyncTickTickClient)
+    reuses them unchanged.
     """
 
     def __init__(self):
@@ -26,6 +58,14 @@ class TickTickClient:
         # Tokens: ~/.ticktick/config.json → env vars (fallback)
         self.access_token = config.get("access_token") or os.getenv("TICKTICK_ACCESS_TOKEN")
         self.refresh_token = config.get("refresh_token") or os.getenv("TICKTICK_REFRESH_TOKEN")
+        # Expiry (epoch seconds) of the access token, when the token endpoint reported it
+        self.token_expires_at: Optional[float] = (
+            config.get("token_expires_at") if config.get("access_token") else None
+        )
+        # Only one token refresh runs at a time (see _refresh_access_token)
+        self._refresh_lock = threading.Lock()
+        # time.time() of the last failed refresh, which pauses proactive refreshes
+        self._refresh_failed_at: Optional[float] = None
 
         if not self.access_token:
             raise ValueError("Access token not found. "
@@ -39,14 +79,167 @@ class TickTickClient:
             "Accept-Encoding": None,
             "User-Agent": 'curl/8.7.1'
         }
-    
-    def _refresh_access_token(self) -> bool:
+
+        # Keep-alive connection pool shared by every call of this client
+        self.pool_size = get_pool_size()
+        self.pool_stats = PoolStats()
+        self.connect_timeout, self.read_timeout = get_timeouts()
+        self._session: Optional[requests.Session] = None
+
+        # Read-through cache of GET responses, invalidated by writes
+        self.cache = ResponseCache()
+
+        # Identical concurrent GETs share one round-trip, keyed by
+        # (endpoint, cache generation) so a write in between starts a new fetch
+        self._inflight: Dict[Tuple[str, int], Any] = {}
+        self._inflight_lock = threading.Lock()
+        self.coalesced_requests = 0
+
+        # Called after every successful write with (project_id, project_list_changed);
+        # project_id is None when the affected project is unknown (see sync.SyncEngine)
+        self.write_listeners: List[Callable[[Optional[str], bool], None]] = []
+
+        # Retries of transient failures (429/5xx, resets, timeouts)
+        self.retry_policy = RetryPolicy()
+
+        # Token bucket shared by every client of the process
+        self.rate_limiter = get_rate_limiter()
+
+        # Per-endpoint request metrics shared by every client of the process
+        self.metrics = get_metrics()
+
+    def _get_session(self) -> requests.Session:
+        """Return the pooled requests.Session, creating it on first use."""
+        if self._session is None:
+            self._session = create_session(self.pool_stats, self.pool_size)
+        return self._session
+
+    def get_pool_stats(self) -> Dict[str, float]:
+        """Return connection pool hit/miss counters (see PoolStats.snapshot)."""
+        return self.pool_stats.snapshot()
+
+    def get_rate_limit_stats(self) -> Dict[str, float]:
+        """Return the counters of the shared rate limiter (see TokenBucket.stats)."""
+        return self.rate_limiter.stats()
+
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """Return how many GETs joined an identical request already in flight."""
+        with self._inflight_lock:
+            return {"coalesced": self.coalesced_requests, "in_flight": len(self._inflight)}
+
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Return response cache counters (see ResponseCache.stats)."""
+        return self.cache.stats()
+
+    def _cache_lookup(self, method: str, endpoint: str) -> Optional[Any]:
+        """Return the cached response of a cacheable GET, or None."""
+        if method != "GET" or self.cache.ttl_for(endpoint) <= 0:
+            return None
+        return self.cache.get(endpoint)
+
+    def _remember_response(self, method: str, endpoint: str, data: Optional[Dict],
+                           result: Any, size: int, generation: int) -> None:
+        """Cache a successful GET, or invalidate what a successful write changed."""
+        if method == "GET":
+            self.cache.set(endpoint, result, size, generation)
+        else:
+            self._invalidate_after_write(endpoint, data)
+
+    def _invalidate_after_write(self, endpoint: str, data: Optional[Dict]) -> None:
+        """
+        Drop the cache entries affected by a successful POST/DELETE.
+
+        Task writes invalidate the data and tasks of their project; project
+        writes also invalidate the project list.
+        """
+        parts = endpoint.strip("/").split("/")
+        project_id = None
+        project_list_changed = False
+        if parts[0] == "task":
+            # /task and /task/{id} carry the project in the payload
+            project_id = (data or {}).get("projectId")
+            if project_id:
+                self.cache.invalidate(f"/project/{project_id}/data")
+                if len(parts) > 1:
+                    self.cache.invalidate(f"/project/{project_id}/task/{parts[1]}")
+            else:
+                self.cache.clear()
+        elif parts[0] == "project":
+            project_id = parts[1] if len(parts) > 1 else None
+            if len(parts) >= 4 and parts[2] == "task":
+                # /project/{id}/task/{id}[/complete]
+                self.cache.invalidate(f"/project/{parts[1]}/data")
+                self.cache.invalidate(f"/project/{parts[1]}/task/{parts[3]}")
+            else:
+                # /project or /project/{id}
+                project_list_changed = True
+                self.cache.invalidate("/project", recursive=False)
+                if len(parts) > 1:
+                    self.cache.invalidate(f"/project/{parts[1]}")
+
+        for listener in self.write_listeners:
+            listener(project_id, project_list_changed)
+
+    def refresh(self, endpoint: str) -> Dict:
+        """Fetch a GET endpoint from the API, bypassing the cache lookup (the cache is updated)."""
+        return self._fetch("GET", endpoint)
+        
+    def _refresh_access_token(self, stale_token: Optional[str] = None, proactive: bool = False) -> bool:
         """
         Refresh the access token using the refresh token.
+
+        Refreshes are single-flight: concurrent callers wait for the refresh in
+        progress, and a caller whose `stale_token` has already been replaced
+        reuses the new token instead of refreshing again.
+
+        Args:
+            stale_token: Access token the caller found expired (None forces a refresh)
+            proactive: The token has not expired yet; skip the refresh if one
+                failed less than TOKEN_REFRESH_BACKOFF seconds ago
         
         Returns:
             True if successful, False otherwise
         """
+        with self._refresh_lock:
+            if stale_token is not None and self.access_token != stale_token:
+                return True
+
+            if proactive and not self._token_expiring():
+                return False
+
+            if not self._can_refresh():
+                return False
+
+            token_data, headers = self._token_request_args()
+
+            try:
+                # Send the token request
+                self.pool_stats.record_request()
+                response = self._get_session().post(self.token_url, data=token_data, headers=headers,
+                                                    timeout=(self.connect_timeout, self.read_timeout))
+                response.raise_for_status()
+
+                self._apply_refreshed_tokens(response.json())
+                return True
+
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error refreshing access token: {e}")
+                self._refresh_failed_at = time.time()
+                return False
+
+    def _token_expiring(self) -> bool:
+        """
+        Check whether the access token expires within TOKEN_REFRESH_MARGIN and
+        can be refreshed, unless a refresh failed within TOKEN_REFRESH_BACKOFF.
+        """
+        now = time.time()
+        return (self.token_expires_at is not None
+                and now >= self.token_expires_at - TOKEN_REFRESH_MARGIN
+                and (self._refresh_failed_at is None or now >= self._refresh_failed_at + TOKEN_REFRESH_BACKOFF)
+                and bool(self.refresh_token and self.client_id and self.client_secret))
+
+    def _can_refresh(self) -> bool:
+        """Check whether the credentials needed for a token refresh are available."""
         if not self.refresh_token:
             logger.warning("No refresh token available. Cannot refresh access token.")
             return False
@@ -54,7 +247,16 @@ class TickTickClient:
         if not self.client_id or not self.client_secret:
             logger.warning("Client ID or Client Secret missing. Cannot refresh access token.")
             return False
-            
+
+        return True
+
+    def _token_request_args(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Build the form data and headers of a refresh_token grant request.
+
+        Returns:
+            Tuple of (token_data, headers)
+        """
         # Prepare the token request
         token_data = {
             "grant_type": "refresh_token",
@@ -70,32 +272,29 @@ class TickTickClient:
             "Authorization": f"Basic {auth_b64}",
             "Content-Type": "application/x-www-form-urlencoded"
         }
-        
-        try:
-            # Send the token request
-            response = requests.post(self.token_url, data=token_data, headers=headers)
-            response.raise_for_status()
-            
-            # Parse the response
-            tokens = response.json()
-            
-            # Update the tokens
-            self.access_token = tokens.get('access_token')
-            if 'refresh_token' in tokens:
-                self.refresh_token = tokens.get('refresh_token')
-                
-            # Update the headers
-            self.headers["Authorization"] = f"Bearer {self.access_token}"
-            
-            # Save the tokens to ~/.ticktick/tokens.json
-            self._save_tokens_to_env(tokens)
-            
-            logger.info("Access token refreshed successfully.")
-            return True
+        return token_data, headers
+
+    def _apply_refreshed_tokens(self, tokens: Dict[str, str]) -> None:
+        """
+        Store the tokens returned by the token endpoint and persist them.
+
+        Args:
+            tokens: Parsed JSON response of the token endpoint
+        """
+        # Update the tokens
+        self.access_token = tokens.get('access_token')
+        if 'refresh_token' in tokens:
+            self.refresh_token = tokens.get('refresh_token')
+        self.token_expires_at = time.time() + float(tokens['expires_in']) if tokens.get('expires_in') else None
+        self._refresh_failed_at = None
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error refreshing access token: {e}")
-            return False
+        # Update the headers
+        self.headers["Authorization"] = f"Bearer {self.access_token}"
+        
+        # Save the tokens to ~/.ticktick/config.json
+        self._save_tokens_to_env(tokens)
+        
+        logger.info("Access token refreshed successfully.")
     
     def _save_tokens_to_env(self, tokens: Dict[str, str]) -> None:
         """
@@ -107,13 +306,78 @@ class TickTickClient:
         data = {"access_token": tokens.get('access_token', '')}
         if 'refresh_token' in tokens:
             data["refresh_token"] = tokens.get('refresh_token', '')
+        if self.token_expires_at is not None:
+            data["token_expires_at"] = self.token_expires_at
 
         TickTickAuth.save_config(data)
         logger.debug(f"Tokens saved to {TickTickAuth.get_config_path()}")
     
+    def _reserve_request(self) -> Tuple[float, Tuple[float, float]]:
+        """
+        Take a rate limiter token for the next request and return its wait and (connect, read) timeouts.
+
+        Inside a tool call the timeouts are shortened to the time left before
+        its deadline (see retry.tool_deadline), and no token is taken when the
+        deadline would pass before the request could be sent.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed or will have passed after the rate limiter wait
+        """
+        remaining = remaining_time()
+        wait = self.rate_limiter.reserve(max_wait=remaining)
+        if remaining is None:
+            return wait, (self.connect_timeout, self.read_timeout)
+        if wait is None or remaining - wait <= 0:
+            raise DeadlineExceeded("Tool deadline exceeded before the request could be sent")
+        remaining -= wait
+        return wait, (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+
+    @staticmethod
+    def _error_result(error: Exception, timed_out: bool) -> Dict:
+        """
+        Build the {'error': ...} result of a failed request.
+
+        Timeouts are flagged with 'timed_out', and errors with a response carry
+        its HTTP status in 'status'.
+        """
+        logger.error(f"API request failed: {error}")
+        if timed_out:
+            return {"error": str(error) or "Request timed out", "timed_out": True}
+        result = {"error": str(error)}
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        if status is not None:
+            result["status"] = status
+        return result
+
+    def _send(self, method: str, url: str, data=None) -> requests.Response:
+        """Send a single request over the pooled session with the current headers."""
+        if method not in ("GET", "POST", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        wait, timeout = self._reserve_request()
+        if wait > 0:
+            time.sleep(wait)
+        self.pool_stats.record_request()
+        endpoint = url[len(self.base_url):]
+        started = time.perf_counter()
+        try:
+            response = self._get_session().request(
+                method, url, headers=self.headers, json=data if method == "POST" else None, timeout=timeout
+            )
+        except requests.exceptions.RequestException:
+            self.metrics.record_request(method, endpoint, None, time.perf_counter() - started)
+            raise
+        self.metrics.record_request(method, endpoint, response.status_code, time.perf_counter() - started,
+                                    len(response.request.body or b"") if response.request else 0,
+                                    len(response.content))
+        self.rate_limiter.observe(response.status_code, response.headers.get("Retry-After"))
+        return response
+
     def _make_request(self, method: str, endpoint: str, data=None) -> Dict:
         """
         Makes a request to the TickTick API.
+
+        Identical GETs issued from several threads while one is in flight
+        share its response.
         
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
@@ -123,44 +387,104 @@ class TickTickClient:
         Returns:
             API response as a dictionary
         """
-        url = f"{self.base_url}{endpoint}"
-        
-        try:
-            # Make the request
-            if method == "GET":
-                response = requests.get(url, headers=self.headers)
-            elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=data)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=self.headers)
+        cached = self._cache_lookup(method, endpoint)
+        if cached is not None:
+            return cached
+        if method != "GET":
+            return self._fetch(method, endpoint, data)
+
+        # Join an identical GET already in flight on another thread
+        key = (endpoint, self.cache.generation)
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InFlightGet()
             else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            # Check if the request was unauthorized (401)
-            if response.status_code == 401:
-                logger.info("Access token expired. Attempting to refresh...")
-                
-                # Try to refresh the access token
-                if self._refresh_access_token():
-                    # Retry the request with the new token
-                    if method == "GET":
-                        response = requests.get(url, headers=self.headers)
-                    elif method == "POST":
-                        response = requests.post(url, headers=self.headers, json=data)
-                    elif method == "DELETE":
-                        response = requests.delete(url, headers=self.headers)
-            
-            # Raise an exception for 4xx/5xx status codes
-            response.raise_for_status()
-            
-            # Return empty dict for 204 No Content
-            if response.status_code == 204 or response.text == "":
-                return {}
-            
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            return {"error": str(e)}
+                self.coalesced_requests += 1
+
+        if not leader:
+            call.done.wait()
+            return call.result
+
+        try:
+            call.result = self._fetch(method, endpoint, data)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            call.done.set()
+        return call.result
+
+    def _fetch(self, method: str, endpoint: str, data=None) -> Dict:
+        """
+        Sends a request to the TickTick API, bypassing the cache lookup.
+
+        Transient failures are retried according to `self.retry_policy`.
+        """
+        generation = self.cache.generation
+        url = f"{self.base_url}{endpoint}"
+        attempt = 0
+
+        if self._token_expiring():
+            logger.info("Access token about to expire. Refreshing it...")
+            self._refresh_access_token(self.access_token, proactive=True)
+
+        while True:
+            try:
+                # Make the request
+                token = self.access_token
+                response = self._send(method, url, data)
+
+                # Check if the request was unauthorized (401)
+                if response.status_code == 401:
+                    logger.info("Access token expired. Attempting to refresh...")
+
+                    # Try to refresh the access token
+                    if self._refresh_access_token(token):
+                        # Retry the request with the new token
+                        response = self._send(method, url, data)
+
+                delay = None
+                if response.status_code >= 400:
+                    delay = self.retry_policy.delay_for(attempt, method, endpoint, status=response.status_code,
+                                                        retry_after=response.headers.get("Retry-After"))
+                if delay is None:
+                    # Raise an exception for 4xx/5xx status codes
+                    response.raise_for_status()
+
+                    # Return empty dict for 204 No Content
+                    if response.status_code == 204 or response.text == "":
+                        result = {}
+                    else:
+                        result = decode_response(endpoint, response.json())
+
+                    self._remember_response(method, endpoint, data, result, len(response.content), generation)
+                    return result
+            except DeadlineExceeded as e:
+                return self._error_result(e, timed_out=True)
+            except requests.exceptions.RequestException as e:
+                delay = self.retry_policy.delay_for(attempt, method, endpoint, failure=self._failure_kind(e))
+                if delay is None:
+                    return self._error_result(e, timed_out=isinstance(e, requests.exceptions.Timeout))
+
+            logger.warning(f"Retrying {method} {endpoint} in {delay:.2f}s (retry {attempt + 1})")
+            self.metrics.record_retry(method, endpoint)
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _failure_kind(error: Exception) -> Optional[str]:
+        """Classify a requests exception for the retry policy (None if it is not transient)."""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return CONNECT_FAILURE
+        if isinstance(error, requests.exceptions.ConnectionError):
+            reason = getattr(error.args[0], "reason", None) if error.args else None
+            if isinstance(reason, NewConnectionError):
+                return CONNECT_FAILURE
+            return TRANSPORT_FAILURE
+        if isinstance(error, requests.exceptions.Timeout):
+            return TRANSPORT_FAILURE
+        return None
     
     # Project methods
     def get_projects(self) -> List[Dict]:
@@ -287,4 +611,291 @@ class TickTickClient:
         if priority is not None:
             data["priority"] = priority
             
-        return self._make_request("POST", "/task", data)
\ No newline at end of file
+        return self._make_request("POST", "/task", data)
+
+class AsyncTickTickClient(TickTickClient):
+    """
+    Non-blocking variant of TickTickClient built on httpx.
+
+    It exposes the same methods as TickTickClient (get_projects,
+    get_project_with_data, create_task, ...), but every one of them returns
+    an awaitable, so concurrent MCP tool calls do not block the event loop.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Stale-while-revalidate bookkeeping
+        self._revalidating: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Single-flight token refresh, bound to the loop of the httpx client
+        self._async_refresh_lock: Optional[asyncio.Lock] = None
+        self._async_refresh_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """
+        Return the httpx client bound to the running event loop.
+
+        An httpx client cannot be shared across event loops, so a new one is
+        created if the client is first used from a different loop (e.g. a
+        startup probe run with asyncio.run() before the server loop starts).
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop:
+            self._http = create_async_client(self.pool_stats, self.pool_size)
+            self._http_loop = loop
+        return self._http
+
+    def _request_headers(self) -> Dict[str, str]:
+        """Current request headers, without the entries requests would drop."""
+        return {key: value for key, value in self.headers.items() if value is not None}
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connections."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._http_loop = None
+
+    async def _refresh_access_token(self, stale_token: Optional[str] = None, proactive: bool = False) -> bool:
+        """
+        Refresh the access token using the refresh token.
+
+        Refreshes are single-flight: concurrent callers wait for the refresh in
+        progress, and a caller whose `stale_token` has already been replaced
+        reuses the new token instead of refreshing again.
+
+        Args:
+            stale_token: Access token the caller found expired (None forces a refresh)
+            proactive: The token has not expired yet; skip the refresh if one
+                failed less than TOKEN_REFRESH_BACKOFF seconds ago
+
+        Returns:
+            True if successful, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_refresh_lock is None or self._async_refresh_loop is not loop:
+            self._async_refresh_lock = asyncio.Lock()
+            self._async_refresh_loop = loop
+
+        async with self._async_refresh_lock:
+            if stale_token is not None and self.access_token != stale_token:
+                return True
+
+            if proactive and not self._token_expiring():
+                return False
+
+            if not self._can_refresh():
+                return False
+
+            token_data, headers = self._token_request_args()
+
+            try:
+                self.pool_stats.record_request()
+                with span("token_refresh"):
+                    response = await self._get_http().post(self.token_url, data=token_data, headers=headers)
+                response.raise_for_status()
+
+                self._apply_refreshed_tokens(response.json())
+                return True
+
+            except httpx.HTTPError as e:
+                logger.error(f"Error refreshing access token: {e}")
+                self._refresh_failed_at = time.time()
+                return False
+
+    async def _send(self, method: str, url: str, data=None) -> httpx.Response:
+        """Send a single request with the current headers."""
+        if method not in ("GET", "POST", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        wait, (connect_timeout, read_timeout) = self._reserve_request()
+        if wait > 0:
+            with span("rate_limit_wait", seconds=round(wait, 3)):
+                await asyncio.sleep(wait)
+        self.pool_stats.record_request()
+        endpoint = url[len(self.base_url):]
+        started = time.perf_counter()
+        try:
+            with span(f"HTTP {method} {endpoint_template(endpoint)}", endpoint=endpoint):
+                response = await self._get_http().request(
+                    method, url, headers=self._request_headers(), json=data if method == "POST" else None,
+                    timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+                )
+        except httpx.HTTPError:
+            self.metrics.record_request(method, endpoint, None, time.perf_counter() - started)
+            raise
+        self.metrics.record_request(method, endpoint, response.status_code, time.perf_counter() - started,
+                                    len(response.request.content), len(response.content))
+        self.rate_limiter.observe(response.status_code, response.headers.get("Retry-After"))
+        return response
+
+    async def _make_request(self, method: str, endpoint: str, data=None) -> Dict:
+        """
+        Makes a request to the TickTick API without blocking the event loop.
+
+        A GET whose only cached value was seeded from the on-disk snapshot
+        returns that value immediately and refreshes it in the background.
+        Identical GETs issued while one is in flight share its response.
+
+        Args:
+            method: HTTP method (GET, POST, DELETE)
+            endpoint: API endpoint (without base URL)
+            data: Request data (for POST)
+
+        Returns:
+            API response as a dictionary
+        """
+        cached = self._cache_lookup(method, endpoint)
+        if cached is not None:
+            return cached
+
+        if method != "GET":
+            return await self._fetch(method, endpoint, data)
+
+        stale = self.cache.get_stale(endpoint)
+        if stale is not None:
+            self._schedule_revalidation(endpoint)
+            return stale
+
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            return self._error_result(DeadlineExceeded("Tool deadline exceeded before the request could be sent"),
+                                      timed_out=True)
+
+        # Identical concurrent GETs await one shared fetch. It runs in an empty
+        # context so it does not inherit the deadline or trace of the caller
+        # that started it; each caller waits for it up to its own deadline, and
+        # shield() keeps one that gives up from cancelling it
+        key = (endpoint, self.cache.generation)
+        task = self._inflight.get(key)
+        started = task is None or task.get_loop() is not asyncio.get_running_loop()
+        if started:
+            task = contextvars.Context().run(asyncio.ensure_future, self._shared_get(endpoint))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        else:
+            with self._inflight_lock:
+                self.coalesced_requests += 1
+        try:
+            result, sent = await asyncio.wait_for(asyncio.shield(task), remaining)
+        except asyncio.TimeoutError:
+            return self._error_result(DeadlineExceeded("Tool deadline exceeded while waiting for the response"),
+                                      timed_out=True)
+        if started:
+            self.metrics.add_tool_requests(sent)
+        return result
+
+    async def _shared_get(self, endpoint: str) -> Tuple[Dict, int]:
+        """
+        Fetch a coalesced GET (run in its own context, see _make_request).
+
+        Returns:
+            The result and the number of requests sent for it, which the
+            caller that started the fetch adds to the requests of its tool
+        """
+        self.metrics.start_tool()
+        result = await self._fetch("GET", endpoint)
+        return result, self.metrics.tool_requests()
+
+    def _forget_inflight(self, key: Tuple[str, int], task: asyncio.Future) -> None:
+        """Drop a finished shared GET, unless a newer fetch already replaced it."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def _schedule_revalidation(self, endpoint: str) -> None:
+        """Refresh a stale cache entry in the background (once per endpoint)."""
+        if endpoint in self._revalidating:
+            return
+        self._revalidating.add(endpoint)
+        # Like a shared GET, the refresh runs in an empty context: it is not
+        # bound by the deadline, metrics or trace of the tool that triggered it
+        task = contextvars.Context().run(asyncio.create_task, self._revalidate(endpoint))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _revalidate(self, endpoint: str) -> None:
+        """Fetch a fresh value for a stale entry; drop the entry if the fetch fails."""
+        self._revalidating.add(endpoint)
+        try:
+            result = await self._fetch("GET", endpoint)
+            if isinstance(result, dict) and 'error' in result:
+                self.cache.invalidate(endpoint, recursive=False)
+        finally:
+            self._revalidating.discard(endpoint)
+
+    async def refresh_stale_entries(self) -> int:
+        """
+        Revalidate every stale cache entry, e.g. right after loading a snapshot.
+
+        Returns:
+            Number of entries refreshed
+        """
+        endpoints = [e for e in self.cache.stale_endpoints() if e not in self._revalidating]
+        await fan_out(endpoints, self._revalidate, self.pool_size)
+        return len(endpoints)
+
+    async def _fetch(self, method: str, endpoint: str, data=None) -> Dict:
+        """
+        Sends a request to the TickTick API, bypassing the cache lookup.
+
+        Transient failures are retried according to `self.retry_policy`.
+        """
+        generation = self.cache.generation
+        url = f"{self.base_url}{endpoint}"
+        attempt = 0
+
+        if self._token_expiring():
+            logger.info("Access token about to expire. Refreshing it...")
+            await self._refresh_access_token(self.access_token, proactive=True)
+
+        while True:
+            try:
+                token = self.access_token
+                response = await self._send(method, url, data)
+
+                # Check if the request was unauthorized (401)
+                if response.status_code == 401:
+                    logger.info("Access token expired. Attempting to refresh...")
+
+                    # Try to refresh the access token and retry with the new one
+                    if await self._refresh_access_token(token):
+                        response = await self._send(method, url, data)
+
+                delay = None
+                if response.status_code >= 400:
+                    delay = self.retry_policy.delay_for(attempt, method, endpoint, status=response.status_code,
+                                                        retry_after=response.headers.get("Retry-After"))
+                if delay is None:
+                    # Raise an exception for 4xx/5xx status codes
+                    response.raise_for_status()
+
+                    # Return empty dict for 204 No Content
+                    if response.status_code == 204 or response.text == "":
+                        result = {}
+                    else:
+                        result = decode_response(endpoint, response.json())
+
+                    self._remember_response(method, endpoint, data, result, len(response.content), generation)
+                    return result
+            except DeadlineExceeded as e:
+                return self._error_result(e, timed_out=True)
+            except (httpx.HTTPError, json.JSONDecodeError) as e:
+                delay = self.retry_policy.delay_for(attempt, method, endpoint, failure=self._failure_kind(e))
+                if delay is None:
+                    return self._error_result(e, timed_out=isinstance(e, httpx.TimeoutException))
+
+            logger.warning(f"Retrying {method} {endpoint} in {delay:.2f}s (retry {attempt + 1})")
+            self.metrics.record_retry(method, endpoint)
+            with span("retry_backoff", seconds=round(delay, 3)):
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _failure_kind(error: Exception) -> Optional[str]:
+        """Classify an httpx exception for the retry policy (None if it is not transient)."""
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return CONNECT_FAILURE
+        if isinstance(error, httpx.TransportError):
+            return TRANSPORT_FAILURE
+        return None
@@ -0,0 +1,175 @@
+"""
+Opt-in tracing of tool invocations as Chrome trace-event files.
+
+When TICKTICK_TRACE is enabled (`ticktick-mcp run --debug` enables it), every
+tool invocation records a tree of spans — the project list fetch, each
+project data fetch, the HTTP requests with their retries and token
+refreshes, filter evaluation and formatting — and writes it to
+TICKTICK_TRACE_DIR (default: ~/.ticktick/traces) as a JSON file that can be
+opened in chrome://tracing or https://ui.perfetto.dev as a flame chart.
+
+Spans started in concurrent asyncio tasks (e.g. by fan_out) are drawn on
+lanes of their own, so overlapping fetches stay readable. Without an active
+trace, span() costs one context variable lookup.
+"""
+
+import asyncio
+import contextvars
+import functools
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def is_tracing_enabled() -> bool:
+    """Check whether TICKTICK_TRACE enables tracing."""
+    return os.getenv("TICKTICK_TRACE", "").lower() in ("1", "true", "yes", "on")
+
+
+def get_trace_dir() -> Path:
+    """Return the directory trace files are written to, from TICKTICK_TRACE_DIR."""
+    value = os.getenv("TICKTICK_TRACE_DIR")
+    return Path(value).expanduser() if value else Path.home() / ".ticktick" / "traces"
+
+
+class Trace:
+    """Spans recorded during one tool invocation."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self._ids = itertools.count(1)
+        # asyncio task / thread -> lane (Chrome trace "tid")
+        self._lanes: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def lane(self) -> int:
+        try:
+            key = id(asyncio.current_task())
+        except RuntimeError:
+            key = threading.get_ident()
+        with self._lock:
+            return self._lanes.setdefault(key, len(self._lanes) + 1)
+
+    def add(self, name: str, span_id: int, parent: Optional[int], lane: int,
+            start: float, end: float, args: Dict[str, Any]) -> None:
+        event = {
+            "name": name,
+            "cat": "ticktick",
+            "ph": "X",
+            "pid": 1,
+            "tid": lane,
+            "ts": round((start - self.started) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "args": dict(args, span_id=span_id, parent_id=parent),
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        """Return the trace in the Chrome trace-event JSON format."""
+        with self._lock:
+            events = sorted(self.events, key=lambda event: (event["ts"], -event["dur"]))
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"tool": self.name}}
+
+    def save(self, directory: Path) -> Optional[Path]:
+        """Write the trace to a new file in `directory` and return its path."""
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", self.name)
+        path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{id(self):x}-{safe_name}.json"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(self.to_chrome(), f, separators=(',', ':'), default=str)
+        except OSError as e:
+            logger.warning(f"Failed to write trace {path}: {e}")
+            return None
+        return path
+
+
+_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("ticktick_trace", default=None)
+_parent: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("ticktick_span", default=None)
+
+
+@contextmanager
+def span(name: str, **args: Any) -> Iterator[None]:
+    """
+    Record a span of the current trace (no-op when no trace is active).
+
+    Args:
+        name: Span name, e.g. "GET /project/{id}/data"
+        **args: Details shown with the span
+    """
+    trace = _trace.get()
+    if trace is None:
+        yield
+        return
+    span_id = trace.next_id()
+    parent = _parent.get()
+    lane = trace.lane()
+    token = _parent.set(span_id)
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        _parent.reset(token)
+        trace.add(name, span_id, parent, lane, start, time.perf_counter(), args)
+
+
+@asynccontextmanager
+async def trace_tool(name: str) -> AsyncIterator[Optional[Trace]]:
+    """
+    Trace a tool invocation and save it when done, if tracing is enabled.
+
+    The file is written in a worker thread, off the event loop.
+
+    Yields:
+        The Trace, or None when tracing is disabled
+    """
+    if not is_tracing_enabled() or _trace.get() is not None:
+        yield None
+        return
+    trace = Trace(name)
+    token = _trace.set(trace)
+    try:
+        with span(name):
+            yield trace
+    finally:
+        _trace.reset(token)
+        path = await asyncio.to_thread(trace.save, get_trace_dir())
+        if path:
+            logger.debug(f"Trace of {name} written to {path}")
+
+
+def traced(name: str):
+    """Decorator recording every call of a function (sync or async) as a span."""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,182 @@
+"""
+Background warmup of the response cache.
+
+Right after startup, and then periodically while the server is idle, the
+WarmupScheduler fetches the project list and the data of the most used
+projects, so the first tool call of a conversation is answered from the
+response cache instead of waiting for the API.
+
+How often each project is used is tracked by an AccessTracker and kept in
+~/.ticktick/usage.json across restarts.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from .auth import TickTickAuth
+from .fanout import fan_out
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Warmup sends API requests nobody asked for, so it is opt-in
+DEFAULT_WARMUP_PROJECTS = 0
+# Shorter than the default cache TTLs, so warmed entries never expire while idle
+DEFAULT_WARMUP_INTERVAL = 25.0
+# Warm only when no tool call ran for this long (seconds)...
+MIN_IDLE = 2.0
+# ...and stop once the server has been unused for this long
+MAX_IDLE = 30 * 60.0
+# Usage counts loaded from disk are scaled down so recent usage dominates
+USAGE_DECAY = 0.5
+
+
+def get_warmup_projects() -> int:
+    """Return how many projects are warmed from TICKTICK_WARMUP_PROJECTS (default: 0, warmup disabled)."""
+    value = os.getenv("TICKTICK_WARMUP_PROJECTS")
+    if not value:
+        return DEFAULT_WARMUP_PROJECTS
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logger.warning(f"Invalid TICKTICK_WARMUP_PROJECTS '{value}', using {DEFAULT_WARMUP_PROJECTS}")
+        return DEFAULT_WARMUP_PROJECTS
+
+
+def get_warmup_interval() -> float:
+    """Return the idle refresh period from TICKTICK_WARMUP_INTERVAL in seconds (default: 25)."""
+    value = os.getenv("TICKTICK_WARMUP_INTERVAL")
+    if not value:
+        return DEFAULT_WARMUP_INTERVAL
+    try:
+        return max(1.0, float(value))
+    except ValueError:
+        logger.warning(f"Invalid TICKTICK_WARMUP_INTERVAL '{value}', using {DEFAULT_WARMUP_INTERVAL}")
+        return DEFAULT_WARMUP_INTERVAL
+
+
+def get_usage_path() -> Path:
+    """Get the path of the usage file, next to ~/.ticktick/config.json."""
+    return TickTickAuth.get_config_path().parent / "usage.json"
+
+
+class AccessTracker:
+    """Counts project accesses and tracks the running tool calls."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.last_activity = time.monotonic()
+        self.in_flight = 0
+
+    def record(self, project_ids: Iterable[str]) -> None:
+        """Count one access to each project."""
+        self.counts.update(project_id for project_id in project_ids if project_id)
+
+    def touch(self) -> None:
+        """Note that a tool call is running."""
+        self.last_activity = time.monotonic()
+
+    def tool_started(self) -> None:
+        """Note that a tool call started; the server is busy until it finishes."""
+        self.in_flight += 1
+        self.touch()
+
+    def tool_finished(self) -> None:
+        """Note that a tool call finished."""
+        self.in_flight -= 1
+        self.touch()
+
+    def idle_for(self) -> float:
+        """Seconds since the last tool call finished, or 0 while one is running."""
+        if self.in_flight:
+            return 0.0
+        return time.monotonic() - self.last_activity
+
+    def most_used(self, project_ids: List[str], limit: int) -> List[str]:
+        """Return up to `limit` of the given projects, most used first (ties keep their order)."""
+        ranked = sorted(enumerate(project_ids), key=lambda item: (-self.counts[item[1]], item[0]))
+        return [project_id for _, project_id in ranked[:limit]]
+
+    def load(self) -> None:
+        """Merge the counts saved by a previous run, scaled down by USAGE_DECAY."""
+        path = get_usage_path()
+        if not path.exists():
+            return
+        try:
+            with open(path, 'r') as f:
+                saved: Dict[str, float] = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable usage file {path}: {e}")
+            return
+        for project_id, count in saved.items():
+            self.counts[project_id] += count * USAGE_DECAY
+
+    def save(self) -> None:
+        """Write the counts to the usage file (atomically)."""
+        path = get_usage_path()
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".usage-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(dict(self.counts.most_common(100)), f, separators=(',', ':'))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save usage file {path}: {e}")
+
+
+class WarmupScheduler:
+    """Keeps the project list and the most used projects warm in the response cache."""
+
+    def __init__(self, client, tracker: AccessTracker, projects: int, interval: float):
+        """
+        Args:
+            client: AsyncTickTickClient whose cache is warmed
+            tracker: Access frequencies used to pick the projects
+            projects: Number of projects to warm
+            interval: Seconds between two idle refreshes
+        """
+        self.client = client
+        self.tracker = tracker
+        self.projects = projects
+        self.interval = interval
+        self.warmups = 0
+
+    async def warm(self) -> int:
+        """
+        Refresh the project list and the data of the most used open projects.
+
+        Returns:
+            Number of projects warmed
+        """
+        projects = await self.client.refresh("/project")
+        if isinstance(projects, dict) and 'error' in projects:
+            logger.warning(f"Warmup failed to fetch projects: {projects['error']}")
+            return 0
+
+        open_ids = [project.get('id') for project in projects if not project.get('closed')]
+        project_ids = self.tracker.most_used(open_ids, self.projects)
+        await fan_out(project_ids, lambda project_id: self.client.refresh(f"/project/{project_id}/data"))
+        self.warmups += 1
+        logger.debug(f"Warmed {len(project_ids)} projects")
+        return len(project_ids)
+
+    async def run(self) -> None:
+        """Warm once, then again every `interval` seconds while the server is idle."""
+        while True:
+            idle = self.tracker.idle_for()
+            if self.warmups == 0 or MIN_IDLE <= idle < MAX_IDLE:
+                try:
+                    await self.warm()
+                except Exception as e:
+                    logger.error(f"Cache warmup failed: {e}")
+            await asyncio.sleep(self.interval)